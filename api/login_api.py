@@ -1,5 +1,6 @@
 from utils.request_util import RequestUtil
 from utils.redis_util import redis_util
+from utils.background_util import background_dispatcher
 from utils.db_util import db_util
 from mock.login_mock import login_mock
 from config.env_config import config
@@ -13,14 +14,107 @@ class LoginApi:
         self.redis = login_mock if config.IS_MOCK else redis_util
         # 【修改点1】修复URL拼接：移除BASE_URL末尾的/，避免生成//post
         self.base_url = config.BASE_URL.rstrip("/")
+        self._async_req = None
+        # 外部通知接口不影响登录结果：默认交给后台派发器，登录返回不等待其往返/超时
+        self.background = config.SIDE_CALL_BACKGROUND
+        self.dispatcher = background_dispatcher
+
+    @property
+    def async_req(self):
+        """异步请求工具（首次使用异步接口时创建）"""
+        if self._async_req is None:
+            from utils.async_request_util import AsyncRequestUtil
+            self._async_req = AsyncRequestUtil()
+        return self._async_req
 
     def login(self, username, password):
+        resp = self._login_core(username, password)
+        if resp["code"] == 200:
+            if self.background:
+                self.dispatcher.submit(self._notify_login)
+                return resp
+            # 【修改点2】修复URL拼接：明确拼接完整URL，新增异常捕获（不影响登录核心）
+            try:
+                self._notify_login()
+            except Exception as e:
+                # 仅打印警告，不阻断登录逻辑
+                logger.warning("外部接口调用失败（不影响登录）：%s", str(e)[:100])
+        return resp
+
+    async def async_login(self, username, password):
+        """登录（异步版）：核心逻辑与 login 一致，外部接口调用不阻塞事件循环（后台派发时不等待）"""
+        resp = self._login_core(username, password)
+        if resp["code"] == 200:
+            if self.background:
+                self.dispatcher.submit(self._notify_login)
+                return resp
+            try:
+                await self.async_req.send("POST", f"{self.base_url}/post", data={"login": "success"})
+            except Exception as e:
+                logger.warning("外部接口调用失败（不影响登录）：%s", str(e)[:100])
+        return resp
+
+    def login_many(self, credentials):
+        """
+        批量登录（登录风暴场景）：逐个校验账号后，Token 批量读取/写入（Redis 各一次往返），外部接口批量并发调用
+        :param credentials: [(username, password), ...]
+        :return: 与 credentials 顺序一致的登录结果列表
+        """
+        credentials = list(credentials)
+        results = [self._authenticate(username, password) for username, password in credentials]
+        passed = list(dict.fromkeys(username for (username, _), resp in zip(credentials, results) if resp is None))
+
+        tokens = self.redis.get_tokens(passed) if passed else {}
+        new_tokens = {username: self._new_token(username) for username, token in tokens.items() if not token}
+        if new_tokens:
+            self.redis.set_tokens(new_tokens)
+            tokens.update(new_tokens)
+        logger.info("批量登录：共%s个，校验通过%s个，复用Token %s个，生成Token %s个",
+                    len(credentials), len(passed), len(passed) - len(new_tokens), len(new_tokens))
+
+        for username in passed:
+            self.db.update_fail_count(username, increment=False)
+        for i, (username, _) in enumerate(credentials):
+            if results[i] is None:
+                results[i] = {"code": 200, "msg": "success", "data": {"token": tokens[username]}}
+
+        success = sum(1 for resp in results if resp["code"] == 200)
+        if success:
+            if self.background:
+                self.dispatcher.submit(self._notify_login_many, success)
+            else:
+                self._notify_login_many(success)
+        return results
+
+    # -------------------------- 外部通知（非关键旁路调用） --------------------------
+    def _notify_login(self):
+        self.req.send("POST", f"{self.base_url}/post", data={"login": "success"})
+
+    def _notify_login_many(self, count):
+        side_calls = [{"method": "POST", "url": f"{self.base_url}/post", "data": {"login": "success"}}] * count
+        failed = sum(1 for r in self.req.send_many(side_calls) if not r["ok"])
+        if failed:
+            logger.warning("外部接口调用失败%s个（不影响登录）", failed)
 
-        logger.info(f"收到登录请求：用户={username}, 密码长度={len(password)}")
+    def _login_core(self, username, password):
+        """登录核心逻辑（同步/异步登录共用）：密码校验、锁定判断、Token复用/生成、失败次数重置"""
+        resp = self._authenticate(username, password)
+        if resp is not None:
+            return resp
+
+        # 获取或生成Token合并为一次原子操作（真实Redis下只需一次往返）
+        token = self.redis.get_or_set_token(username, self._new_token(username))
+
+        self.db.update_fail_count(username, increment=False)
+        return {"code": 200, "msg": "success", "data": {"token": token}}
+
+    def _authenticate(self, username, password):
+        """账号校验：密码长度、用户存在、密码正确、未锁定；通过返回None，否则返回错误响应"""
+        logger.info("收到登录请求：用户=%s, 密码长度=%s", username, len(password))
 
         # 【新增】密码长度校验（超长密码返回400）
         if len(password) > 50:
-            logger.warning(f"⚠️ 密码长度超限：{len(password)}字符（最大50）")
+            logger.warning("⚠️ 密码长度超限：%s字符（最大50）", len(password))
             return {"code": 400, "msg": "密码长度超出限制", "data": None}
 
         # 原有登录逻辑（完全保留）
@@ -35,24 +129,8 @@ class LoginApi:
         # 【补充点1】原有框架遗漏：账号锁定判断（匹配Mock中的locked状态）
         if user_info.get("status") == "locked":
             return {"code": 403, "msg": "account locked", "data": None}
+        return None
 
-        cached_token = self.redis.get_token(username)
-        if cached_token:
-            token = cached_token
-            logger.info("复用现有 Token")
-        else:
-            token = f"token_{username}_8888"
-            self.redis.set_token(username, token)
-            logger.info("生成新 Token")
-
-        self.db.update_fail_count(username, increment=False)
-
-        # 【修改点2】修复URL拼接：明确拼接完整URL，新增异常捕获（不影响登录核心）
-        try:
-            full_url = f"{self.base_url}/post"
-            self.req.send("POST", full_url, data={"login": "success"})
-        except Exception as e:
-            # 仅打印警告，不阻断登录逻辑
-            logger.warning(f"外部接口调用失败（不影响登录）：{str(e)[:100]}")
-
-        return {"code": 200, "msg": "success", "data": {"token": token}}
\ No newline at end of file
+    @staticmethod
+    def _new_token(username):
+        return f"token_{username}_8888"
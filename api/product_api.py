@@ -9,43 +9,73 @@ class ProductApi:
         self.req = RequestUtil()
         # 新增：标记当前是否为Mock模式（和登录API保持一致）
         self.is_mock = config.IS_MOCK
+        self._async_req = None
 
-    def get_product_list(self, token):
-        logger.info("【API】执行操作：获取商品列表")
+    @property
+    def async_req(self):
+        """异步请求工具（首次使用异步接口时创建）"""
+        if self._async_req is None:
+            from utils.async_request_util import AsyncRequestUtil
+            self._async_req = AsyncRequestUtil()
+        return self._async_req
+
+    def get_product_list(self, token, page=None, size=None, category=None, status=None):
+        """
+        获取商品列表（支持分页/过滤，均走Mock层索引）
+        :param page: 页码（从1开始），不传时返回全部
+        :param size: 每页数量，不传时返回全部
+        :param category: 按分类过滤
+        :param status: 按状态过滤（on_sale / out_of_stock / off_sale）
+        """
+        logger.info("【API】执行操作：获取商品列表 page=%s, size=%s, category=%s, status=%s", page, size, category, status)
 
         # 优化1：Mock模式下可选跳过真实请求（避免无效网络调用）
         if not self.is_mock:
-            self.req.send(method="GET", url="/get", params={"page": 1}, token=token)
+            self.req.send(method="GET", url="/get", params=self._list_params(page, size, category, status), token=token)
 
-        # 直接返回Mock数据（核心逻辑不变）
-        logger.info(f"【API】返回商品列表，共 {len(ProductMockData.PRODUCT_LIST)} 个商品")
-        return {
-            "code": 200,
-            "msg": "success",
-            "data": ProductMockData.PRODUCT_LIST
-        }
+        return self._product_list_response(page, size, category, status)
 
     def get_product_detail(self, product_id, token):
-        logger.info(f"【API】执行操作：获取商品详情 ID={product_id}")
+        logger.info("【API】执行操作：获取商品详情 ID=%s", product_id)
 
         # 优化1：Mock模式下跳过真实请求
         if not self.is_mock:
             self.req.send(method="GET", url="/get", params={"id": product_id}, token=token)
 
-        # 委托Mock层处理业务逻辑（核心逻辑不变）
-        code, msg, data = ProductMockData.check_product_logic(product_id)
+        return self._product_detail_response(product_id)
+
+    def get_product_details(self, product_ids, token):
+        """
+        批量获取商品详情：真实请求经 send_many 并发发出，按入参顺序返回每个商品的详情响应
+        单个商品请求失败时该项返回 code=500，不影响其他商品
+        """
+        logger.info("【API】执行操作：批量获取商品详情，共 %s 个", len(product_ids))
+
+        results = [None] * len(product_ids)
+        # 优化1：Mock模式下跳过真实请求
+        if not self.is_mock:
+            results = self.req.send_many([
+                {"method": "GET", "url": "/get", "params": {"id": product_id}, "token": token}
+                for product_id in product_ids
+            ])
 
+        details = []
+        for product_id, result in zip(product_ids, results):
+            if result is not None and not result["ok"]:
+                details.append({"code": 500, "msg": f"请求失败：{str(result['error'])[:100]}", "data": None})
+            else:
+                details.append(self._product_detail_response(product_id))
         return {
-            "code": code,
-            "msg": msg,
-            "data": data
+            "code": 200,
+            "msg": "success",
+            "data": details
         }
 
     def create_product(self, name, price, token):
         """
         (扩展功能) 创建商品 - 模拟 POST 请求
         """
-        logger.info(f"【API】执行操作：创建商品 name={name}, price={price}")
+        logger.info("【API】执行操作：创建商品 name=%s, price=%s", name, price)
 
         data = {"name": name, "price": price}
         # 优化1：Mock模式下跳过真实请求
@@ -53,11 +83,67 @@ class ProductApi:
         if not self.is_mock:
             # 使用修复后的send方法，传data（POST body）
             resp = self.req.send(method="POST", url="/post", data=data, token=token)
-            logger.info(f"【API】创建商品真实请求响应：{resp}")
+            logger.info("【API】创建商品真实请求响应：%s", resp)
 
+        return self._create_product_response(name, price)
+
+    # -------------------------- 异步接口（语义与同步接口一致） --------------------------
+    async def async_get_product_list(self, token, page=None, size=None, category=None, status=None):
+        logger.info("【API】执行操作：获取商品列表（异步） page=%s, size=%s, category=%s, status=%s",
+                    page, size, category, status)
+        if not self.is_mock:
+            await self.async_req.send(method="GET", url="/get", params=self._list_params(page, size, category, status),
+                                      token=token)
+        return self._product_list_response(page, size, category, status)
+
+    async def async_get_product_detail(self, product_id, token):
+        logger.info("【API】执行操作：获取商品详情（异步） ID=%s", product_id)
+        if not self.is_mock:
+            await self.async_req.send(method="GET", url="/get", params={"id": product_id}, token=token)
+        return self._product_detail_response(product_id)
+
+    async def async_create_product(self, name, price, token):
+        logger.info("【API】执行操作：创建商品（异步） name=%s, price=%s", name, price)
+        if not self.is_mock:
+            resp = await self.async_req.send(method="POST", url="/post", data={"name": name, "price": price}, token=token)
+            logger.info("【API】创建商品真实请求响应：%s", resp)
+        return self._create_product_response(name, price)
+
+    # -------------------------- 响应构造（同步/异步共用） --------------------------
+    @staticmethod
+    def _list_params(page, size, category, status):
+        """列表接口查询参数（未传的条件不下发）"""
+        params = {"page": page or 1, "size": size, "category": category, "status": status}
+        return {k: v for k, v in params.items() if v is not None}
+
+    @staticmethod
+    def _product_list_response(page=None, size=None, category=None, status=None):
+        # 委托Mock层索引查询（total为过滤后的命中总数）
+        total, products = ProductMockData.query_products(page=page or 1, size=size, category=category, status=status)
+        logger.info("【API】返回商品列表，共 %s 个商品，本页 %s 个", total, len(products))
+        return {
+            "code": 200,
+            "msg": "success",
+            "data": products,
+            "total": total
+        }
+
+    @staticmethod
+    def _product_detail_response(product_id):
+        # 委托Mock层处理业务逻辑（核心逻辑不变）
+        code, msg, data = ProductMockData.check_product_logic(product_id)
+
+        return {
+            "code": code,
+            "msg": msg,
+            "data": data
+        }
+
+    @staticmethod
+    def _create_product_response(name, price):
         # 模拟成功创建（核心逻辑不变）
         return {
             "code": 201,
             "msg": "created",
             "data": {"id": 8888, "name": name, "price": price}
-        }
\ No newline at end of file
+        }
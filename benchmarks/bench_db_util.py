@@ -0,0 +1,60 @@
+"""
+用户库后端基准测试：登录路径（query_user + update_fail_count）在不同后端/并发下的吞吐（ops/sec）
+- mock：内存字典（MockDBUtil）
+- sqlite：SQLite 替身（参数化查询 + 有界连接池），代表真实 SQL 路径的开销
+- 批量：update_fail_counts 单事务 executemany
+运行：python benchmarks/bench_db_util.py -u 100000
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 把项目根目录加入Python路径（避免导入报错）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.db_util import MockDBUtil, SQLiteDBUtil
+from utils.log_util import logger
+
+
+def login_ops(db, usernames, concurrency: int) -> float:
+    """concurrency个线程分摊 usernames，每个用户一次查询 + 一次更新，返回 ops/sec"""
+    def worker(chunk):
+        for username in chunk:
+            db.query_user(username)
+            db.update_fail_count(username)
+
+    chunks = [usernames[i::concurrency] for i in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, chunks))
+    return len(usernames) * 2 / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="用户库后端基准测试")
+    parser.add_argument("-u", "--users", type=int, default=100_000, help="用户表规模")
+    parser.add_argument("-n", type=int, default=20_000, help="每轮登录操作的用户数")
+    args = parser.parse_args()
+
+    logger.set_level("WARNING")  # 屏蔽逐条INFO日志，只测数据访问开销
+    users = [{"username": f"user_{i:07d}", "password": "123456", "fail_count": 0} for i in range(args.users)]
+    sample = [u["username"] for u in users[::max(1, args.users // args.n)]][:args.n]
+
+    mock_db = MockDBUtil({u["username"]: dict(u) for u in users})
+    sqlite_db = SQLiteDBUtil(":memory:")
+    sqlite_db.insert_users(users)
+
+    print(f"\n用户表 {args.users} 行，每轮 {len(sample)} 个用户（单位：ops/sec）")
+    print(f"{'后端':<10}" + "".join(f"{f'{c}线程':>12}" for c in (1, 4, 16)))
+    for name, db in (("mock", mock_db), ("sqlite", sqlite_db)):
+        print(f"{name:<10}" + "".join(f"{login_ops(db, sample, c):>12.0f}" for c in (1, 4, 16)))
+
+    start = time.perf_counter()
+    sqlite_db.update_fail_counts(sample, increment=False)
+    print(f"{'sqlite批量':<10}{len(sample) / (time.perf_counter() - start):>12.0f}（update_fail_counts 单事务）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+HTTP连接池基准测试：本地回显服务下，1/8/64 并发调用方的吞吐（requests/sec）
+对比三种传输方式：
+- 独立Session：每个调用方新建 RequestUtil + requests.Session（旧实现：每个API对象一个Session）
+- 共享-默认池：进程共享Session，requests 默认连接池（pool_maxsize=10）
+- 共享-调优池：进程共享Session，EnvConfig 连接池配置（AUTO_HTTP_POOL_MAXSIZE，默认64）
+运行：python benchmarks/bench_http_pool.py -n 200
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 把项目根目录加入Python路径（避免导入报错）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from config.env_config import config
+from mock.http_stub import EchoStubServer
+from utils.log_util import logger
+from utils.request_util import RequestUtil, get_shared_session, reset_shared_session
+
+
+def run(make_client, concurrency: int, per_caller: int) -> float:
+    """concurrency个调用方并发，每个发送per_caller次GET，返回 requests/sec"""
+    def caller(_):
+        client = make_client()
+        for i in range(per_caller):
+            client.send("GET", "/get", params={"i": i})
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(caller, range(concurrency)))
+    return concurrency * per_caller / (time.perf_counter() - start)
+
+
+def isolated_client():
+    client = RequestUtil()
+    client.session = requests.Session()
+    return client
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP连接池基准测试")
+    parser.add_argument("-n", type=int, default=200, help="每个调用方的请求数")
+    args = parser.parse_args()
+
+    logger.set_level("WARNING")  # 屏蔽逐请求INFO日志，只测传输开销
+    tuned_maxsize = config.HTTP_POOL_MAXSIZE
+    modes = {
+        "独立Session": (None, isolated_client),
+        "共享-默认池": (10, RequestUtil),
+        "共享-调优池": (tuned_maxsize, RequestUtil),
+    }
+
+    with EchoStubServer() as stub:
+        config.BASE_URL = stub.base_url
+        print(f"\n本地回显服务 {stub.base_url}，每调用方 {args.n} 次 GET /get（单位：requests/sec）")
+        print(f"{'模式':<12}" + "".join(f"{f'{c}并发':>10}" for c in (1, 8, 64)))
+        for name, (maxsize, make_client) in modes.items():
+            if maxsize:
+                config.HTTP_POOL_MAXSIZE = maxsize
+                reset_shared_session()
+                get_shared_session()
+            row = [run(make_client, c, args.n) for c in (1, 8, 64)]
+            print(f"{name:<12}" + "".join(f"{rps:>10.0f}" for rps in row))
+
+
+if __name__ == "__main__":
+    main()
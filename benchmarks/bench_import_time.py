@@ -0,0 +1,91 @@
+"""
+框架导入耗时基准（python -X importtime）：统计导入框架模块的累计耗时，并检查导入后单例未被初始化
+导入阶段只应定义类/函数：config 不读取 .env、logger 不建日志目录/文件、data_util/redis_util/db_util 不创建实例
+超出预算或单例被提前初始化时退出码为1（可在CI中防止启动耗时回退）
+运行：python benchmarks/bench_import_time.py --budget-ms 300 [--collect]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ["config.env_config", "utils.log_util", "utils.data_util", "utils.redis_util", "utils.db_util",
+           "utils.token_broker", "mock.login_mock", "mock.product_mock", "api.login_api", "api.product_api"]
+SINGLETONS = {"config.env_config": "config", "utils.data_util": "data_util", "utils.redis_util": "redis_util",
+              "utils.db_util": "db_util", "utils.background_util": "background_dispatcher",
+              "utils.token_broker": "token_broker"}
+FRAMEWORK_PREFIXES = ("config", "utils", "mock", "api")
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+PROBE = """
+import importlib
+from utils.lazy_util import is_initialized
+from utils.log_util import logger
+initialized = [f"{{module}}.{{name}}" for module, name in {singletons!r}.items()
+               if is_initialized(getattr(importlib.import_module(module), name))]
+if not logger._pending:
+    initialized.append("utils.log_util.logger")
+print("INITIALIZED=" + ",".join(initialized))
+"""
+
+
+def import_profile(modules):
+    """子进程中导入模块，返回 ({顶层模块: 累计耗时ms}, 总耗时ms, 提前初始化的单例列表)"""
+    code = "import " + ", ".join(modules) + "\n" + PROBE.format(singletons=SINGLETONS)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=PROJECT_ROOT,
+                          capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"导入失败：\n{proc.stderr[-2000:]}")
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        # 缩进为1的行是顶层导入（由 -c 代码直接触发）
+        if match and len(match.group(3)) == 1:
+            cumulative[match.group(4)] = int(match.group(2)) / 1000
+    initialized = [name for name in proc.stdout.split("INITIALIZED=", 1)[-1].strip().split(",") if name]
+    return cumulative, wall_ms, initialized
+
+
+def collect_time():
+    """pytest --collect-only 耗时（秒）"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "pytest", "--collect-only", "-q", "testcases"], cwd=PROJECT_ROOT,
+                   capture_output=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="框架导入耗时基准")
+    parser.add_argument("--budget-ms", type=float, default=300, help="框架模块累计导入耗时预算（毫秒）")
+    parser.add_argument("--collect", action="store_true", help="同时统计 pytest --collect-only 耗时")
+    args = parser.parse_args()
+
+    cumulative, wall_ms, initialized = import_profile(MODULES)
+    framework = {name: ms for name, ms in cumulative.items() if name.split(".")[0] in FRAMEWORK_PREFIXES}
+    print(f"\n{'模块':<40}{'累计耗时(ms)':>14}")
+    for name, ms in sorted(framework.items(), key=lambda item: -item[1]):
+        print(f"{name:<40}{ms:>14.1f}")
+    framework_ms = sum(framework.values())
+    print(f"框架模块合计 {framework_ms:.1f}ms（预算 {args.budget_ms:.0f}ms），解释器+导入总耗时 {wall_ms:.1f}ms")
+    if args.collect:
+        print(f"pytest --collect-only 耗时 {collect_time():.2f}s")
+
+    failed = False
+    if initialized:
+        print(f"❌ 导入阶段单例已被初始化：{initialized}")
+        failed = True
+    if framework_ms > args.budget_ms:
+        print(f"❌ 导入耗时超出预算：{framework_ms:.1f}ms > {args.budget_ms:.0f}ms")
+        failed = True
+    if not failed:
+        print("✅ 导入耗时在预算内，单例均为惰性初始化")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+惰性日志格式化微基准：WARNING 级别下对比 INFO 日志的三种写法
+- f-string：调用前已完成格式化（旧写法）
+- %-style：logger.info("... %s", obj)，级别未启用时不拼接
+- lambda ：logger.info(lambda: f"... {obj}")，级别未启用时不求值
+运行：python benchmarks/bench_log_lazy.py -n 200000
+"""
+import argparse
+import os
+import sys
+import timeit
+
+# 把项目根目录加入Python路径（避免导入报错）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.log_util import logger
+
+
+class _CountingDict(dict):
+    """统计被格式化（repr）的次数，用于证明级别未启用时零格式化"""
+    repr_calls = 0
+
+    def __repr__(self):
+        _CountingDict.repr_calls += 1
+        return super().__repr__()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="惰性日志格式化微基准")
+    parser.add_argument("-n", type=int, default=200000, help="每种写法的调用次数")
+    args = parser.parse_args()
+
+    user_info = _CountingDict({
+        "username": "temp_user", "password": "temp_pass", "fail_count": 0, "status": "active",
+        "role": "user", "phone": "13800138000", "email": "temp@example.com", "last_login_time": None
+    })
+    cases = {
+        "f-string（旧写法）": lambda: logger.info(f"[Mock DB] 新增临时用户: temp_user，信息: {user_info}"),
+        "%-style": lambda: logger.info("[Mock DB] 新增临时用户: %s，信息: %s", "temp_user", user_info),
+        "lambda": lambda: logger.info(lambda: f"[Mock DB] 新增临时用户: temp_user，信息: {user_info}"),
+    }
+
+    logger.set_level("WARNING")
+    print(f"\nWARNING 级别下调用 logger.info × {args.n}")
+    print(f"{'写法':<16}{'单次(ns)':>10}{'格式化次数':>12}")
+    for name, call in cases.items():
+        _CountingDict.repr_calls = 0
+        elapsed = timeit.timeit(call, number=args.n)
+        print(f"{name:<16}{elapsed / args.n * 1e9:>10.0f}{_CountingDict.repr_calls:>12}")
+
+
+if __name__ == "__main__":
+    main()
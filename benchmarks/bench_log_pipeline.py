@@ -0,0 +1,68 @@
+"""
+日志管道基准测试：对比 同步日志 / 异步队列日志 下 LoginApi.login 的单次调用开销
+运行：python benchmarks/bench_log_pipeline.py -n 5000 2>/dev/null
+（控制台日志写入 stderr，重定向后终端只保留结果表）
+"""
+import argparse
+import os
+import sys
+import time
+
+# 把项目根目录加入Python路径（避免导入报错）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.login_api import LoginApi
+from mock.login_mock import login_mock
+from utils.log_util import logger
+
+
+class _FakeResponse:
+    """固定响应（屏蔽网络耗时，只测量日志开销）"""
+    status_code = 200
+    content = b'{"json": {"login": "success"}}'
+
+    def raise_for_status(self):
+        pass
+
+
+class _FakeSession:
+    def request(self, **kwargs):
+        return _FakeResponse()
+
+
+def run_logins(api: LoginApi, n: int) -> float:
+    """循环登录n次，返回调用方总耗时（秒）"""
+    start = time.perf_counter()
+    for _ in range(n):
+        api.login("test_user", "test_pass_123")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="日志管道基准测试")
+    parser.add_argument("-n", type=int, default=5000, help="登录调用次数")
+    args = parser.parse_args()
+
+    api = LoginApi()
+    api.req.session = _FakeSession()
+    login_mock.reset_mock_data()
+
+    results = []
+    for name, async_mode in [("同步日志", False), ("异步队列日志", True)]:
+        logger.configure(async_mode=async_mode)
+        run_logins(api, min(args.n, 200))  # 预热
+        elapsed = run_logins(api, args.n)
+        drain_start = time.perf_counter()
+        logger.shutdown()
+        drain = time.perf_counter() - drain_start
+        results.append((name, elapsed, drain))
+
+    logger.configure(async_mode=False)
+    print(f"\nLoginApi.login × {args.n}")
+    print(f"{'模式':<10}{'调用方耗时(s)':>14}{'单次(µs)':>12}{'排空耗时(s)':>14}")
+    for name, elapsed, drain in results:
+        print(f"{name:<10}{elapsed:>14.3f}{elapsed / args.n * 1e6:>12.1f}{drain:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+LoginMock 重置/查询基准测试：对比 10 / 1万 / 100万 用户规模下
+- 旧实现：reset 时 deepcopy 整个用户模板，query_user 时 deepcopy 单个用户
+- 写时复制：reset 丢弃覆盖层（O(1)），query_user 浅拷贝快照
+每轮 = 1次重置 + 1次登录失败（写入）+ 1次查询，模拟"每条用例前重置"的测试节奏
+运行：python benchmarks/bench_login_mock_reset.py 2>/dev/null
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+
+# 把项目根目录加入Python路径（避免导入报错）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock.login_mock import MOCK_USER_DB_TEMPLATE, login_mock
+from utils.log_util import logger
+
+
+def build_users(count: int):
+    users = {}
+    for i in range(count):
+        username = f"user_{i:07d}"
+        users[username] = dict(MOCK_USER_DB_TEMPLATE["test_user"], username=username)
+    return users
+
+
+def legacy_round(users, username):
+    """旧实现：整表深拷贝 + 修改 + 单用户深拷贝"""
+    db = copy.deepcopy(users)
+    db[username]["fail_count"] += 1
+    return copy.deepcopy(db[username])
+
+
+def cow_round(username):
+    login_mock.reset_mock_data()
+    login_mock.update_fail_count(username)
+    return login_mock.query_user(username)
+
+
+def measure(func, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LoginMock 重置/查询基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 10_000, 1_000_000], help="用户规模")
+    parser.add_argument("-r", "--rounds", type=int, default=1000, help="写时复制方式的重复次数")
+    parser.add_argument("--legacy-rounds", type=int, default=3, help="旧实现的重复次数（百万级深拷贝很慢）")
+    args = parser.parse_args()
+
+    logger.set_level("WARNING")  # 屏蔽Mock层INFO日志，只测量数据操作
+    print(f"\n{'用户数':>10}{'旧实现(ms/轮)':>16}{'写时复制(µs/轮)':>18}{'加速比':>10}")
+    for size in args.sizes:
+        users = build_users(size)
+        username = f"user_{size // 2:07d}"
+        login_mock.seed_users(users)
+        legacy = measure(lambda: legacy_round(users, username), args.legacy_rounds)
+        cow = measure(lambda: cow_round(username), args.rounds)
+        print(f"{size:>10}{legacy * 1000:>16.3f}{cow * 1e6:>18.2f}{legacy / cow:>9.0f}x")
+    login_mock.seed_users(MOCK_USER_DB_TEMPLATE)
+
+
+if __name__ == "__main__":
+    main()
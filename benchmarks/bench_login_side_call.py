@@ -0,0 +1,71 @@
+"""
+登录旁路调用基准测试：外部通知接口（POST /post）注入延迟时，对比
+- 同步调用：登录返回前等待外部接口往返（旧实现）
+- 后台派发：外部调用入队后立即返回，由后台线程执行（AUTO_SIDE_CALL_BACKGROUND=True）
+统计单次登录耗时 p50/p95/p99 与登录吞吐；后台模式另计会话结束时 flush 的耗时
+运行：python benchmarks/bench_login_side_call.py -n 500 --latency 20
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 把项目根目录加入Python路径（避免导入报错）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.login_api import LoginApi
+from config.env_config import config
+from mock.http_stub import EchoStubServer
+from utils.background_util import background_dispatcher
+from utils.latency_util import LatencyHistogram
+from utils.log_util import logger
+
+
+def run(background: bool, total: int, concurrency: int):
+    """concurrency个调用方共完成 total 次登录，返回 (耗时直方图, 登录吞吐, flush耗时秒)"""
+    hist = LatencyHistogram()
+    lock = threading.Lock()
+
+    def caller(count):
+        api = LoginApi()
+        api.background = background
+        for _ in range(count):
+            start = time.perf_counter()
+            api.login("test_user", "test_pass_123")
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with lock:
+                hist.record_ms(elapsed_ms)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(caller, [total // concurrency] * concurrency))
+    elapsed = time.perf_counter() - start
+    flush_start = time.perf_counter()
+    background_dispatcher.flush()
+    return hist, hist.total / elapsed, time.perf_counter() - flush_start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="登录旁路调用基准测试")
+    parser.add_argument("-n", type=int, default=500, help="登录次数")
+    parser.add_argument("-c", type=int, default=8, help="并发调用方数")
+    parser.add_argument("--latency", type=float, default=20, help="外部接口注入延迟（毫秒）")
+    args = parser.parse_args()
+
+    logger.set_level("ERROR")  # 屏蔽逐请求日志，只测登录路径
+    with EchoStubServer(workers=2) as stub:
+        stub.set_fault(latency_ms=args.latency, path="/post")
+        config.BASE_URL = stub.base_url
+        print(f"\n外部接口延迟 {args.latency}ms，{args.c} 并发共 {args.n} 次登录（耗时单位：ms）")
+        print(f"{'模式':<10}{'P50':>10}{'P95':>10}{'P99':>10}{'登录/秒':>12}{'flush(s)':>10}")
+        for name, background in (("同步调用", False), ("后台派发", True)):
+            hist, rps, flush_s = run(background, args.n, args.c)
+            print(f"{name:<10}{hist.percentile(50):>10.2f}{hist.percentile(95):>10.2f}{hist.percentile(99):>10.2f}"
+                  f"{rps:>12.0f}{flush_s:>10.2f}")
+        print(f"后台派发指标：{background_dispatcher.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+合成数据集基准：按规模生成用户数据集，对比"列式文件 mmap 启动"与"加载为字典"的
+- 启动耗时：打开列式文件（mmap，不解析数据） vs 逐行构造 {username: dict}
+- Python堆内存（tracemalloc）：列式只占列视图对象，字典每个用户约1KB
+- 随机查询耗时：二分查找 + 按需构造行字典 vs 字典O(1)查询
+运行：python benchmarks/bench_mock_dataset.py --sizes 10000 1000000 2>/dev/null
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# 把项目根目录加入Python路径（避免导入报错）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock.columnar import ColumnarTable, TableMapping
+from mock.synthetic_data import build_dataset
+
+
+def traced(func):
+    """执行 func，返回 (结果, 耗时秒, Python堆净增字节)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def lookup_time(users, keys) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        users[key]
+    return (time.perf_counter() - start) / len(keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="合成数据集基准")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000], help="用户规模")
+    parser.add_argument("--lookups", type=int, default=100_000, help="随机查询次数")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"\n{'用户数':>10}{'生成(s)':>10}{'文件(MB)':>10}{'mmap启动(ms)':>14}{'字典启动(s)':>13}"
+          f"{'mmap堆(KB)':>12}{'字典堆(MB)':>12}{'mmap查询(µs)':>14}{'字典查询(µs)':>14}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            path = build_dataset(directory, users=size, products=1, seed=args.seed)["users"]
+            generate = time.perf_counter() - start
+
+            table, mmap_open, mmap_heap = traced(lambda: ColumnarTable.open(path))
+            users = TableMapping(table)
+            as_dict, dict_open, dict_heap = traced(lambda: {row["username"]: row for row in table.iter_rows()})
+
+            keys = random.Random(args.seed).choices(list(as_dict), k=args.lookups)
+            mmap_lookup, dict_lookup = lookup_time(users, keys), lookup_time(as_dict, keys)
+            print(f"{size:>10}{generate:>10.2f}{path.stat().st_size / 1024 / 1024:>10.1f}{mmap_open * 1000:>14.2f}"
+                  f"{dict_open:>13.2f}{mmap_heap / 1024:>12.1f}{dict_heap / 1024 / 1024:>12.1f}"
+                  f"{mmap_lookup * 1e6:>14.2f}{dict_lookup * 1e6:>14.3f}")
+            del as_dict, users
+            table.close()
+
+
+if __name__ == "__main__":
+    main()
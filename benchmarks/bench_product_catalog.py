@@ -0,0 +1,98 @@
+"""
+商品目录存储基准：对比 ProductStore（每个商品一个 Python 字典）与 ColumnarProductStore（mmap 列式文件）
+- 启动耗时 / Python堆内存（tracemalloc）：字典存储约1KB/商品，列式存储只有倒排索引（4字节/商品/过滤列）
+- 详情查询（check_product_logic 路径：按主键取商品副本）与分类+状态过滤分页查询的单次耗时
+列式文件的数据页来自操作系统页缓存，多个 worker 进程映射同一文件时共享同一份物理内存
+运行：python benchmarks/bench_product_catalog.py --sizes 100000 1000000 2>/dev/null
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# 把项目根目录加入Python路径（避免导入报错）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock.columnar import ColumnarTable, write_table
+from mock.product_store import ColumnarProductStore, ProductStore
+from mock.synthetic_data import PRODUCT_SCHEMA, generate_products
+
+
+def timed(func):
+    """执行 func，返回 (结果, 耗时秒)"""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def heap_size(func) -> int:
+    """执行 func 期间 Python 堆的净增字节（tracemalloc 会拖慢执行，与计时分开测量）"""
+    tracemalloc.start()
+    store, table = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    if table is not None:
+        table.close()
+    return size
+
+
+def build_dict(path):
+    """字典存储：读完即关闭文件，返回 (存储, None)"""
+    with ColumnarTable.open(path) as table:
+        return ProductStore(table.iter_rows()), None
+
+
+def build_columnar(path):
+    """列式存储（倒排索引在首次过滤时构建，这里计入启动成本），返回 (存储, 需关闭的表)"""
+    table = ColumnarTable.open(path)
+    store = ColumnarProductStore(table)
+    store.query(category="home", size=1)
+    store.query(status="on_sale", size=1)
+    return store, table
+
+
+def per_call(func, args_list) -> float:
+    start = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return (time.perf_counter() - start) / len(args_list)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="商品目录存储基准")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000], help="商品规模")
+    parser.add_argument("--lookups", type=int, default=50_000, help="详情查询次数")
+    parser.add_argument("--queries", type=int, default=200, help="过滤分页查询次数")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"\n{'商品数':>10}{'存储':>10}{'启动(s)':>10}{'堆内存(MB)':>12}{'详情(µs)':>11}{'过滤分页(ms)':>14}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path = write_table(os.path.join(directory, "products.col"), generate_products(size, args.seed),
+                               PRODUCT_SCHEMA, key="product_id")
+            rng = random.Random(args.seed)
+            with ColumnarTable.open(path) as table:
+                ids = [(table.columns["product_id"][rng.randrange(table.rows)],) for _ in range(args.lookups)]
+            filters = [(rng.choice(["electronics", "home", "books"]), "on_sale", rng.randint(1, 50))
+                       for _ in range(args.queries)]
+
+            for name, build in (("dict", build_dict), ("columnar", build_columnar)):
+                heap = heap_size(lambda: build(path))
+                (store, table), startup = timed(lambda: build(path))
+                try:
+                    detail = per_call(store.snapshot, ids)
+                    query = per_call(lambda c, s, p, store=store: store.query(category=c, status=s, page=p, size=20),
+                                     filters)
+                finally:
+                    if table is not None:
+                        table.close()
+                print(f"{size:>10}{name:>10}{startup:>10.2f}{heap / 1024 / 1024:>12.1f}{detail * 1e6:>11.2f}"
+                      f"{query * 1000:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
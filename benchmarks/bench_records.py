@@ -0,0 +1,107 @@
+"""
+紧凑记录基准：对比 字典（原 copy + setdefault 预处理）与 __slots__ 记录（LoginCase/ProductCase/UserRecord.from_row）
+- 每10万条记录的 Python 堆内存（tracemalloc，只统计记录本身，原始行不计入）
+- 构造耗时（预处理/构造10万条的总耗时）
+记录类型：登录用例、商品用例、用户（只用于大批量存储的类型；接口响应/商品目录仍为字典）
+运行：python benchmarks/bench_records.py [-n 100000] 2>/dev/null
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+# 把项目根目录加入Python路径（避免导入报错）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.records import LoginCase, ProductCase, UserRecord
+
+
+def legacy_login_case(idx, case):
+    """原预处理：复制 + setdefault 补默认值"""
+    new_case = case.copy()
+    new_case.setdefault("case_name", f"登录用例_{idx + 1}")
+    new_case.setdefault("username", "")
+    new_case.setdefault("password", "")
+    new_case.setdefault("expected_code", 200)
+    new_case.setdefault("expected_msg", "success")
+    new_case.setdefault("skip_cache", False)
+    new_case.setdefault("check_db", False)
+    return new_case
+
+
+def legacy_product_case(idx, case):
+    new_case = case.copy()
+    new_case.setdefault("case_name", f"商品用例_{idx + 1}")
+    new_case.setdefault("product_id", "")
+    new_case.setdefault("product_name", "")
+    new_case.setdefault("price", 0.0)
+    new_case.setdefault("expected_code", 200)
+    new_case.setdefault("expected_stock", 0)
+    new_case.setdefault("check_stock", False)
+    return new_case
+
+
+def record_case(record_type, prefix):
+    def build(idx, case):
+        new_case = record_type.from_row(case)
+        if "case_name" not in case:
+            new_case.case_name = f"{prefix}_{idx + 1}"
+        return new_case
+    return build
+
+
+def make_rows(count):
+    """各类型的原始行（值对象在行之间共享，只比较容器开销）"""
+    run_env = ["mock", "test"]
+    return {
+        "登录用例": [{"username": "test_user", "password": "test_pass_123", "expected_code": 200, "check_db": True,
+                  "fail_count_before": 0, "run_env": run_env, "priority": "P0"} for _ in range(count)],
+        "商品用例": [{"product_id": "product_001", "expected_code": 200, "expected_msg": "success",
+                  "run_env": run_env, "priority": "P1"} for _ in range(count)],
+        "用户": [{"username": "test_user", "password": "test_pass_123", "fail_count": 0, "status": "active",
+                "role": "user", "phone": "13800138000", "email": "test@example.com", "last_login_time": None}
+               for _ in range(count)],
+    }
+
+
+BUILDERS = {
+    "登录用例": (legacy_login_case, record_case(LoginCase, "登录用例")),
+    "商品用例": (legacy_product_case, record_case(ProductCase, "商品用例")),
+    "用户": (lambda idx, row: dict(row), lambda idx, row: UserRecord.from_row(row)),
+}
+
+
+def measure(build, rows):
+    """返回 (堆内存字节, 构造耗时秒)；两者分开测量，避免 tracemalloc 影响计时，耗时取5次最小值"""
+    tracemalloc.start()
+    built = [build(idx, row) for idx, row in enumerate(rows)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+    elapsed = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        built = [build(idx, row) for idx, row in enumerate(rows)]
+        elapsed = min(elapsed, time.perf_counter() - start)
+        del built
+    return size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="紧凑记录基准")
+    parser.add_argument("-n", "--count", type=int, default=100_000, help="每种记录的数量")
+    args = parser.parse_args()
+
+    rows = make_rows(args.count)
+    print(f"\n每 {args.count} 条记录")
+    print(f"{'类型':<8}{'字典(MB)':>10}{'记录(MB)':>10}{'节省':>8}{'字典构造(ms)':>14}{'记录构造(ms)':>14}")
+    for name, (legacy, compact) in BUILDERS.items():
+        dict_size, dict_time = measure(legacy, rows[name])
+        record_size, record_time = measure(compact, rows[name])
+        print(f"{name:<8}{dict_size / 1024 / 1024:>10.1f}{record_size / 1024 / 1024:>10.1f}"
+              f"{1 - record_size / dict_size:>8.0%}{dict_time * 1000:>14.1f}{record_time * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
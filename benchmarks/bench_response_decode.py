@@ -0,0 +1,81 @@
+"""
+响应解码基准测试：本地回显服务返回 1MB / 50MB JSON，对比
+- 旧实现：resp.text[:200] 打日志 + resp.json()（响应体解码为str后再解析，整段str常驻）
+- 快速路径：RequestUtil.send（resp.content 只读一次 + 字节切片日志 + orjson/标准库解码）
+- 流式读取：RequestUtil.send_lines 逐行解码同一数据的 NDJSON 版本（不缓存完整响应体）
+运行：python benchmarks/bench_response_decode.py -r 3 2>/dev/null
+（安装 orjson 后快速路径自动切换为 orjson 解码）
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# 把项目根目录加入Python路径（避免导入报错）
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.env_config import config
+from mock.http_stub import EchoStubServer
+from utils.request_util import RequestUtil, JSON_BACKEND
+
+
+def legacy_send(req: RequestUtil, url: str):
+    """旧实现的响应处理路径"""
+    resp = req.session.request("GET", f"{req.base_url}{url}", timeout=config.TIMEOUT)
+    resp.raise_for_status()
+    _ = f"【响应】Status: {resp.status_code} | Response: {resp.text[:200]}"
+    return resp.json()
+
+
+def build_payload(size_mb: int):
+    """生成约 size_mb MB 的商品列表（JSON数组 + NDJSON两种格式）"""
+    item = {"product_id": "product_000000", "name": "测试商品", "price": 99.9, "stock": 100,
+            "status": "on_sale", "category": "electronics"}
+    count = size_mb * 1024 * 1024 // len(json.dumps(item).encode("utf-8"))
+    items = [dict(item, product_id=f"product_{i:06d}") for i in range(count)]
+    ndjson = "\n".join(json.dumps(i, ensure_ascii=False) for i in items).encode("utf-8")
+    return json.dumps(items, ensure_ascii=False).encode("utf-8"), ndjson, count
+
+
+def measure(func, rounds: int):
+    """返回 (平均耗时秒, 峰值内存MB)；峰值内存单独测一轮（tracemalloc会拖慢计时）"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    elapsed = (time.perf_counter() - start) / rounds
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="响应解码基准测试")
+    parser.add_argument("-r", "--rounds", type=int, default=3, help="每种方式的重复次数")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 50], help="报文大小（MB）")
+    args = parser.parse_args()
+
+    with EchoStubServer() as stub:
+        config.BASE_URL = stub.base_url
+        req = RequestUtil()
+        print(f"\nJSON解码后端：{JSON_BACKEND}")
+        print(f"{'报文':<8}{'方式':<10}{'耗时(ms)':>10}{'峰值内存(MB)':>14}")
+        for size_mb in args.sizes:
+            body, ndjson, count = build_payload(size_mb)
+            stub.add_static(f"/products_{size_mb}mb", body)
+            stub.add_static(f"/products_{size_mb}mb.ndjson", ndjson, "application/x-ndjson")
+            modes = {
+                "旧实现": lambda: legacy_send(req, f"/products_{size_mb}mb"),
+                "快速路径": lambda: req.send("GET", f"/products_{size_mb}mb"),
+                "流式逐行": lambda: sum(1 for _ in req.send_lines("GET", f"/products_{size_mb}mb.ndjson")),
+            }
+            for name, func in modes.items():
+                elapsed, peak = measure(func, args.rounds)
+                print(f"{f'{size_mb}MB':<8}{name:<10}{elapsed * 1000:>10.1f}{peak:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
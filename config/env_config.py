@@ -1,8 +1,5 @@
 import os
-from dotenv import load_dotenv
-
-# 加载.env文件中的环境变量（优先级：系统环境变量 > .env文件）
-load_dotenv(override=True)
+from utils.lazy_util import LazyProxy
 
 
 class EnvConfig:
@@ -12,6 +9,10 @@ class EnvConfig:
     """
 
     def __init__(self):
+        # 加载.env文件中的环境变量（优先级：系统环境变量 > .env文件），首次使用配置时才加载
+        from dotenv import load_dotenv
+        load_dotenv(override=True)
+
         # 1. 基础环境配置（区分测试/预发/生产）
         self.env = os.getenv("AUTO_ENV", "test")  # 环境：test/pre/prod
         self._set_base_url()  # 根据环境自动设置BASE_URL
@@ -20,8 +21,81 @@ class EnvConfig:
         self.TIMEOUT = int(os.getenv("AUTO_TIMEOUT", 10))  # 超时时间（转整型）
         self.HEADERS = self._get_default_headers()  # 默认请求头
 
+        # 2.1 HTTP连接池配置（进程内所有API客户端共享同一个连接池）
+        self.HTTP_POOL_CONNECTIONS = int(os.getenv("AUTO_HTTP_POOL_CONNECTIONS", 10))  # 缓存的主机连接池数量
+        self.HTTP_POOL_MAXSIZE = int(os.getenv("AUTO_HTTP_POOL_MAXSIZE", 64))  # 单个主机最大保持连接数
+        self.HTTP_POOL_BLOCK = self._parse_boolean(os.getenv("AUTO_HTTP_POOL_BLOCK", "False"))  # 连接数达上限时等待（而非新建临时连接）
+        self.HTTP_KEEP_ALIVE = self._parse_boolean(os.getenv("AUTO_HTTP_KEEP_ALIVE", "True"))  # 是否复用TCP连接
+        self.HTTP_MAX_RETRIES = int(os.getenv("AUTO_HTTP_MAX_RETRIES", 2))  # 幂等请求（GET/PUT/DELETE等）重试次数（0=不重试）
+        self.HTTP_RETRY_BACKOFF = float(os.getenv("AUTO_HTTP_RETRY_BACKOFF", 0.3))  # 重试退避系数（秒）
+        # 按主机限制连接数，格式：host[:port]=上限,多个用逗号分隔（如 api.example.com=16,127.0.0.1:8080=4）
+        self.HTTP_HOST_LIMITS = self._parse_host_limits(os.getenv("AUTO_HTTP_HOST_LIMITS", ""))
+        self.ASYNC_MAX_CONCURRENCY = int(os.getenv("AUTO_ASYNC_MAX_CONCURRENCY", 100))  # 异步请求最大在途数
+        self.HTTP_BATCH_WORKERS = int(os.getenv("AUTO_HTTP_BATCH_WORKERS", 16))  # 批量请求(send_many)线程数
+        # 请求耗时统计（按 method+path+status 分组的固定内存直方图，会话结束输出分位数表）
+        self.LATENCY_REPORT = self._parse_boolean(os.getenv("AUTO_LATENCY_REPORT", "True"))
+        self.LATENCY_REPORT_FILE = os.getenv("AUTO_LATENCY_REPORT_FILE", "")  # 未指定 --alluredir 时的JSON输出路径
+
+        # 2.2 非关键旁路调用（如登录成功后的外部通知）后台派发：有界队列 + 后台线程，登录耗时只包含核心逻辑
+        self.SIDE_CALL_BACKGROUND = self._parse_boolean(os.getenv("AUTO_SIDE_CALL_BACKGROUND", "True"))
+        self.BACKGROUND_WORKERS = int(os.getenv("AUTO_BACKGROUND_WORKERS", 4))  # 后台线程数
+        self.BACKGROUND_QUEUE_SIZE = int(os.getenv("AUTO_BACKGROUND_QUEUE_SIZE", 1000))  # 队列容量
+        self.BACKGROUND_QUEUE_POLICY = os.getenv("AUTO_BACKGROUND_QUEUE_POLICY", "block")  # 队列满时策略：block/drop
+        self.BACKGROUND_BLOCK_TIMEOUT = float(os.getenv("AUTO_BACKGROUND_BLOCK_TIMEOUT", 1))  # block策略最长等待（秒），超时丢弃
+
+        # 2.3 本地回显服务（替代 httpbin.org：测试会话内在系统分配端口启动，BASE_URL 指向它；仅 test 环境默认开启）
+        self.STUB_SERVER = self._parse_boolean(os.getenv("AUTO_STUB_SERVER", "True" if self.env == "test" else "False"))
+        self.STUB_WORKERS = int(os.getenv("AUTO_STUB_WORKERS", 2))  # 事件循环线程数
+        self.STUB_LATENCY_MS = float(os.getenv("AUTO_STUB_LATENCY_MS", 0))  # 注入固定延迟（毫秒）
+        self.STUB_JITTER_MS = float(os.getenv("AUTO_STUB_JITTER_MS", 0))  # 注入随机延迟上限（毫秒）
+        self.STUB_ERROR_RATE = float(os.getenv("AUTO_STUB_ERROR_RATE", 0))  # 注入错误概率（0~1）
+        self.STUB_ERROR_STATUS = int(os.getenv("AUTO_STUB_ERROR_STATUS", 503))  # 注入错误状态码（0=直接断开连接）
+        self.STUB_SEED = int(os.getenv("AUTO_STUB_SEED", 0))  # 随机数种子（固定时错误序列可复现）
+
         # 3. Mock开关配置（核心：控制是否启用Mock模式）
         self.IS_MOCK = self._parse_boolean(os.getenv("AUTO_IS_MOCK", "True"))
+        # 大规模合成数据集目录（python -m mock.synthetic_data 生成）：配置后 Mock 用户/商品从该目录的列式文件启动
+        self.MOCK_DATASET = os.getenv("AUTO_MOCK_DATASET", "")
+        # 数据集商品目录的存储方式：columnar（mmap 列式文件，多进程共享物理内存）/ dict（逐行加载为字典）
+        self.PRODUCT_BACKEND = os.getenv("AUTO_PRODUCT_BACKEND", "columnar").strip().lower()
+        # 非Mock模式的Token存储：配置后使用真实Redis（如 redis://127.0.0.1:6379/0），为空时使用内存替身
+        self.REDIS_URL = os.getenv("AUTO_REDIS_URL", "")
+        # 非Mock模式的用户库：mock（内存字典）/ sqlite（本地替身）/ mysql（真实库，参数化查询 + 有界连接池）
+        self.DB_BACKEND = os.getenv("AUTO_DB_BACKEND", "mock").strip().lower()
+        self.DB_HOST = os.getenv("AUTO_DB_HOST", "127.0.0.1")
+        self.DB_PORT = int(os.getenv("AUTO_DB_PORT", 3306))
+        self.DB_USER = os.getenv("AUTO_DB_USER", "root")
+        self.DB_PASSWORD = os.getenv("AUTO_DB_PASSWORD", "")
+        self.DB_NAME = os.getenv("AUTO_DB_NAME", "ecommerce_test")
+        self.DB_SQLITE_PATH = os.getenv("AUTO_DB_SQLITE_PATH", ":memory:")
+        self.DB_POOL_SIZE = int(os.getenv("AUTO_DB_POOL_SIZE", 8))  # 连接池上限
+        self.DB_POOL_TIMEOUT = float(os.getenv("AUTO_DB_POOL_TIMEOUT", 10))  # 池满时等待连接的超时（秒）
+
+        # 4. 用例数据缓存配置（YAML解析结果按内容哈希落盘，加速用例收集）
+        self.DATA_CACHE = self._parse_boolean(os.getenv("AUTO_DATA_CACHE", "True"))
+        self.DATA_CACHE_DIR = os.getenv("AUTO_DATA_CACHE_DIR", "")  # 为空时使用项目根目录下的.cache/data
+
+        # 5. 日志配置（异步模式：日志经有界队列由后台线程批量写出，不阻塞调用方）
+        self.LOG_LEVEL = os.getenv("AUTO_LOG_LEVEL", "INFO").upper()  # DEBUG/INFO/WARNING/ERROR
+        self.LOG_DIR = os.getenv("AUTO_LOG_DIR", "")  # 为空时使用项目根目录下的log（不随启动目录变化）
+        self.LOG_BODY_BYTES = int(os.getenv("AUTO_LOG_BODY_BYTES", 200))  # 响应日志最多记录的响应体字节数
+        self.LOG_ASYNC = self._parse_boolean(os.getenv("AUTO_LOG_ASYNC", "False"))
+        self.LOG_QUEUE_SIZE = int(os.getenv("AUTO_LOG_QUEUE_SIZE", 10000))  # 队列容量（条）
+        self.LOG_QUEUE_POLICY = os.getenv("AUTO_LOG_QUEUE_POLICY", "block")  # 队列满时策略：block/drop
+        self.LOG_BATCH_SIZE = int(os.getenv("AUTO_LOG_BATCH_SIZE", 256))  # 后台线程单批最多写出条数
+        # 结构化日志（JSON Lines，字段：ts/level/nodeid/msg/method/url/status/elapsed_ms）
+        self.LOG_JSON = self._parse_boolean(os.getenv("AUTO_LOG_JSON", "False"))
+        self.LOG_JSON_MAX_BYTES = int(os.getenv("AUTO_LOG_JSON_MAX_BYTES", 100 * 1024 * 1024))  # 按大小轮转阈值
+        self.LOG_JSON_WHEN = os.getenv("AUTO_LOG_JSON_WHEN", "")  # 按时间轮转（如 midnight/H），为空时按大小轮转
+        self.LOG_JSON_BACKUPS = int(os.getenv("AUTO_LOG_JSON_BACKUPS", 10))  # 保留的轮转文件数
+        self.LOG_JSON_COMPRESS = self._parse_boolean(os.getenv("AUTO_LOG_JSON_COMPRESS", "True"))  # 轮转文件gzip压缩
+
+        # 6. 会话级 Token 缓存（跨 worker 进程共享：首个进程登录后写入文件，其余进程直接读取）
+        self.AUTH_USERNAME = os.getenv("AUTO_AUTH_USERNAME", "admin_user")  # 全局登录账号
+        self.AUTH_PASSWORD = os.getenv("AUTO_AUTH_PASSWORD", "admin_pass_789")
+        self.TOKEN_TTL = float(os.getenv("AUTO_TOKEN_TTL", 3600))  # Token 有效期（秒，与 Redis 过期时间一致）
+        self.TOKEN_REFRESH_AHEAD = float(os.getenv("AUTO_TOKEN_REFRESH_AHEAD", 300))  # 剩余有效期小于此值时后台提前刷新
+        self.TOKEN_CACHE_DIR = os.getenv("AUTO_TOKEN_CACHE_DIR", "")  # 为空时使用项目根目录下的.cache/tokens
 
     def _set_base_url(self):
         """根据环境自动设置BASE_URL（多环境适配）"""
@@ -40,6 +114,16 @@ class EnvConfig:
             base_headers["Authorization"] = os.getenv("AUTO_AUTH_TOKEN", "")
         return base_headers
 
+    @staticmethod
+    def _parse_host_limits(value: str) -> dict:
+        """解析按主机连接数上限配置（格式错误的条目直接忽略）"""
+        limits = {}
+        for item in (value or "").split(","):
+            host, sep, limit = item.strip().partition("=")
+            if sep and host.strip() and limit.strip().isdigit():
+                limits[host.strip()] = int(limit)
+        return limits
+
     @staticmethod
     def _parse_boolean(value: str) -> bool:
         """
@@ -51,5 +135,5 @@ class EnvConfig:
         return value.strip().lower() in ["true", "1", "yes", "on"]
 
 
-# 单例导出（全局复用，避免重复初始化）
-config = EnvConfig()
\ No newline at end of file
+# 单例导出（全局复用，首次访问配置项时才初始化）
+config = LazyProxy(EnvConfig)
\ No newline at end of file
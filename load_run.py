@@ -0,0 +1,55 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="压测入口：把功能用例（data目录下的YAML/JSONL/CSV）作为负载回放")
+    parser.add_argument("case_file", help="data目录下的用例文件名，如 test_login / test_product.yaml")
+    parser.add_argument("-k", "--kind", choices=["login", "product"], help="用例类型（缺省按文件名推断）")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="并发worker数（限速模式下为最大在途数）")
+    parser.add_argument("-r", "--rps", type=float, help="目标RPS（不指定时按并发数闭环压测）")
+    parser.add_argument("-d", "--duration", type=float, default=30, help="稳定压测时长（秒，不含爬坡）")
+    parser.add_argument("--ramp-up", type=float, default=0, help="爬坡时长（秒）")
+    parser.add_argument("-m", "--mode", choices=["thread", "async"], default="thread", help="worker类型")
+    parser.add_argument("--token", default="mock_token_123", help="商品接口使用的Token")
+    parser.add_argument("--no-isolate", action="store_true", help="不为每次请求创建独立Mock上下文（状态在请求间累积）")
+    parser.add_argument("--stub", action="store_true", help="启动本地回显服务并把 BASE_URL 指向它（不依赖外网，延迟/错误注入按 AUTO_STUB_* 配置）")
+    parser.add_argument("--json", help="压测结果JSON输出路径")
+    return parser.parse_args()
+
+
+def run_load(args):
+    from config.env_config import config
+    from mock.http_stub import create_stub_server
+    from utils.load_runner import LoadRunner, format_summary
+    from utils.log_util import logger
+
+    logger.set_level("WARNING")  # 压测时屏蔽逐请求INFO日志
+    stub = create_stub_server().start() if args.stub else None
+    if stub is not None:
+        config.BASE_URL = stub.base_url
+        print(f"🔌 本地回显服务：{stub.base_url}")
+    try:
+        runner = LoadRunner.from_file(
+            args.case_file, kind=args.kind, concurrency=args.concurrency, rps=args.rps, duration=args.duration,
+            ramp_up=args.ramp_up, mode=args.mode, token=args.token, isolate=not args.no_isolate
+        )
+        summary = runner.run()
+    finally:
+        if stub is not None:
+            stub.stop()
+
+    print("\n📈 压测结果")
+    print(format_summary(summary))
+    if args.json:
+        json_path = Path(args.json)
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        json_path.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"📄 结果已写出：{json_path.absolute()}")
+    return 0 if summary["error_rate"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_load(parse_args()))
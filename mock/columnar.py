@@ -0,0 +1,329 @@
+# mock/columnar.py
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import Mapping
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# -------------------------- 文件格式 --------------------------
+# [MAGIC 8字节][头部长度 uint32 小端][头部JSON][按8字节对齐的各列数据块]
+# 头部：{"rows": 行数, "key": 主键列, "byteorder": 写入端字节序, "columns": [{name, kind, ...}]}
+# 列类型：
+#   int      → int64 数组（typecode q）
+#   float    → float64 数组（typecode d）
+#   category → 字典编码：头部保存取值表（可含 None），数据块为 uint8/uint16/uint32 编码
+#   str      → int64 偏移数组（行数+1）+ UTF-8 拼接字节块
+MAGIC = b"MOCKCOL1"
+ALIGN = 8
+KINDS = ("int", "float", "category", "str")
+_HEADER_LEN = struct.Struct("<I")
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _infer_kind(values: Sequence) -> str:
+    """未指定列类型时推断：全整数→int，整数/浮点混合→float，全字符串→str，其余（含None）→category"""
+    types = {type(value) for value in values}
+    if types <= {int}:
+        return "int"
+    if types <= {int, float}:
+        return "float"
+    if types <= {str}:
+        return "str"
+    return "category"
+
+
+def _encode_column(name: str, kind: str, values: Sequence) -> Tuple[Dict, List]:
+    """把一列值编码为 (列描述, 数据块列表)"""
+    if kind == "int":
+        return {"name": name, "kind": kind, "typecode": "q"}, [array("q", values)]
+    if kind == "float":
+        return {"name": name, "kind": kind, "typecode": "d"}, [array("d", values)]
+    if kind == "category":
+        table: Dict[Any, int] = {}
+        codes = [table.setdefault(value, len(table)) for value in values]
+        typecode = "B" if len(table) <= 1 << 8 else "H" if len(table) <= 1 << 16 else "I"
+        return {"name": name, "kind": kind, "typecode": typecode, "values": list(table)}, [array(typecode, codes)]
+    if kind == "str":
+        encoded = [value.encode("utf-8") for value in values]
+        offsets = array("q", [0])
+        offsets.extend(accumulate(map(len, encoded)))
+        return {"name": name, "kind": kind, "typecode": "q"}, [offsets, b"".join(encoded)]
+    raise ValueError(f"不支持的列类型：{kind}（可选：{' / '.join(KINDS)}）")
+
+
+def write_table(path: Union[str, Path], columns: Dict[str, Sequence], schema: Optional[Dict[str, str]] = None,
+                key: Optional[str] = None) -> Path:
+    """
+    把列式数据写入单个文件（先写临时文件再替换，读取方不会读到半个文件）
+    :param columns: {列名: 该列全部值}，各列长度必须一致
+    :param schema: {列名: int/float/category/str}，未指定的列自动推断
+    :param key: 主键列（值唯一；写入时按主键排序，读取时二分查找，无需额外索引）
+    :return: 写入的文件路径
+    """
+    path = Path(path)
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"各列长度不一致：{ {name: len(values) for name, values in columns.items()} }")
+    rows = lengths.pop() if lengths else 0
+    schema = schema or {}
+
+    if key is not None:
+        keys = columns[key]
+        if any(keys[i] >= keys[i + 1] for i in range(rows - 1)):
+            order = sorted(range(rows), key=keys.__getitem__)
+            columns = {name: [values[i] for i in order] for name, values in columns.items()}
+            keys = columns[key]
+            duplicated = next((keys[i] for i in range(rows - 1) if keys[i] == keys[i + 1]), None)
+            if duplicated is not None:
+                raise ValueError(f"主键列 {key} 存在重复值：{duplicated}")
+
+    descriptors, blocks, offset = [], [], 0
+    for name, values in columns.items():
+        descriptor, parts = _encode_column(name, schema.get(name) or _infer_kind(values), values)
+        descriptor["blocks"] = []
+        for part in parts:
+            size = len(part) * (part.itemsize if isinstance(part, array) else 1)
+            descriptor["blocks"].append([offset, size])
+            blocks.append((offset, part))
+            offset = _align(offset + size)
+        descriptors.append(descriptor)
+
+    header = json.dumps({"rows": rows, "key": key, "byteorder": sys.byteorder, "columns": descriptors},
+                        ensure_ascii=False, sort_keys=True).encode("utf-8")
+    data_start = _align(len(MAGIC) + _HEADER_LEN.size + len(header))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + _HEADER_LEN.pack(len(header)) + header)
+        for block_offset, part in blocks:
+            f.write(b"\0" * (data_start + block_offset - f.tell()))
+            f.write(part)
+    os.replace(tmp_path, path)
+    return path
+
+
+# -------------------------- 列视图（只读，直接引用文件映射的内存） --------------------------
+class NumericColumn:
+    """int/float 列"""
+
+    def __init__(self, data: Sequence):
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index: int):
+        return self.data[index]
+
+    def __iter__(self):
+        return iter(self.data)
+
+
+class CategoryColumn:
+    """字典编码列：values 为取值表，codes[i] 为第i行取值在表中的下标"""
+
+    def __init__(self, codes: Sequence[int], values: List[Any]):
+        self.codes = codes
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int):
+        return self.values[self.codes[index]]
+
+    def __iter__(self):
+        values = self.values
+        return (values[code] for code in self.codes)
+
+    def code_of(self, value: Any) -> Optional[int]:
+        """取值对应的编码（不存在时返回None）"""
+        try:
+            return self.values.index(value)
+        except ValueError:
+            return None
+
+
+class StrColumn:
+    """变长字符串列：offsets[i]~offsets[i+1] 为第i行在 blob 中的字节区间"""
+
+    def __init__(self, offsets: Sequence[int], blob: memoryview):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        return str(self.blob[self.offsets[index]:self.offsets[index + 1]], "utf-8")
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class ColumnarTable:
+    """
+    列式数据表（只读）
+    - 打开即用：默认 mmap 映射文件，列数据按需分页读入，多进程打开同一文件共享操作系统页缓存
+    - 按行取数：row(i) 返回新建的字典；主键查找为二分查找（find）；category 列倒排索引按需构建（index）
+    - 使用完调用 close（或 with 语句）释放映射
+    """
+
+    def __init__(self, buffer, header: Dict, mm: Optional[mmap.mmap] = None, path: Optional[Path] = None):
+        self.path = path
+        self.rows: int = header["rows"]
+        self.key: Optional[str] = header["key"]
+        self._mmap = mm
+        self._views: List[memoryview] = []
+        self._indexes: Dict[str, Dict[Any, array]] = {}
+        self._index_lock = threading.Lock()
+        self.columns: Dict[str, Union[NumericColumn, CategoryColumn, StrColumn]] = {}
+
+        base = self._view(memoryview(buffer))
+        data_start = _align(len(MAGIC) + _HEADER_LEN.size + _HEADER_LEN.unpack_from(base, len(MAGIC))[0])
+        swap = header["byteorder"] != sys.byteorder
+        for descriptor in header["columns"]:
+            blocks = [self._view(base[data_start + offset:data_start + offset + size])
+                      for offset, size in descriptor["blocks"]]
+            data = self._cast(blocks[0], descriptor["typecode"], swap)
+            kind = descriptor["kind"]
+            if kind == "category":
+                column = CategoryColumn(data, descriptor["values"])
+            elif kind == "str":
+                column = StrColumn(data, blocks[1])
+            else:
+                column = NumericColumn(data)
+            self.columns[descriptor["name"]] = column
+        self.names = tuple(self.columns)
+
+    @classmethod
+    def open(cls, path: Union[str, Path], use_mmap: bool = True) -> "ColumnarTable":
+        """打开列式文件（use_mmap=False 时整体读入内存）"""
+        path = Path(path)
+        with open(path, "rb") as f:
+            if use_mmap:
+                buffer = mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buffer, mm = f.read(), None
+        if buffer[:len(MAGIC)] != MAGIC:
+            if mm is not None:
+                mm.close()
+            raise ValueError(f"不是列式数据文件：{path}")
+        header_len = _HEADER_LEN.unpack_from(buffer, len(MAGIC))[0]
+        start = len(MAGIC) + _HEADER_LEN.size
+        header = json.loads(bytes(buffer[start:start + header_len]).decode("utf-8"))
+        return cls(buffer, header, mm=mm, path=path)
+
+    def _view(self, view: memoryview) -> memoryview:
+        self._views.append(view)
+        return view
+
+    def _cast(self, view: memoryview, typecode: str, swap: bool):
+        if not swap:
+            return self._view(view.cast(typecode))
+        # 跨字节序读取（极少见）：复制一份并转换字节序
+        data = array(typecode, bytes(view))
+        data.byteswap()
+        return data
+
+    # -------------------------- 读取接口 --------------------------
+    def __len__(self) -> int:
+        return self.rows
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """第 index 行（新建字典，调用方可随意修改）"""
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        columns = list(self.columns.items())
+        for index in range(self.rows):
+            yield {name: column[index] for name, column in columns}
+
+    def index(self, name: str) -> Dict[Any, array]:
+        """
+        category 列的倒排索引：{取值: 行号数组（uint32，升序）}
+        首次调用时扫描一遍编码列构建，之后缓存在表对象上（同一进程内所有使用方共享）
+        """
+        postings = self._indexes.get(name)
+        if postings is None:
+            with self._index_lock:
+                postings = self._indexes.get(name)
+                if postings is None:
+                    column = self.columns[name]
+                    if not isinstance(column, CategoryColumn):
+                        raise ValueError(f"只有 category 列支持倒排索引：{name}")
+                    buckets = [array("I") for _ in column.values]
+                    appenders = [bucket.append for bucket in buckets]
+                    for row, code in enumerate(column.codes):
+                        appenders[code](row)
+                    postings = self._indexes[name] = dict(zip(column.values, buckets))
+        return postings
+
+    def find(self, key_value: Any) -> int:
+        """按主键二分查找行号（不存在返回-1）"""
+        if self.key is None:
+            raise ValueError("该表未声明主键列")
+        keys = self.columns[self.key]
+        try:
+            index = bisect.bisect_left(keys, key_value, 0, self.rows)
+        except TypeError:  # 与主键类型不可比较（如用整数查字符串主键）
+            return -1
+        return index if index < self.rows and keys[index] == key_value else -1
+
+    def close(self) -> None:
+        """释放列视图与文件映射（之后不可再读取）"""
+        self.columns = {}
+        self._indexes = {}
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class TableMapping(Mapping):
+    """
+    按主键访问的只读映射视图：{主键: 行字典}
+    可直接作为 CowUserStore 的基线（每次访问按需构造行字典，不常驻内存）
+    """
+
+    def __init__(self, table: ColumnarTable):
+        if table.key is None:
+            raise ValueError("该表未声明主键列")
+        self.table = table
+
+    def __getitem__(self, key_value) -> Dict[str, Any]:
+        index = self.table.find(key_value)
+        if index < 0:
+            raise KeyError(key_value)
+        return self.table.row(index)
+
+    def __contains__(self, key_value) -> bool:
+        return self.table.find(key_value) >= 0
+
+    def __iter__(self) -> Iterator:
+        return iter(self.table.columns[self.table.key])
+
+    def __len__(self) -> int:
+        return self.table.rows
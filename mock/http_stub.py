@@ -0,0 +1,270 @@
+# mock/http_stub.py
+import asyncio
+import json
+import random
+import socket
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests",
+           500: "Internal Server Error", 502: "Bad Gateway", 503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+class StubFault:
+    """
+    故障注入规则
+    :param latency_ms: 固定延迟（毫秒，协程内等待，不占用 worker）
+    :param jitter_ms: 附加随机延迟上限（毫秒，均匀分布）
+    :param error_rate: 注入错误的概率（0~1）
+    :param error_status: 注入错误的状态码；0 表示不返回响应直接断开连接（模拟连接被重置）
+    """
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0.0, error_status: int = 503):
+        if not 0 <= error_rate <= 1:
+            raise ValueError(f"error_rate 必须在 0~1 之间：{error_rate}")
+        self.latency_ms, self.jitter_ms = latency_ms, jitter_ms
+        self.error_rate, self.error_status = error_rate, error_status
+
+
+class _ConnectionReset(Exception):
+    """故障注入：不返回响应直接断开连接"""
+
+
+class EchoStubServer:
+    """
+    本地回显服务（替代 httpbin.org，功能用例/压测/基准测试离线运行）
+    - httpbin 风格路由：/get 返回查询参数，/post 返回请求体，/status/<code> 返回指定状态码，
+      /stream/<n> 返回n行JSON，另支持注册静态响应
+    - asyncio 实现，workers 个线程各运行一个事件循环，共享同一个监听 socket（HTTP/1.1 Keep-Alive）
+    - 故障注入：全局或按路径配置延迟/错误率，随机数种子固定时错误序列可复现
+    用法：
+        with EchoStubServer(workers=2) as stub:
+            stub.set_fault(latency_ms=50, error_rate=0.1, path="/post")
+            RequestUtil().send("GET", f"{stub.base_url}/get")
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, workers: int = 2,
+                 fault: Optional[StubFault] = None, seed: Optional[int] = None):
+        self.host = host
+        self.port = port  # 0=系统分配空闲端口
+        self.workers = max(1, workers)
+        # 静态响应：{路径: (响应体, Content-Type)}，优先于回显路由
+        self.static_routes: Dict[str, Tuple[bytes, str]] = {}
+        self._default_fault = fault or StubFault()
+        self._faults: Dict[Optional[str], StubFault] = {None: self._default_fault}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._request_count = 0
+        self._sock: Optional[socket.socket] = None
+        self._loops: List[asyncio.AbstractEventLoop] = []
+        self._stop_events: List[asyncio.Event] = []
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def request_count(self) -> int:
+        """已接收的请求数（含注入错误的请求）"""
+        return self._request_count
+
+    def add_static(self, path: str, body: bytes, content_type: str = "application/json") -> None:
+        """注册静态响应（如基准测试用的大报文），GET path 时原样返回"""
+        self.static_routes[path] = (body, content_type)
+
+    # -------------------------- 故障注入 --------------------------
+    def set_fault(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0.0,
+                  error_status: int = 503, path: Optional[str] = None) -> None:
+        """设置故障规则：path 为空时作用于全部路径，否则只作用于该路径（优先于全局规则）"""
+        self._faults[path] = StubFault(latency_ms, jitter_ms, error_rate, error_status)
+
+    def clear_faults(self) -> None:
+        """清除运行期设置的故障规则（恢复为构造时的全局规则）"""
+        self._faults = {None: self._default_fault}
+
+    def _fault_for(self, path: str) -> StubFault:
+        fault = self._faults.get(path)
+        return self._faults[None] if fault is None else fault
+
+    # -------------------------- 启停 --------------------------
+    def start(self) -> "EchoStubServer":
+        self._sock = socket.create_server((self.host, self.port), backlog=1024)
+        self._sock.setblocking(False)
+        self.port = self._sock.getsockname()[1]
+        ready = threading.Barrier(self.workers + 1)
+        self._threads = [
+            threading.Thread(target=self._run_worker, args=(ready,), name=f"EchoStubServer-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        ready.wait(timeout=10)
+        return self
+
+    def stop(self) -> None:
+        for loop, stop_event in zip(self._loops, self._stop_events):
+            loop.call_soon_threadsafe(stop_event.set)
+        for thread in self._threads:
+            thread.join(timeout=5)
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._loops, self._stop_events, self._threads = [], [], []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run_worker(self, ready: threading.Barrier) -> None:
+        asyncio.run(self._serve(ready))
+
+    async def _serve(self, ready: threading.Barrier) -> None:
+        """单个 worker：在独立事件循环上监听共享 socket（dup 出独立的fd，关闭互不影响）"""
+        stop_event = asyncio.Event()
+        handlers = {}  # 处理协程 -> 连接
+
+        async def on_connect(reader, writer):
+            task = asyncio.current_task()
+            handlers[task] = writer
+            try:
+                await self._handle_connection(reader, writer)
+            finally:
+                handlers.pop(task, None)
+                writer.close()
+
+        server = await asyncio.start_server(on_connect, sock=self._sock.dup(), backlog=1024)
+        with self._lock:
+            self._loops.append(asyncio.get_running_loop())
+            self._stop_events.append(stop_event)
+        ready.wait()
+        await stop_event.wait()
+        server.close()
+        # Keep-Alive 空闲连接的处理协程阻塞在读请求头，不会自行结束：关闭连接使其读到 EOF 正常返回，并等待全部退出
+        # （留给 asyncio.run 统一取消时，start_server 的连接回调会输出 CancelledError 异常栈）
+        tasks = list(handlers)
+        for writer in list(handlers.values()):
+            writer.close()
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=1)
+            for task in pending:  # 仍在处理请求（如注入的延迟）：只能取消
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # -------------------------- 请求处理 --------------------------
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """处理一个连接上的多个请求（Keep-Alive），对端关闭或请求 Connection: close 时结束"""
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = request_line.split(" ", 2)
+            except ValueError:
+                return
+            headers = {}
+            for line in header_lines:
+                name, sep, value = line.partition(":")
+                if sep:
+                    headers[name.strip()] = value.strip()
+            lowered = {k.lower(): v for k, v in headers.items()}
+            try:
+                body = await reader.readexactly(int(lowered.get("content-length") or 0))
+            except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+                return
+
+            keep_alive = lowered.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+            try:
+                status, payload, content_type = await self._dispatch(method.upper(), target, headers, body)
+            except _ConnectionReset:
+                transport = writer.transport
+                if transport is not None:
+                    transport.abort()
+                return
+            writer.write(self._render(status, payload, content_type, keep_alive))
+            try:
+                await writer.drain()
+            except ConnectionError:
+                return
+            if not keep_alive:
+                return
+
+    async def _dispatch(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        """路由 + 故障注入，返回 (状态码, 响应体, Content-Type)"""
+        parts = urlsplit(target)
+        fault = self._fault_for(parts.path)
+        with self._lock:
+            self._request_count += 1
+            inject_error = fault.error_rate > 0 and self._random.random() < fault.error_rate
+            jitter = self._random.uniform(0, fault.jitter_ms) if fault.jitter_ms else 0
+        if fault.latency_ms or jitter:
+            await asyncio.sleep((fault.latency_ms + jitter) / 1000)
+        if inject_error:
+            if not fault.error_status:
+                raise _ConnectionReset()
+            return fault.error_status, self._json({"error": "injected fault", "url": target}), "application/json"
+
+        if method == "GET":
+            return self._route_get(parts, target, headers)
+        if method == "POST" and parts.path == "/post":
+            try:
+                body_json = json.loads(body) if body else None
+            except ValueError:
+                body_json = None
+            form = {}
+            if headers.get("Content-Type", "").startswith("application/x-www-form-urlencoded"):
+                form = self._args(body.decode("utf-8", "replace"))
+            return 200, self._json({
+                "args": self._args(parts.query),
+                "data": body.decode("utf-8", "replace"),
+                "form": form,
+                "json": body_json,
+                "headers": headers,
+                "url": target
+            }), "application/json"
+        return 404, self._json({"error": "not found"}), "application/json"
+
+    def _route_get(self, parts, target: str, headers: Dict[str, str]):
+        static = self.static_routes.get(parts.path)
+        if static is not None:
+            return (200, *static)
+        if parts.path == "/get":
+            return 200, self._json({"args": self._args(parts.query), "headers": headers, "url": target}), "application/json"
+        prefix, _, arg = parts.path[1:].partition("/")
+        if prefix == "stream" and arg.isdigit():
+            lines = (json.dumps({"id": i, "url": target}) for i in range(int(arg)))
+            return 200, ("\n".join(lines) + "\n").encode("utf-8"), "application/json"
+        if prefix == "status" and arg.isdigit():
+            return int(arg), b"", "text/plain"
+        return 404, self._json({"error": "not found"}), "application/json"
+
+    @staticmethod
+    def _render(status: int, body: bytes, content_type: str, keep_alive: bool) -> bytes:
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        return head.encode("latin-1") + body
+
+    @staticmethod
+    def _args(query: str) -> dict:
+        return {k: v[0] if len(v) == 1 else v for k, v in parse_qs(query).items()}
+
+    @staticmethod
+    def _json(payload: dict) -> bytes:
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def create_stub_server(**kwargs) -> EchoStubServer:
+    """按 EnvConfig（AUTO_STUB_*）创建本地回显服务，kwargs 覆盖配置"""
+    from config.env_config import config
+    kwargs.setdefault("workers", config.STUB_WORKERS)
+    kwargs.setdefault("seed", config.STUB_SEED)
+    kwargs.setdefault("fault", StubFault(config.STUB_LATENCY_MS, config.STUB_JITTER_MS,
+                                         config.STUB_ERROR_RATE, config.STUB_ERROR_STATUS))
+    return EchoStubServer(**kwargs)
@@ -1,10 +1,15 @@
-from typing import Dict, Optional, Any
+from typing import Dict, Iterable, Mapping, Optional, Any
+from datetime import datetime
+from config.env_config import config
+from mock.user_store import CowUserStore
 from utils.log_util import logger
-import copy
+from utils.mock_context import current_context
+from utils.records import UserRecord
+from utils.ttl_store import TTLStore
 
 # -------------------------- 基础 Mock 数据（原始模板，用于重置） --------------------------
-# 原始模板：避免直接修改导致数据污染，每次重置时从模板复制
-MOCK_USER_DB_TEMPLATE = {
+# 原始模板：避免直接修改导致数据污染，每次重置时从模板复制（用户为 __slots__ 紧凑记录，兼容字典用法）
+MOCK_USER_DB_TEMPLATE = {name: UserRecord.from_row(user) for name, user in {
     "test_user": {
         "username": "test_user",
         "password": "test_pass_123",
@@ -45,12 +50,35 @@ MOCK_USER_DB_TEMPLATE = {
         "email": "frozen@example.com",
         "last_login_time": None
     }
-}
+}.items()}
 
-# 运行时 Mock 数据（每次测试前可重置）
-MOCK_USER_DB = copy.deepcopy(MOCK_USER_DB_TEMPLATE)
-# 模拟 Redis Token 缓存（支持过期时间）
-MOCK_REDIS_TOKEN: Dict[str, Dict[str, Any]] = {}
+
+# -------------------------- 运行时 Mock 数据（按 Mock 上下文隔离，支持并行执行） --------------------------
+def user_baseline() -> Mapping[str, Dict[str, Any]]:
+    """默认用户基线：配置了 AUTO_MOCK_DATASET 时为数据集中的用户（mmap 只读映射），否则为手写模板"""
+    if config.MOCK_DATASET:
+        from mock.synthetic_data import dataset_users
+        return dataset_users(config.MOCK_DATASET)
+    return MOCK_USER_DB_TEMPLATE
+
+
+def mock_user_db() -> CowUserStore:
+    """当前上下文的用户表（写时复制：基线只读，修改写入覆盖层，每次测试前 O(1) 重置）"""
+    return current_context().state("login_mock.users", lambda: CowUserStore(user_baseline()))
+
+
+def mock_redis_token() -> TTLStore:
+    """当前上下文的 Token 缓存（单调时钟 TTL，到期主动清理）"""
+    return current_context().state("login_mock.tokens", TTLStore)
+
+
+def __getattr__(name):
+    # 兼容旧用法：from mock.login_mock import MOCK_USER_DB / MOCK_REDIS_TOKEN（取导入时所在上下文的数据）
+    if name == "MOCK_USER_DB":
+        return mock_user_db()
+    if name == "MOCK_REDIS_TOKEN":
+        return mock_redis_token()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # -------------------------- Mock 工具类（增强功能） --------------------------
@@ -59,130 +87,150 @@ class LoginMock:
     @staticmethod
     def query_user(username: str) -> Optional[Dict[str, Any]]:
         """Mock 查询用户信息（返回副本，避免外部修改原始数据）"""
-        logger.info(f"[Mock DB] 查询用户: {username}")
-        user = MOCK_USER_DB.get(username)
-        if user:
-            # 返回深拷贝，防止外部修改 Mock 数据
-            return copy.deepcopy(user)
-        return None
+        logger.info("[Mock DB] 查询用户: %s", username)
+        # 返回浅拷贝快照（字段均为不可变值），防止外部修改 Mock 数据
+        return mock_user_db().snapshot(username)
 
     @staticmethod
     def update_fail_count(username: str, increment: bool = True) -> bool:
         """Mock 更新失败次数（完善状态流转）"""
-        user = MOCK_USER_DB.get(username)
+        user = mock_user_db().peek(username)
         if not user:
-            logger.warning(f"[Mock DB] 用户 {username} 不存在，更新失败次数失败")
+            logger.warning("[Mock DB] 用户 %s 不存在，更新失败次数失败", username)
             return False
 
         # 更新失败次数
         if increment:
             # 已锁定/冻结的账号，不更新失败次数
             if user["status"] in ["locked", "frozen"]:
-                logger.warning(f"[Mock DB] 用户 {username} 状态为 {user['status']}，跳过失败次数更新")
+                logger.warning("[Mock DB] 用户 %s 状态为 %s，跳过失败次数更新", username, user['status'])
                 return True
+            user = mock_user_db().for_update(username)
             user["fail_count"] += 1
             # 失败次数 >= 5 锁定账号
             if user["fail_count"] >= 5:
                 user["status"] = "locked"
-                logger.warning(f"[Mock DB] 用户 {username} 失败次数达5次，账号锁定")
+                logger.warning("[Mock DB] 用户 %s 失败次数达5次，账号锁定", username)
         else:
             # 登录成功，重置失败次数 + 恢复active状态（如果是locked）
+            user = mock_user_db().for_update(username)
             user["fail_count"] = 0
             if user["status"] == "locked":
                 user["status"] = "active"
-                logger.info(f"[Mock DB] 用户 {username} 重置失败次数，解锁账号")
+                logger.info("[Mock DB] 用户 %s 重置失败次数，解锁账号", username)
 
-        logger.info(f"[Mock DB] 用户 {username} 失败次数更新为: {user['fail_count']}, 状态: {user['status']}")
+        logger.info("[Mock DB] 用户 %s 失败次数更新为: %s, 状态: %s", username, user['fail_count'], user['status'])
+        return True
+
+    @staticmethod
+    def set_fail_count(username: str, fail_count: int) -> bool:
+        """Mock 预置失败次数（测试前置用，不触发锁定状态流转）"""
+        user = mock_user_db().for_update(username)
+        if not user:
+            logger.warning("[Mock DB] 用户 %s 不存在，预置失败次数失败", username)
+            return False
+        user["fail_count"] = fail_count
         return True
 
     @staticmethod
     def update_last_login_time(username: str, login_time: str) -> bool:
         """Mock 更新最后登录时间（新增实用功能）"""
-        user = MOCK_USER_DB.get(username)
+        user = mock_user_db().for_update(username)
         if not user:
-            logger.warning(f"[Mock DB] 用户 {username} 不存在，更新登录时间失败")
+            logger.warning("[Mock DB] 用户 %s 不存在，更新登录时间失败", username)
             return False
         user["last_login_time"] = login_time
-        logger.info(f"[Mock DB] 用户 {username} 最后登录时间更新为: {login_time}")
+        logger.info("[Mock DB] 用户 %s 最后登录时间更新为: %s", username, login_time)
         return True
 
     # -------------------------- Redis Token 操作（支持过期时间） --------------------------
     @staticmethod
     def get_token(username: str) -> Optional[str]:
-        """Mock 获取 Token（校验过期时间）"""
-        logger.info(f"[Mock Redis] 获取 {username} 的 Token")
-        token_info = MOCK_REDIS_TOKEN.get(username)
-        if not token_info:
-            return None
-
-        # 【修改点1】修复：硬编码时间改为动态判断（避免Token永远过期/不过期）
-        from datetime import datetime
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        expire_at = token_info.get("expire_at")
-        if expire_at and expire_at < current_time:
-            logger.warning(f"[Mock Redis] 用户 {username} 的 Token 已过期（过期时间：{expire_at}，当前时间：{current_time}）")
-            del MOCK_REDIS_TOKEN[username]  # 过期自动删除
-            return None
-
-        return token_info["token"]
+        """Mock 获取 Token（已过期的 Token 由 TTL 存储自动清理）"""
+        logger.info("[Mock Redis] 获取 %s 的 Token", username)
+        return mock_redis_token().get(username)
 
     @staticmethod
-    def set_token(username: str, token: str, expire_at: Optional[str] = None) -> None:
-        """Mock 设置 Token（支持过期时间）"""
-        MOCK_REDIS_TOKEN[username] = {
-            "token": token,
-            "expire_at": expire_at  # None=永不过期
-        }
-        logger.info(f"[Mock Redis] 设置 {username} 的 Token: {token}，过期时间: {expire_at or '永不过期'}")
+    def set_token(username: str, token: str, expire_at: Optional[str] = None,
+                  expire: Optional[float] = None) -> None:
+        """
+        Mock 设置 Token（支持过期时间）
+        :param expire_at: 过期时间点（"%Y-%m-%d %H:%M:%S"），兼容旧用法
+        :param expire: 存活秒数（与 MockRedisUtil.set_token 一致），优先于 expire_at
+        """
+        if expire is None and expire_at:
+            expire = (datetime.strptime(expire_at, "%Y-%m-%d %H:%M:%S") - datetime.now()).total_seconds()
+        mock_redis_token().set(username, token, ttl=expire)  # None=永不过期
+        logger.info("[Mock Redis] 设置 %s 的 Token: %s，过期时间: %s", username, token,
+                    f"{expire:.0f}秒后" if expire is not None else '永不过期')
 
     @staticmethod
     def del_token(username: str) -> bool:
         """Mock 删除 Token（新增登出功能）"""
-        if username in MOCK_REDIS_TOKEN:
-            del MOCK_REDIS_TOKEN[username]
-            logger.info(f"[Mock Redis] 删除 {username} 的 Token")
+        if mock_redis_token().delete(username):
+            logger.info("[Mock Redis] 删除 %s 的 Token", username)
             return True
-        logger.warning(f"[Mock Redis] 用户 {username} 无 Token，删除失败")
+        logger.warning("[Mock Redis] 用户 %s 无 Token，删除失败", username)
         return False
 
+    @staticmethod
+    def get_tokens(usernames: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Mock 批量获取 Token（对齐 Redis MGET），未命中为 None"""
+        usernames = list(usernames)
+        logger.info("[Mock Redis] 批量获取 %s 个用户的 Token", len(usernames))
+        return dict(zip(usernames, mock_redis_token().get_many(usernames)))
+
+    @staticmethod
+    def set_tokens(mapping: Mapping[str, str], expire: Optional[float] = None) -> None:
+        """Mock 批量设置 Token（同一过期秒数，None=永不过期）"""
+        mock_redis_token().set_many(mapping, ttl=expire)
+        logger.info("[Mock Redis] 批量设置 %s 个用户的 Token", len(mapping))
+
+    @staticmethod
+    def get_or_set_token(username: str, token: str, expire: Optional[float] = None) -> str:
+        """Mock 获取 Token，不存在时写入 token（原子操作），返回最终生效的 Token"""
+        value, created = mock_redis_token().get_or_set(username, token, ttl=expire)
+        logger.info("[Mock Redis] %s %s 的 Token", "设置" if created else "复用", username)
+        return value
+
     # -------------------------- 测试辅助功能（关键：避免数据污染） --------------------------
     @staticmethod
     def reset_mock_data() -> None:
-        """重置所有 Mock 数据到初始状态（测试前必备）"""
-        global MOCK_USER_DB, MOCK_REDIS_TOKEN
-        MOCK_USER_DB = copy.deepcopy(MOCK_USER_DB_TEMPLATE)
-        MOCK_REDIS_TOKEN = {}
+        """重置所有 Mock 数据到初始状态（测试前必备，丢弃覆盖层，耗时与用户数无关）"""
+        mock_user_db().reset()
+        mock_redis_token().clear()
         logger.info("[Mock] 所有 Mock 数据已重置为初始状态")
 
+    @staticmethod
+    def seed_users(users: Mapping[str, Dict[str, Any]]) -> None:
+        """
+        替换用户基线（如加载10万级用户用于锁定/吞吐场景），之后的重置均恢复到该基线
+        :param users: {username: 用户信息}，加载后视为只读，不会被修改
+        """
+        mock_user_db().rebase(users)
+        logger.info("[Mock] 用户基线已替换，共 %s 个用户", len(users))
+
     @staticmethod
     def add_temp_user(username: str, user_info: Dict[str, Any]) -> bool:
         """新增临时用户（用于测试自定义场景）"""
-        if username in MOCK_USER_DB:
-            logger.warning(f"[Mock DB] 用户 {username} 已存在，新增失败")
+        if username in mock_user_db():
+            logger.warning("[Mock DB] 用户 %s 已存在，新增失败", username)
             return False
-        # 补充默认值，避免KeyError
-        default_info = {
-            "password": "",
-            "fail_count": 0,
-            "status": "active",
-            "role": "user",
-            "phone": "",
-            "email": "",
-            "last_login_time": None
-        }
-        user_info = {**default_info, **user_info}
-        MOCK_USER_DB[username] = user_info
-        logger.info(f"[Mock DB] 新增临时用户: {username}，信息: {user_info}")
+        # 补充默认值，避免KeyError（缺省值见 UserRecord.DEFAULTS）
+        user_info = UserRecord.from_row(user_info)
+        mock_user_db()[username] = user_info
+        logger.info("[Mock DB] 新增临时用户: %s，信息: %s", username, user_info)
         return True
 
     @staticmethod
     def del_temp_user(username: str) -> bool:
         """删除临时用户（测试后清理）"""
-        if username not in MOCK_USER_DB_TEMPLATE and username in MOCK_USER_DB:
-            del MOCK_USER_DB[username]
-            logger.info(f"[Mock DB] 删除临时用户: {username}")
+        users = mock_user_db()
+        if not users.in_base(username) and username in users:
+            del users[username]
+            logger.info("[Mock DB] 删除临时用户: %s", username)
             return True
-        logger.warning(f"[Mock DB] {username} 不是临时用户，删除失败")
+        logger.warning("[Mock DB] %s 不是临时用户，删除失败", username)
         return False
 
 
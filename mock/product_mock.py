@@ -1,11 +1,15 @@
 # mock/product_mock.py
-from typing import List, Dict, Tuple, Optional
+from pathlib import Path
+from typing import Iterable, List, Dict, Tuple, Optional, Union
+from config.env_config import config
+from mock.product_store import ColumnarProductStore, ProductStore
 from utils.log_util import logger
+from utils.mock_context import current_context
 
 
 class ProductMockData:
     """商品Mock数据类（适配API层的调用方式）"""
-    # 基础商品列表（API层直接引用）
+    # 基础商品列表（默认商品目录，可通过 load_products 替换为大规模目录）
     PRODUCT_LIST: List[Dict] = [
         {
             "product_id": "product_001",
@@ -33,13 +37,64 @@ class ProductMockData:
         }
     ]
 
+    # 商品存储（主键 + category/status 二级索引），按 Mock 上下文隔离，首次使用时由 PRODUCT_LIST 构建
+    # 配置了 AUTO_MOCK_DATASET 时由数据集构建：AUTO_PRODUCT_BACKEND=columnar（默认）直接映射列式文件，dict 逐行加载为字典
+    STORE_STATE = "product_mock.store"
+
+    @classmethod
+    def store(cls) -> Union[ProductStore, ColumnarProductStore]:
+        """获取当前 Mock 上下文的商品存储"""
+        return current_context().state(cls.STORE_STATE, cls._build_store)
+
+    @classmethod
+    def _build_store(cls) -> Union[ProductStore, ColumnarProductStore]:
+        if config.MOCK_DATASET:
+            from mock.synthetic_data import dataset_products
+            table = dataset_products(config.MOCK_DATASET)
+            return ColumnarProductStore(table) if config.PRODUCT_BACKEND == "columnar" else ProductStore(table.iter_rows())
+        return ProductStore(product.copy() for product in cls.PRODUCT_LIST)  # 存储持有副本，写入不污染 PRODUCT_LIST
+
+    @classmethod
+    def load_products(cls, products: Iterable[Dict]) -> int:
+        """
+        加载商品目录（替换默认的 PRODUCT_LIST，用于大规模目录测试，仅对当前 Mock 上下文生效）
+        :return: 加载后的商品数量
+        """
+        store = ProductStore(products)
+        current_context().set_state(cls.STORE_STATE, store)
+        logger.info("[Mock] 商品目录已加载，共 %s 个商品", len(store))
+        return len(store)
+
+    @classmethod
+    def load_catalog(cls, path: Union[str, Path]) -> int:
+        """
+        加载列式商品目录文件（mmap 映射，不逐个构造商品字典；同一文件在进程内只映射一次，仅对当前 Mock 上下文生效）
+        :return: 加载后的商品数量
+        """
+        from mock.synthetic_data import open_table
+        store = ColumnarProductStore(open_table(path))
+        current_context().set_state(cls.STORE_STATE, store)
+        logger.info("[Mock] 列式商品目录已加载：%s，共 %s 个商品", path, len(store))
+        return len(store)
+
+    @classmethod
+    def reset_catalog(cls) -> None:
+        """恢复默认商品目录（PRODUCT_LIST）"""
+        current_context().drop_state(cls.STORE_STATE)
+
+    @classmethod
+    def query_products(cls, page: int = 1, size: Optional[int] = None,
+                       category: Optional[str] = None, status: Optional[str] = None) -> Tuple[int, List[Dict]]:
+        """分页/过滤查询商品列表（走索引），返回 (命中总数, 当前页商品)"""
+        return cls.store().query(category=category, status=status, page=page, size=size)
+
     @classmethod
     def check_product_logic(cls, product_id: str) -> Tuple[int, str, Optional[Dict]]:
         """
         委托处理商品详情业务逻辑（适配API层调用）
         返回：(code, msg, data)
         """
-        logger.info(f"【Mock】校验商品逻辑：product_id={product_id}")
+        logger.info("【Mock】校验商品逻辑：product_id=%s", product_id)
 
         # 1. 查询商品
         product = cls._query_product(product_id)
@@ -57,14 +112,18 @@ class ProductMockData:
 
     @classmethod
     def _query_product(cls, product_id: str) -> Optional[Dict]:
-        """内部方法：查询单个商品"""
-        for p in cls.PRODUCT_LIST:
-            if p["product_id"] == product_id:
-                return p.copy()  # 返回副本，避免外部修改Mock数据
-        return None
+        """内部方法：查询单个商品（主键索引，O(1)）"""
+        return cls.store().snapshot(product_id)  # 返回副本，避免外部修改Mock数据（列式存储只在此处构造字典）
 
     @classmethod
     def reset_mock_data(cls) -> None:
-        """重置Mock数据（测试前置用）"""
-        # 重置PRODUCT_LIST为初始值（如果有动态修改的场景，这里补充）
+        """
+        重置当前 Mock 上下文的商品数据（测试前置用）
+        列式目录只丢弃覆盖层中的修改（保留已映射的目录文件），字典存储直接丢弃，下次使用时按默认目录重建
+        """
+        store = current_context().peek_state(cls.STORE_STATE)
+        if isinstance(store, ColumnarProductStore):
+            store.reset()
+        else:
+            current_context().drop_state(cls.STORE_STATE)
         logger.info("[Mock] 商品Mock数据已重置为初始状态")
\ No newline at end of file
@@ -0,0 +1,215 @@
+# mock/product_store.py
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from mock.columnar import ColumnarTable
+
+
+class ProductStore:
+    """
+    商品内存存储（Mock层）
+    - 主键索引：product_id → 商品，详情查询 O(1)
+    - 二级索引：category / status → 商品ID有序集合（dict保序），过滤查询只遍历命中的商品
+    - 分页：按写入顺序返回，page从1开始，size为None时返回全部
+    """
+
+    def __init__(self, products: Iterable[Dict] = ()):
+        self._by_id: Dict[str, Dict] = {}
+        self._by_category: Dict[str, Dict[str, None]] = {}
+        self._by_status: Dict[str, Dict[str, None]] = {}
+        self.load(products)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, product_id) -> bool:
+        return product_id in self._by_id
+
+    def load(self, products: Iterable[Dict]) -> None:
+        """批量写入商品（已存在的商品覆盖更新）"""
+        for product in products:
+            self.upsert(product)
+
+    def upsert(self, product: Dict) -> None:
+        """写入单个商品，同步维护二级索引"""
+        product_id = product["product_id"]
+        if product_id in self._by_id:
+            self._unindex(self._by_id[product_id])
+        self._by_id[product_id] = product
+        self._by_category.setdefault(product.get("category"), {})[product_id] = None
+        self._by_status.setdefault(product.get("status"), {})[product_id] = None
+
+    def delete(self, product_id: str) -> bool:
+        product = self._by_id.pop(product_id, None)
+        if product is None:
+            return False
+        self._unindex(product)
+        return True
+
+    def get(self, product_id: str) -> Optional[Dict]:
+        """按主键查询（返回存储中的原对象，调用方需自行复制后再修改）"""
+        return self._by_id.get(product_id)
+
+    def snapshot(self, product_id: str) -> Optional[Dict]:
+        """按主键查询副本（调用方可随意修改）"""
+        product = self._by_id.get(product_id)
+        return product.copy() if product is not None else None
+
+    def query(self, category: Optional[str] = None, status: Optional[str] = None,
+              page: int = 1, size: Optional[int] = None) -> Tuple[int, List[Dict]]:
+        """
+        分页/过滤查询（条件为None表示不过滤）
+        :return: (命中总数, 当前页商品副本列表)
+        """
+        if category is not None and status is not None:
+            # 遍历较小的索引，用另一个索引做成员判断
+            by_category = self._by_category.get(category, {})
+            by_status = self._by_status.get(status, {})
+            small, large = (by_category, by_status) if len(by_category) <= len(by_status) else (by_status, by_category)
+            ids = [product_id for product_id in small if product_id in large]
+        elif category is not None:
+            ids = self._by_category.get(category, {})
+        elif status is not None:
+            ids = self._by_status.get(status, {})
+        else:
+            ids = self._by_id
+
+        total = len(ids)
+        if size is None:
+            page_ids = ids
+        else:
+            offset = (max(page, 1) - 1) * size
+            page_ids = islice(ids, offset, offset + size)
+        return total, [self._by_id[product_id].copy() for product_id in page_ids]
+
+    def _unindex(self, product: Dict) -> None:
+        product_id = product["product_id"]
+        for index, key in ((self._by_category, product.get("category")), (self._by_status, product.get("status"))):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(product_id, None)
+                if not bucket:
+                    del index[key]
+
+
+class ColumnarProductStore:
+    """
+    列式商品存储（Mock层，与 ProductStore 接口一致）
+    - 基线：mmap 映射的只读列式文件（mock/columnar.py），定长数值列 + 字典编码的 category/status 列
+      + 偏移/字节块字符串列；多进程映射同一文件时共享同一份物理内存，不为每个商品常驻 Python 字典
+    - 主键查询：二分查找；只在返回商品时才构造字典
+    - 过滤查询：category/status 倒排索引（首次过滤时构建，缓存在表对象上，同进程的所有上下文共享）
+    - 写入：覆盖层（写时复制），修改/删除基线商品只记录行号，reset 丢弃覆盖层（O(1)）
+    - 分页顺序：基线商品按主键升序，其后为覆盖层中新增/修改的商品（按写入顺序）
+    """
+
+    FILTER_COLUMNS = ("category", "status")
+
+    def __init__(self, table: ColumnarTable):
+        if table.key != "product_id":
+            raise ValueError(f"商品表主键必须为 product_id：{table.key}")
+        self._table = table
+        self._overlay: Dict[str, Dict] = {}
+        self._shadowed: Dict[int, None] = {}  # 被修改/删除的基线行号
+
+    def __len__(self) -> int:
+        return self._table.rows - len(self._shadowed) + len(self._overlay)
+
+    def __contains__(self, product_id) -> bool:
+        return product_id in self._overlay or self._base_row(product_id) >= 0
+
+    def _base_row(self, product_id: str) -> int:
+        """基线中未被覆盖的行号（不存在返回-1）"""
+        row = self._table.find(product_id)
+        return -1 if row in self._shadowed else row
+
+    # -------------------------- 写接口 --------------------------
+    def load(self, products: Iterable[Dict]) -> None:
+        """批量写入商品（已存在的商品覆盖更新）"""
+        for product in products:
+            self.upsert(product)
+
+    def upsert(self, product: Dict) -> None:
+        product_id = product["product_id"]
+        row = self._table.find(product_id)
+        if row >= 0:
+            self._shadowed[row] = None
+        self._overlay.pop(product_id, None)
+        self._overlay[product_id] = product
+
+    def delete(self, product_id: str) -> bool:
+        if product_id not in self:
+            return False
+        self._overlay.pop(product_id, None)
+        row = self._table.find(product_id)
+        if row >= 0:
+            self._shadowed[row] = None
+        return True
+
+    def reset(self) -> None:
+        """丢弃所有修改，恢复到基线目录（O(1)）"""
+        self._overlay = {}
+        self._shadowed = {}
+
+    # -------------------------- 读接口 --------------------------
+    def get(self, product_id: str) -> Optional[Dict]:
+        """按主键查询（基线商品每次新建字典，覆盖层商品返回原对象）"""
+        product = self._overlay.get(product_id)
+        if product is not None:
+            return product
+        row = self._base_row(product_id)
+        return self._table.row(row) if row >= 0 else None
+
+    def snapshot(self, product_id: str) -> Optional[Dict]:
+        """按主键查询副本（基线商品直接返回新建的字典，不再二次复制）"""
+        product = self._overlay.get(product_id)
+        if product is not None:
+            return product.copy()
+        row = self._base_row(product_id)
+        return self._table.row(row) if row >= 0 else None
+
+    def query(self, category: Optional[str] = None, status: Optional[str] = None,
+              page: int = 1, size: Optional[int] = None) -> Tuple[int, List[Dict]]:
+        """
+        分页/过滤查询（条件为None表示不过滤）
+        :return: (命中总数, 当前页商品副本列表)
+        """
+        filters = {name: value for name, value in zip(self.FILTER_COLUMNS, (category, status)) if value is not None}
+        rows = self._filter_rows(filters)
+        shadowed = [row for row in self._shadowed if self._row_matches(row, filters)]
+        extra = [product for product in self._overlay.values()
+                 if all(product.get(name) == value for name, value in filters.items())]
+        base_total = len(rows) - len(shadowed)
+        total = base_total + len(extra)
+
+        offset = 0 if size is None else (max(page, 1) - 1) * size
+        stop = total if size is None else min(offset + size, total)
+        if shadowed:
+            hidden = set(shadowed)
+            base_rows = islice((row for row in rows if row not in hidden), offset, stop)
+        else:
+            base_rows = rows[offset:stop]
+        page_items = [self._table.row(row) for row in base_rows]
+        page_items.extend(product.copy() for product in
+                          islice(extra, max(offset - base_total, 0), max(stop - base_total, 0)))
+        return total, page_items
+
+    def _filter_rows(self, filters: Dict[str, str]) -> Sequence[int]:
+        """命中过滤条件的基线行号（升序，含已被覆盖的行）"""
+        if not filters:
+            return range(self._table.rows)
+        items = list(filters.items())
+        postings = [self._table.index(name).get(value, ()) for name, value in items]
+        if len(postings) == 1:
+            return postings[0]
+        # 联合过滤：遍历较短的倒排列表，用另一列的编码做判断
+        if len(postings[0]) <= len(postings[1]):
+            small, (name, value) = postings[0], items[1]
+        else:
+            small, (name, value) = postings[1], items[0]
+        column = self._table.columns[name]
+        code, codes = column.code_of(value), column.codes
+        return [row for row in small if codes[row] == code]
+
+    def _row_matches(self, row: int, filters: Dict[str, str]) -> bool:
+        columns = self._table.columns
+        return all(columns[name][row] == value for name, value in filters.items())
@@ -0,0 +1,209 @@
+# mock/synthetic_data.py
+"""
+大规模合成数据生成器（Mock层）：按种子确定性生成用户/商品，写成列式文件（mock/columnar.py）
+同一 (数量, 种子) 生成的文件逐字节一致；Mock 可直接从文件启动（mmap 映射，不常驻 Python 对象）
+运行：python -m mock.synthetic_data --users 1000000 --products 1000000 --seed 42 [-o .cache/mock_dataset]
+"""
+import argparse
+import math
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from mock.columnar import ColumnarTable, TableMapping, write_table
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_DATASET_DIR = PROJECT_ROOT / ".cache" / "mock_dataset"
+USERS_FILE = "users.col"
+PRODUCTS_FILE = "products.col"
+
+# -------------------------- 分布配置 --------------------------
+# 用户：前 len(状态)*len(角色) 个用户依次覆盖所有 状态×角色 组合，其余按权重随机
+USER_STATUSES = ("active", "locked", "frozen")
+USER_STATUS_WEIGHTS = (90, 7, 3)
+USER_ROLES = ("user", "admin", "super_admin")
+USER_ROLE_WEIGHTS = (95, 4, 1)
+FAIL_COUNT_WEIGHTS = (80, 10, 5, 3, 2)  # 非锁定用户的失败次数 0~4
+LOCKED_FAIL_COUNT = 5  # 锁定用户的失败次数（与 LoginMock 锁定阈值一致）
+NEVER_LOGIN_RATE = 0.3  # last_login_time 为 None 的比例
+LOGIN_TIME_POOL = 1000  # last_login_time 取值池大小（字典编码列）
+
+# 商品：类目按权重分布；库存为0即售罄，其余按比例下架
+PRODUCT_CATEGORIES = ("electronics", "clothes", "home", "books", "food",
+                      "beauty", "sports", "toys", "auto", "health")
+PRODUCT_CATEGORY_WEIGHTS = (20, 20, 15, 10, 10, 8, 7, 5, 3, 2)
+OUT_OF_STOCK_RATE = 0.1
+OFF_SALE_RATE = 0.05
+MAX_STOCK = 1000
+
+# 生成ID的最小补零位数：模板ID为3位（product_001），生成ID至少4位，任何数量下都不会与模板重复
+ID_MIN_WIDTH = 4
+
+USER_SCHEMA = {"username": "str", "password": "str", "fail_count": "int", "status": "category",
+               "role": "category", "phone": "str", "email": "str", "last_login_time": "category"}
+PRODUCT_SCHEMA = {"product_id": "str", "name": "str", "price": "float", "stock": "int",
+                  "status": "category", "category": "category"}
+
+
+def _id_width(count: int) -> int:
+    """生成ID的补零位数（同一数据集内等宽，按字符串排序即按序号排序）"""
+    return max(len(str(max(count - 1, 0))), ID_MIN_WIDTH)
+
+
+def _append_template(columns: Dict[str, List], records) -> None:
+    """把手写模板数据（MOCK_USER_DB_TEMPLATE / PRODUCT_LIST）追加到生成数据中，保证现有用例可直接运行"""
+    for record in records:
+        for name, values in columns.items():
+            values.append(record.get(name))
+
+
+# -------------------------- 生成 --------------------------
+def generate_users(count: int, seed: int = 0, include_template: bool = True) -> Dict[str, List]:
+    """
+    生成用户列数据：{字段: 值列表}
+    用户名 user_0000001 形式（按位数补零，至少4位，天然有序）；密码/手机号由种子决定
+    """
+    rng = random.Random(seed)
+    width = _id_width(count)
+    combos = [(status, role) for status in USER_STATUSES for role in USER_ROLES]
+    statuses = rng.choices(USER_STATUSES, USER_STATUS_WEIGHTS, k=count)
+    roles = rng.choices(USER_ROLES, USER_ROLE_WEIGHTS, k=count)
+    for i, (status, role) in enumerate(combos[:count]):
+        statuses[i], roles[i] = status, role
+    fail_counts = rng.choices(range(len(FAIL_COUNT_WEIGHTS)), FAIL_COUNT_WEIGHTS, k=count)
+    login_times = [None] + [time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(1767225600 + rng.randrange(86400 * 365)))
+                            for _ in range(LOGIN_TIME_POOL)]
+    login_weights = [NEVER_LOGIN_RATE] + [(1 - NEVER_LOGIN_RATE) / LOGIN_TIME_POOL] * LOGIN_TIME_POOL
+
+    usernames = [f"user_{i:0{width}d}" for i in range(count)]
+    columns = {
+        "username": usernames,
+        "password": [f"pass_{rng.getrandbits(32):08x}" for _ in range(count)],
+        "fail_count": [LOCKED_FAIL_COUNT if status == "locked" else fail_count
+                       for status, fail_count in zip(statuses, fail_counts)],
+        "status": statuses,
+        "role": roles,
+        "phone": [f"1{3 + bits % 7}{bits // 7 % 10 ** 9:09d}" for bits in
+                  (rng.getrandbits(40) for _ in range(count))],
+        "email": [f"{username}@example.com" for username in usernames],
+        "last_login_time": rng.choices(login_times, login_weights, k=count),
+    }
+    if include_template:
+        from mock.login_mock import MOCK_USER_DB_TEMPLATE
+        _append_template(columns, MOCK_USER_DB_TEMPLATE.values())
+    return columns
+
+
+def generate_products(count: int, seed: int = 0, include_template: bool = True) -> Dict[str, List]:
+    """
+    生成商品列数据：{字段: 值列表}
+    商品ID product_0000001 形式（至少4位，不与模板商品 product_001 重复）；价格对数正态分布（0.1~99999.9），库存/状态/类目按分布配置
+    """
+    rng = random.Random(seed)
+    uniform, gauss = rng.random, rng.gauss  # 逐行调用的随机函数绑定为局部变量（百万级循环）
+    width = _id_width(count)
+    stocks = [0 if uniform() < OUT_OF_STOCK_RATE else 1 + int(uniform() * MAX_STOCK) for _ in range(count)]
+    columns = {
+        "product_id": [f"product_{i:0{width}d}" for i in range(count)],
+        "name": [f"测试商品{i}" for i in range(count)],
+        "price": [min(max(round(math.exp(gauss(4.5, 1.0)), 1), 0.1), 99999.9) for _ in range(count)],
+        "stock": stocks,
+        "status": ["out_of_stock" if stock == 0 else "off_sale" if uniform() < OFF_SALE_RATE else "on_sale"
+                   for stock in stocks],
+        "category": rng.choices(PRODUCT_CATEGORIES, PRODUCT_CATEGORY_WEIGHTS, k=count),
+    }
+    if include_template:
+        from mock.product_mock import ProductMockData
+        _append_template(columns, ProductMockData.PRODUCT_LIST)
+    return columns
+
+
+def build_dataset(directory: Union[str, Path] = DEFAULT_DATASET_DIR, users: int = 100000, products: int = 100000,
+                  seed: int = 0, include_template: bool = True) -> Dict[str, Path]:
+    """生成并写出数据集目录（users.col / products.col），返回 {"users": 路径, "products": 路径}"""
+    directory = Path(directory)
+    return {
+        "users": write_table(directory / USERS_FILE, generate_users(users, seed, include_template),
+                             USER_SCHEMA, key="username"),
+        # 商品使用独立的随机序列（调整用户数量不影响商品数据）
+        "products": write_table(directory / PRODUCTS_FILE, generate_products(products, seed + 1, include_template),
+                                PRODUCT_SCHEMA, key="product_id"),
+    }
+
+
+# -------------------------- 加载（进程内按路径缓存，所有 Mock 上下文共享同一份映射） --------------------------
+_tables: Dict[Path, ColumnarTable] = {}
+_tables_lock = threading.Lock()
+
+
+def open_table(path: Union[str, Path]) -> ColumnarTable:
+    """打开列式文件（mmap，同一路径只打开一次）"""
+    path = Path(path).resolve()
+    table = _tables.get(path)
+    if table is None:
+        with _tables_lock:
+            table = _tables.get(path)
+            if table is None:
+                table = _tables[path] = ColumnarTable.open(path)
+    return table
+
+
+def dataset_users(directory: Union[str, Path]) -> TableMapping:
+    """数据集中的用户：{username: 用户信息} 只读映射，可直接作为 CowUserStore 基线"""
+    return TableMapping(open_table(Path(directory) / USERS_FILE))
+
+
+def dataset_products(directory: Union[str, Path]) -> ColumnarTable:
+    """数据集中的商品表"""
+    return open_table(Path(directory) / PRODUCTS_FILE)
+
+
+def close_tables() -> None:
+    """关闭所有已打开的数据集文件（重新生成同一目录的数据前调用）"""
+    with _tables_lock:
+        tables = list(_tables.values())
+        _tables.clear()
+    for table in tables:
+        table.close()
+
+
+def boot_mocks(directory: Union[str, Path]) -> Dict[str, int]:
+    """
+    当前 Mock 上下文从数据集启动：LoginMock / MockDBUtil 的用户基线、ProductMockData 的商品目录
+    （全局生效请配置 AUTO_MOCK_DATASET，各 Mock 首次使用时自动从数据集构建）
+    :return: {"users": 用户数, "products": 商品数}
+    """
+    from mock.login_mock import LoginMock
+    from mock.product_mock import ProductMockData
+    from mock.user_store import CowUserStore
+    from utils.mock_context import current_context
+
+    users = dataset_users(directory)
+    LoginMock.seed_users(users)
+    current_context().set_state("db_util.users", CowUserStore(users))
+    products = ProductMockData.load_catalog(Path(directory) / PRODUCTS_FILE)
+    return {"users": len(users), "products": products}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="生成大规模 Mock 数据集（列式文件）")
+    parser.add_argument("--users", type=int, default=100000, help="用户数量")
+    parser.add_argument("--products", type=int, default=100000, help="商品数量")
+    parser.add_argument("--seed", type=int, default=0, help="随机数种子（相同种子生成相同数据）")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_DATASET_DIR), help="输出目录")
+    parser.add_argument("--no-template", action="store_true", help="不包含手写模板用户/商品")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    paths = build_dataset(args.output, args.users, args.products, args.seed, not args.no_template)
+    elapsed = time.perf_counter() - start
+    for name, path in paths.items():
+        print(f"{name:<10}{path}  {path.stat().st_size / 1024 / 1024:.1f}MB")
+    print(f"生成耗时 {elapsed:.2f}s；使用方式：AUTO_MOCK_DATASET={args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
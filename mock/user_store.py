@@ -0,0 +1,98 @@
+# mock/user_store.py
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+
+class CowUserStore(MutableMapping):
+    """
+    写时复制（copy-on-write）用户表（Mock层）
+    - 基线：只读的用户模板/大规模种子数据，任何操作都不会修改基线记录
+    - 覆盖层：首次修改某个用户时，把基线记录浅拷贝到覆盖层后再改
+    - 重置：直接丢弃覆盖层，O(1)，与用户总数无关
+    读接口：peek（只读原对象，不复制）/ snapshot（浅拷贝快照）
+    写接口：for_update（返回覆盖层中的可写记录）
+    兼容字典用法：MOCK_USER_DB[username]["fail_count"] = 3 等价于 for_update 后修改
+    """
+
+    def __init__(self, base: Mapping[str, Dict[str, Any]]):
+        self._base = base
+        self._overlay: Dict[str, Dict[str, Any]] = {}
+        self._deleted = set()  # 已删除的基线用户
+
+    # -------------------------- 读写接口 --------------------------
+    def peek(self, username: str) -> Optional[Dict[str, Any]]:
+        """只读查询（返回存储中的原对象，调用方不可修改）"""
+        record = self._overlay.get(username)
+        if record is not None:
+            return record
+        if username in self._deleted:
+            return None
+        return self._base.get(username)
+
+    def snapshot(self, username: str) -> Optional[Dict[str, Any]]:
+        """查询用户快照（浅拷贝，字段均为不可变值，修改快照不影响存储）"""
+        record = self.peek(username)
+        return record.copy() if record is not None else None
+
+    def for_update(self, username: str) -> Optional[Dict[str, Any]]:
+        """获取可写记录（基线用户首次修改时复制到覆盖层）"""
+        record = self._overlay.get(username)
+        if record is None:
+            if username in self._deleted:
+                return None
+            base_record = self._base.get(username)
+            if base_record is None:
+                return None
+            record = self._overlay[username] = base_record.copy()
+        return record
+
+    def in_base(self, username: str) -> bool:
+        """是否为基线用户（非测试中临时新增的用户）"""
+        return username in self._base
+
+    def reset(self) -> None:
+        """丢弃所有修改，恢复到基线状态（O(1)）"""
+        self._overlay = {}
+        self._deleted = set()
+
+    def rebase(self, base: Mapping[str, Dict[str, Any]]) -> None:
+        """替换基线（如加载大规模种子用户），同时丢弃覆盖层"""
+        self._base = base
+        self.reset()
+
+    # -------------------------- 字典接口（兼容旧用法） --------------------------
+    def __getitem__(self, username: str) -> Dict[str, Any]:
+        record = self.for_update(username)
+        if record is None:
+            raise KeyError(username)
+        return record
+
+    def get(self, username: str, default=None):
+        record = self.for_update(username)
+        return default if record is None else record
+
+    def __setitem__(self, username: str, record: Dict[str, Any]) -> None:
+        self._overlay[username] = record
+        self._deleted.discard(username)
+
+    def __delitem__(self, username: str) -> None:
+        if username not in self:
+            raise KeyError(username)
+        self._overlay.pop(username, None)
+        if username in self._base:
+            self._deleted.add(username)
+
+    def __contains__(self, username) -> bool:
+        if username in self._overlay:
+            return True
+        return username not in self._deleted and username in self._base
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._overlay
+        for username in self._base:
+            if username not in self._overlay and username not in self._deleted:
+                yield username
+
+    def __len__(self) -> int:
+        added = sum(1 for username in self._overlay if username not in self._base)
+        return len(self._base) + added - len(self._deleted)
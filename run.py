@@ -1,8 +1,10 @@
+import argparse
+import importlib.util
 import sys
 import pytest
 from pathlib import Path  # 更优雅的路径处理（兼容Windows/Mac/Linux）
 
-def run_tests():
+def run_tests(workers="1"):
     """
     自动化测试执行入口函数
     功能:
@@ -10,6 +12,7 @@ def run_tests():
     2. 执行测试用例并捕获执行结果
     3. 输出清晰的执行状态（成功/失败）
     4. 兼容多系统路径格式
+    5. 多进程并行执行（workers>1 或 auto，依赖 pytest-xdist；每个用例使用独立 Mock 上下文，互不干扰）
     """
     # ========== 1. 配置基础参数（可根据需求调整） ==========
     test_dir = "testcases"  # 测试用例目录
@@ -33,6 +36,14 @@ def run_tests():
         "--tb=short",  # 简化异常栈信息（避免输出过长）
         # "-q"  # 精简输出（可选，去掉-v的冗余信息）
     ]
+    if workers not in ("0", "1"):
+        if importlib.util.find_spec("xdist") is None:
+            print("⚠️ 未安装 pytest-xdist，忽略 --workers 参数，串行执行（pip install pytest-xdist）")
+        else:
+            # -s 会关闭输出捕获，xdist 下各 worker 输出交错，并行时去掉
+            pytest_args.remove("-s")
+            pytest_args += ["-n", workers]
+            print(f"⚡ 并行执行：{workers} 个 worker 进程")
 
     # ========== 4. 执行测试用例并捕获结果 ==========
     print("\n🚀 开始运行自动化测试用例...")
@@ -67,5 +78,14 @@ def run_tests():
 
     return exit_code
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="电商自动化测试执行入口")
+    parser.add_argument("-w", "--workers", default="1",
+                        help="并行worker进程数（整数或 auto=CPU核数，默认1即串行）")
+    args = parser.parse_args()
+    if args.workers != "auto" and not args.workers.isdigit():
+        parser.error("--workers 必须是正整数或 auto")
+    return args
+
 if __name__ == "__main__":
-    sys.exit(run_tests())
\ No newline at end of file
+    sys.exit(run_tests(parse_args().workers))
\ No newline at end of file
@@ -1,25 +1,152 @@
 
+from pathlib import Path
 import pytest
 from api.login_api import LoginApi
+from api.product_api import ProductApi
+from config.env_config import config as env_config
+from mock.http_stub import create_stub_server
+from utils.background_util import background_dispatcher
+from utils.data_util import data_util
+from utils.latency_util import latency_recorder
 from utils.log_util import logger
+from utils.mock_context import use_context
+from utils.token_broker import token_broker
+
+
+def pytest_configure(config):
+    """注册自定义标记"""
+    config.addinivalue_line(
+        "markers",
+        "case_stream(filename, kind): 从数据文件加载用例（经编译缓存），参数化用例的 case 参数（kind: login/product）"
+    )
+
+
+def pytest_generate_tests(metafunc):
+    """
+    用例参数化钩子：用例函数标记 @pytest.mark.case_stream("test_login", kind="login") 后，
+    在收集阶段经 data_util.load_cases 加载并参数化 case（导入模块时不读取数据文件）
+    预处理结果经编译缓存：文件未变化时跳过 YAML 解析和预处理，重复收集（含 xdist 各 worker）只读缓存
+    """
+    marker = metafunc.definition.get_closest_marker("case_stream")
+    if marker is None or "case" not in metafunc.fixturenames:
+        return
+    filename = marker.args[0]
+    kind = marker.kwargs.get("kind", marker.args[1] if len(marker.args) > 1 else "login")
+    cases = data_util.load_cases(filename, kind)
+    metafunc.parametrize("case", cases, ids=[c["case_name"] for c in cases])
+
+
+def pytest_sessionfinish(session):
+    """
+    xdist worker：会话结束时把本进程的耗时直方图交给主进程合并
+    主进程（或串行执行）：清理已过期的 Token 磁盘缓存（缓存按测试运行隔离，历史运行的文件不会再被读取）
+    """
+    if hasattr(session.config, "workeroutput"):
+        session.config.workeroutput["latency"] = latency_recorder.to_dict()
+    else:
+        token_broker.prune()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """xdist 主进程：合并各 worker 的耗时直方图"""
+    latency_recorder.merge_dict(getattr(node, "workeroutput", {}).get("latency", {}))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """
+    会话结束：输出请求耗时分位数表（按 method+path+status 分组），
+    并写出 JSON（有 --alluredir 时写在 Allure 结果目录旁，否则写到 AUTO_LATENCY_REPORT 指定路径）
+    """
+    if hasattr(config, "workeroutput"):
+        return
+    bg = background_dispatcher.stats()
+    if bg["submitted"] or bg["dropped"]:
+        terminalreporter.write_line(
+            f"后台旁路调用：提交 {bg['submitted']} | 完成 {bg['completed']} | 失败 {bg['failed']} | "
+            f"丢弃 {bg['dropped']} | 峰值队列深度 {bg['max_depth']}")
+    if not env_config.LATENCY_REPORT or not len(latency_recorder):
+        return
+    terminalreporter.write_sep("=", "请求耗时分位数（ms）")
+    terminalreporter.write_line(latency_recorder.format_table())
+
+    allure_dir = getattr(config.option, "allure_report_dir", None)
+    if allure_dir:
+        json_path = Path(allure_dir).resolve().parent / "latency_report.json"
+    elif env_config.LATENCY_REPORT_FILE:
+        json_path = Path(env_config.LATENCY_REPORT_FILE)
+    else:
+        return
+    terminalreporter.write_line(f"耗时报告已写出：{latency_recorder.write_json(json_path)}")
+
+
+def _flush_background() -> None:
+    """等待后台旁路调用执行完（须在回显服务停止/BASE_URL 恢复之前，其耗时才计入直方图）"""
+    if not background_dispatcher.flush(timeout=env_config.TIMEOUT * 2):
+        logger.warning("后台任务未在 %ss 内执行完：%s", env_config.TIMEOUT * 2, background_dispatcher.stats())
+
+
+@pytest.fixture(autouse=True)
+def mock_context():
+    """
+    每条用例激活独立的 Mock 上下文（用户表/Token/商品目录互不共享）
+    用例间无需依赖全局数据重置，同一进程内多线程或多进程（--workers）并行执行均安全
+    """
+    with use_context() as ctx:
+        yield ctx
 
 
 @pytest.fixture(scope="session")
-def login_token():
+def login_token(stub_base_url):
     """
     全局登录 Fixture
-    整个测试会话只执行一次，返回 Token 供其他用例使用
+    Token 由 token_broker 获取：所有 worker 进程共享同一份缓存（首个进程登录，其余直接读取），
+    临近过期时后台提前刷新
     """
-    logger.info("=== 🚀 全局前置：登录获取 Token ===")
-    api = LoginApi()
+    logger.info("=== 🚀 全局前置：获取 Token（账号=%s）===", env_config.AUTH_USERNAME)
+    try:
+        token = token_broker.get_token(env_config.AUTH_USERNAME, env_config.AUTH_PASSWORD)
+    except RuntimeError as e:
+        logger.error(str(e))
+        pytest.fail("全局登录失败，无法继续测试商品模块")
+    logger.info(f"Token 获取成功：{token}")
+    yield token
 
-    # 调用登录接口 (使用硬编码的测试账号，或者从 YAML 读)
-    resp = api.login("admin", "123456")
 
-    if resp['code'] == 200:
-        token = resp['data']['token']
-        logger.info(f"Token 获取成功：{token}")
-        yield token
-    else:
-        logger.error(f"登录失败：{resp}")
-        pytest.fail("全局登录失败，无法继续测试商品模块")
\ No newline at end of file
+@pytest.fixture(scope="session")
+def login_api(stub_base_url):
+    """会话级登录接口客户端（用例间复用，Mock 数据按用例上下文隔离）"""
+    return LoginApi()
+
+
+@pytest.fixture(scope="session")
+def product_api(stub_base_url):
+    """会话级商品接口客户端（用例间复用）"""
+    return ProductApi()
+
+
+@pytest.fixture(scope="session")
+def echo_stub():
+    """本地回显服务（httpbin 风格 /get、/post，系统分配端口；延迟/错误注入按 AUTO_STUB_* 配置）"""
+    with create_stub_server() as stub:
+        logger.info(f"=== 🚀 本地回显服务已启动：{stub.base_url}（{stub.workers} 个worker）===")
+        yield stub
+        _flush_background()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def stub_base_url(request):
+    """
+    AUTO_STUB_SERVER 开启时（test 环境默认），整个会话的 BASE_URL 指向本地回显服务，
+    登录等接口的外部调用不再依赖 httpbin.org（离线不必等超时，在线不受第三方限流影响）
+    """
+    if not env_config.STUB_SERVER:
+        yield None
+        _flush_background()
+        return
+    stub = request.getfixturevalue("echo_stub")
+    original = env_config.BASE_URL
+    env_config.BASE_URL = stub.base_url
+    yield stub
+    _flush_background()
+    env_config.BASE_URL = original
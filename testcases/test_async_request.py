@@ -0,0 +1,118 @@
+import asyncio
+import pytest
+from api.login_api import LoginApi
+from api.product_api import ProductApi
+from config.env_config import config
+from mock.login_mock import login_mock
+from utils.async_request_util import AsyncRequestUtil
+from utils.log_util import logger
+
+
+class TestAsyncRequest:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, echo_stub, monkeypatch):
+        """前置：请求指向本地回显服务"""
+        monkeypatch.setattr(config, "BASE_URL", echo_stub.base_url)
+        yield
+
+    def test_send_semantics(self):
+        async def scenario():
+            async with AsyncRequestUtil() as req:
+                get_resp = await req.send("get", "get", params={"id": "product_001"}, token="mock_token_123")
+                post_resp = await req.send("POST", "/post", data={"name": "新测试商品"})
+            return get_resp, post_resp
+
+        get_resp, post_resp = asyncio.run(scenario())
+        assert get_resp["args"] == {"id": "product_001"}, f"查询参数错误：{get_resp}"
+        assert get_resp["headers"]["Authorization"] == "Bearer mock_token_123", "Token请求头错误"
+        assert post_resp["json"] == {"name": "新测试商品"}, f"请求体错误：{post_resp}"
+        logger.info("✅ 异步请求语义测试通过")
+
+    def test_concurrency_is_bounded(self, monkeypatch):
+        in_flight = {"now": 0, "max": 0}
+
+        async def fake_request(self, *args):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.001)
+            in_flight["now"] -= 1
+            return {}
+
+        monkeypatch.setattr(AsyncRequestUtil, "_request", fake_request)
+
+        async def scenario():
+            async with AsyncRequestUtil(max_concurrency=10) as req:
+                await asyncio.gather(*(req.send("GET", "/get", params={"i": i}) for i in range(300)))
+
+        asyncio.run(scenario())
+        assert in_flight["max"] == 10, f"在途请求数未受限：{in_flight['max']}"
+        logger.info("✅ 异步并发上限测试通过")
+
+    def test_send_many_reports_cancelled_as_failure(self, monkeypatch):
+        async def fake_request(self, method, full_url, *args):
+            if full_url.endswith("/cancelled"):
+                raise asyncio.CancelledError()
+            return {"url": full_url}
+
+        monkeypatch.setattr(AsyncRequestUtil, "_request", fake_request)
+
+        async def scenario():
+            async with AsyncRequestUtil() as req:
+                return await req.send_many([{"method": "GET", "url": "/get"}, {"method": "GET", "url": "/cancelled"}])
+
+        ok, cancelled = asyncio.run(scenario())
+        assert ok["ok"] and not cancelled["ok"], f"被取消的请求不应视为成功：{cancelled}"
+        assert isinstance(cancelled["error"], asyncio.CancelledError)
+
+    def test_many_in_flight_against_stub(self):
+        async def scenario():
+            async with AsyncRequestUtil(max_concurrency=200) as req:
+                return await asyncio.gather(*(req.send("GET", "/get", params={"i": i}) for i in range(300)))
+
+        results = asyncio.run(scenario())
+        assert [r["args"]["i"] for r in results] == [str(i) for i in range(300)], "异步批量请求结果错误"
+
+    def test_session_closed_when_loop_changes(self):
+        req = AsyncRequestUtil()
+        asyncio.run(req.send("GET", "/get"))
+        stale = req._session
+        asyncio.run(req.send("GET", "/get"))  # 每次 asyncio.run 都是新的事件循环
+        assert stale.closed and req._session is not stale, "事件循环变化后旧Session未关闭"
+        asyncio.run(req.close())
+
+    def test_session_closed_when_previous_loop_is_idle(self):
+        idle_loop = asyncio.new_event_loop()  # 旧循环未关闭也未运行
+        try:
+            req = AsyncRequestUtil()
+            idle_loop.run_until_complete(req.send("GET", "/get"))
+            stale = req._session
+
+            async def scenario():
+                async with req:
+                    await req.send("GET", "/get")
+
+            asyncio.run(scenario())
+            assert stale.closed and not stale.connector, "旧循环空闲时旧Session未关闭"
+        finally:
+            idle_loop.close()
+
+    def test_async_api_variants(self, monkeypatch):
+        login_mock.reset_mock_data()
+        login_api = LoginApi()
+        product_api = ProductApi()
+        monkeypatch.setattr(product_api, "is_mock", False)  # 商品接口也走本地回显服务
+
+        async def scenario():
+            login_resp = await login_api.async_login("test_user", "test_pass_123")
+            detail_resp = await product_api.async_get_product_detail("product_001", "mock_token_123")
+            create_resp = await product_api.async_create_product("新测试商品", 199.9, "mock_token_123")
+            list_resp = await product_api.async_get_product_list("mock_token_123")
+            await login_api.async_req.close()
+            await product_api.async_req.close()
+            return login_resp, detail_resp, create_resp, list_resp
+
+        login_resp, detail_resp, create_resp, list_resp = asyncio.run(scenario())
+        assert login_resp == login_api.login("test_user", "test_pass_123"), "异步登录与同步登录结果不一致"
+        assert detail_resp["data"]["product_id"] == "product_001", "异步商品详情错误"
+        assert create_resp["code"] == 201 and list_resp["code"] == 200, "异步商品接口错误"
+        logger.info("✅ 异步API接口测试通过")
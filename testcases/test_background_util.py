@@ -0,0 +1,67 @@
+import contextvars
+import threading
+import pytest
+from utils.background_util import BackgroundDispatcher
+from utils.log_util import logger
+
+request_tag = contextvars.ContextVar("request_tag", default=None)
+
+
+class TestBackgroundDispatcher:
+    @pytest.fixture
+    def dispatcher(self):
+        dispatcher = BackgroundDispatcher(workers=2, queue_size=4, policy="drop")
+        yield dispatcher
+        dispatcher.shutdown(timeout=5)
+
+    def test_flush_waits_for_submitted_jobs(self, dispatcher):
+        done = []
+        for i in range(4):
+            assert dispatcher.submit(done.append, i)
+        assert dispatcher.flush(timeout=5), "flush 超时"
+        assert sorted(done) == [0, 1, 2, 3]
+        stats = dispatcher.stats()
+        assert stats["submitted"] == stats["completed"] == 4 and stats["depth"] == 0, f"指标错误：{stats}"
+
+    def test_drop_policy_counts_dropped(self, dispatcher):
+        gate = threading.Event()
+        results = [dispatcher.submit(gate.wait) for _ in range(10)]  # 2个执行中 + 4个排队，其余丢弃
+        gate.set()
+        assert dispatcher.flush(timeout=5)
+        stats = dispatcher.stats()
+        assert results.count(False) == stats["dropped"] >= 4, f"丢弃计数错误：{stats}"
+        assert stats["max_depth"] <= 4 and stats["completed"] == results.count(True)
+
+    def test_block_policy_applies_backpressure(self):
+        dispatcher = BackgroundDispatcher(workers=1, queue_size=1, policy="block", block_timeout=0.05)
+        gate = threading.Event()
+        try:
+            assert dispatcher.submit(gate.wait) and dispatcher.submit(gate.wait)  # 1个执行中 + 1个排队
+            assert not dispatcher.submit(gate.wait), "队列满且等待超时后应丢弃"
+            assert not dispatcher.flush(timeout=0.05), "任务未完成时 flush 应超时"
+            gate.set()
+            assert dispatcher.flush(timeout=5) and dispatcher.stats()["dropped"] == 1
+        finally:
+            gate.set()
+            dispatcher.shutdown(timeout=5)
+
+    def test_failure_and_context_propagation(self, dispatcher):
+        seen = []
+
+        def job():
+            seen.append(request_tag.get())
+            raise RuntimeError("外部接口不可用")
+
+        token = request_tag.set("case_001")
+        try:
+            dispatcher.submit(job)
+        finally:
+            request_tag.reset(token)
+        assert dispatcher.flush(timeout=5)
+        assert seen == ["case_001"], "任务未在提交时的上下文中执行"
+        assert dispatcher.stats()["failed"] == 1
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            BackgroundDispatcher(policy="lossy")
+        logger.info("✅ 后台派发器测试通过")
@@ -0,0 +1,133 @@
+import pytest
+import yaml
+from config.env_config import config
+from utils.data_util import DataUtil
+from utils.log_util import logger
+
+LOGIN_YAML = """
+login_cases:
+  - case_name: "正确密码登录"
+    username: "test_user"
+    password: "test_pass_123"
+  - case_name: "超长密码登录"
+    username: "test_user"
+    password_type: "long_1000"
+    expected_code: 400
+"""
+
+
+class TestDataUtilCache:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, tmp_path, monkeypatch):
+        """前置：开启编译缓存，数据目录/缓存目录指向临时目录，清空进程内缓存"""
+        monkeypatch.setattr(config, "DATA_CACHE", True)
+        self.data_dir = tmp_path / "data"
+        self.cache_dir = tmp_path / "cache"
+        self.data_dir.mkdir()
+        (self.data_dir / "test_login.yaml").write_text(LOGIN_YAML, encoding="utf-8")
+        monkeypatch.setattr(DataUtil, "DATA_DIR", self.data_dir)
+        monkeypatch.setattr(DataUtil, "CACHE_DIR", self.cache_dir)
+        monkeypatch.setattr(DataUtil, "_memo", {})
+        yield
+
+    def test_disk_cache_skips_yaml_parse(self, monkeypatch):
+        cases = DataUtil.load_login_cases()
+        assert len(cases) == 2, "预处理用例数量不匹配"
+        assert cases[1]["password"] == "a" * 1000, "边界值未生成"
+        assert list(self.cache_dir.glob("test_login.login.*.pkl")), "未生成磁盘缓存"
+
+        # 清空进程内缓存 + 禁用YAML解析：只能从磁盘缓存加载
+        DataUtil._memo.clear()
+        monkeypatch.setattr(yaml, "safe_load", lambda *_: pytest.fail("命中缓存时不应解析YAML"))
+        monkeypatch.setattr(yaml, "safe_load_all", lambda *_: pytest.fail("命中缓存时不应解析YAML"))
+        assert DataUtil.load_login_cases() == cases, "磁盘缓存内容不一致"
+        logger.info("✅ 磁盘缓存命中测试通过")
+
+    def test_load_cases_shares_cache(self, monkeypatch):
+        """收集阶段参数化（load_cases）与 load_login_cases 共用同一份编译缓存，支持流式加载的全部格式"""
+        cases = DataUtil.load_login_cases()
+        with monkeypatch.context() as patch:
+            patch.setattr(yaml, "safe_load_all", lambda *_: pytest.fail("命中缓存时不应解析YAML"))
+            assert DataUtil.load_cases("test_login", "login") == cases, "参数化用例未命中编译缓存"
+
+        (self.data_dir / "big_product.jsonl").write_text('{"product_id": "product_001"}\n', encoding="utf-8")
+        assert DataUtil.load_cases("big_product.jsonl", "product")[0]["case_name"] == "商品用例_1"
+        assert list(self.cache_dir.glob("big_product.product.*.pkl")), "未生成磁盘缓存"
+
+    def test_memo_skips_disk_read(self, monkeypatch):
+        DataUtil.load_login_cases()
+        for cache_file in self.cache_dir.glob("*.pkl"):
+            cache_file.unlink()
+        monkeypatch.setattr(DataUtil, "_read_cache_file", lambda *_: pytest.fail("进程内缓存命中时不应读磁盘"))
+
+        cases = DataUtil.load_login_cases()
+        cases[0]["username"] = "polluted"
+        assert DataUtil.load_login_cases()[0]["username"] == "test_user", "返回值修改污染了缓存"
+        logger.info("✅ 进程内缓存命中测试通过")
+
+    def test_content_change_invalidates_cache(self):
+        DataUtil.load_login_cases()
+        new_yaml = LOGIN_YAML + '  - case_name: "新增用例"\n    username: "admin_user"\n'
+        (self.data_dir / "test_login.yaml").write_text(new_yaml, encoding="utf-8")
+
+        cases = DataUtil.load_login_cases()
+        assert len(cases) == 3, "文件内容变化后缓存未失效"
+        assert len(list(self.cache_dir.glob("test_login.login.*.pkl"))) == 1, "旧缓存未清理"
+        logger.info("✅ 内容变更缓存失效测试通过")
+
+
+class TestDataUtilStream:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, tmp_path, monkeypatch):
+        """前置：数据目录指向临时目录"""
+        self.data_dir = tmp_path
+        monkeypatch.setattr(DataUtil, "DATA_DIR", tmp_path)
+        yield
+
+    def test_iter_yaml_multi_document(self):
+        (self.data_dir / "big_login.yaml").write_text(
+            'case_name: "用例1"\nusername: "test_user"\n---\n'
+            'username: "locked_user"\npassword_type: "empty"\n---\n'
+            '"非字典用例"\n',
+            encoding="utf-8"
+        )
+        cases = list(DataUtil.iter_login_cases("big_login"))
+        assert [c["username"] for c in cases] == ["test_user", "locked_user"], "多文档用例解析错误"
+        assert cases[1]["case_name"] == "登录用例_2", "默认用例名未补充"
+        assert cases[1]["password"] == "", "边界值未生成"
+        logger.info("✅ YAML多文档流式加载测试通过")
+
+    def test_iter_jsonl_is_lazy(self):
+        (self.data_dir / "big_product.jsonl").write_text(
+            '{"product_id": "product_001", "expected_code": 200}\n'
+            '\n'
+            '{"product_id": "product_999", "expected_code": 404}\n'
+            '{broken json\n',
+            encoding="utf-8"
+        )
+        stream = DataUtil.iter_product_cases("big_product.jsonl")
+        # 逐条消费：文件末尾的损坏行在读取到之前不影响已产出的用例
+        assert next(stream)["product_id"] == "product_001", "首条用例错误"
+        assert next(stream)["expected_code"] == 404, "第二条用例错误"
+        with pytest.raises(ValueError):
+            next(stream)
+        logger.info("✅ JSON Lines惰性加载测试通过")
+
+    def test_iter_csv_field_types(self):
+        (self.data_dir / "big_login.csv").write_text(
+            "case_name,username,password,expected_code,check_db,run_env\n"
+            "CSV用例,test_user,001234,401,true,mock|test\n",
+            encoding="utf-8"
+        )
+        case = next(DataUtil.iter_login_cases("big_login.csv"))
+        assert case["password"] == "001234", "字符串字段被误转换"
+        assert case["expected_code"] == 401 and case["check_db"] is True, "类型字段未转换"
+        assert case["run_env"] == ["mock", "test"], "列表字段未转换"
+        assert case["expected_msg"] == "success", "空字段未补默认值"
+        logger.info("✅ CSV流式加载测试通过")
+
+
+@pytest.mark.case_stream("test_login", kind="login")
+def test_case_stream_marker(case):
+    """流式参数化钩子：直接消费 data/test_login.yaml"""
+    assert case["case_name"] and "password_type" not in case, f"用例未预处理：{case}"
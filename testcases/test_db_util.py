@@ -0,0 +1,92 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from utils.db_util import MockDBUtil, MySQLDBUtil, SQLiteDBUtil
+from utils.log_util import logger
+
+
+class TestMockDBUtil:
+    @pytest.fixture
+    def db(self):
+        return MockDBUtil({"admin": {"username": "admin", "password": "123456", "fail_count": 0}})
+
+    def test_query_and_update_by_username(self, db):
+        assert db.update_fail_count("admin", increment=False), "fail_count 已为0时重置应返回 True"
+        assert db.update_fail_count("admin") and db.query_user("admin")["fail_count"] == 1
+        assert db.update_fail_count("admin", increment=False) and db.query_user("admin")["fail_count"] == 0
+        assert db.query_user("missing") is None and db.update_fail_count("missing") is False
+
+    def test_load_users_csv_and_jsonl(self, db, tmp_path):
+        csv_file = tmp_path / "users.csv"
+        csv_file.write_text("username,password,fail_count\nu1,p1,3\nu2,p2,\n", encoding="utf-8")
+        jsonl_file = tmp_path / "users.jsonl"
+        jsonl_file.write_text("\n".join(json.dumps({"username": f"j{i}", "password": "p"}) for i in range(1000)),
+                              encoding="utf-8")
+
+        assert db.load_users(csv_file) == 2, "replace模式未清空原有用户"
+        assert db.query_user("u1")["fail_count"] == 3 and db.query_user("u2")["fail_count"] == 0
+        assert db.load_users(jsonl_file, replace=False) == 1002, "合并导入用户数错误"
+        assert db.update_fail_counts(["j1", "j999", "missing"]) == 2
+        assert db.query_user("j999")["fail_count"] == 1
+        with pytest.raises(ValueError):
+            db.load_users(tmp_path / "users.yaml")
+
+        # 文件缺失/格式错误/缺少用户名时抛错，现有用户表保持不变
+        bad_json = tmp_path / "bad.jsonl"
+        bad_json.write_text('{"username": "x1"}\n{broken\n', encoding="utf-8")
+        no_name = tmp_path / "no_name.csv"
+        no_name.write_text("username,password\nx2,p\n,p\n", encoding="utf-8")
+        for path, error in ((tmp_path / "missing.csv", FileNotFoundError), (bad_json, json.JSONDecodeError),
+                            (no_name, ValueError)):
+            with pytest.raises(error):
+                db.load_users(path)
+            assert len(db.users) == 1002 and db.query_user("x1") is None, f"{path.name} 导入失败后用户表被修改"
+        logger.info("✅ MockDBUtil 批量导入/批量更新测试通过")
+
+
+class TestSQLiteDBUtil:
+    @pytest.fixture
+    def db(self):
+        db = SQLiteDBUtil(":memory:", pool_size=4)
+        db.insert_users([{"username": "admin", "password": "123456"},
+                         {"username": "locked", "password": "x", "fail_count": 5, "status": "locked"}])
+        yield db
+        db.pool.close()
+
+    def test_same_interface_as_mock(self, db):
+        assert db.query_user("admin") == {"username": "admin", "password": "123456", "fail_count": 0, "status": "active"}
+        # fail_count 已为0时重置：用户存在即视为更新成功（与 MockDBUtil 一致）
+        assert db.update_fail_count("admin", increment=False) is True
+        assert db.update_fail_counts(["admin", "missing"], increment=False) == 1
+        assert db.update_fail_count("admin") and db.query_user("admin")["fail_count"] == 1
+        assert db.update_fail_count("admin", increment=False) and db.query_user("admin")["fail_count"] == 0
+        assert db.query_user("missing") is None and db.update_fail_count("missing") is False
+        assert db.update_fail_counts(["admin", "locked", "missing"]) == 2
+        assert db.query_user("locked")["fail_count"] == 6
+        # 参数化查询：用户名中的引号不会被拼进SQL
+        assert db.query_user("admin' OR '1'='1") is None
+
+    def test_pool_is_bounded_and_thread_safe(self, db):
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            list(pool.map(lambda _: db.update_fail_count("admin"), range(200)))
+        assert db.query_user("admin")["fail_count"] == 200, "并发更新丢失"
+        assert db.pool._created <= 4, "连接数超过连接池上限"
+
+        db.pool.timeout = 0.05
+        with db.pool.connection(), db.pool.connection(), db.pool.connection(), db.pool.connection():
+            with pytest.raises(TimeoutError):
+                with db.pool.connection():
+                    pass
+        logger.info("✅ SQLite 后端连接池测试通过")
+
+
+class TestMySQLDBUtil:
+    def test_rowcount_counts_matched_rows(self, monkeypatch):
+        """pymysql 默认 rowcount 只计实际变更的行，需开启 FOUND_ROWS 才与 SQLite / Mock 语义一致"""
+        pymysql = pytest.importorskip("pymysql")
+        from pymysql.constants import CLIENT
+        calls = []
+        monkeypatch.setattr(pymysql, "connect", lambda **kwargs: calls.append(kwargs))
+        db = MySQLDBUtil(pool_size=1)
+        db.pool._factory()
+        assert calls[0]["client_flag"] & CLIENT.FOUND_ROWS, "MySQL 连接未开启 FOUND_ROWS"
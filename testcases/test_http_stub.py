@@ -0,0 +1,85 @@
+import http.client
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from mock.http_stub import EchoStubServer, StubFault
+from utils.log_util import logger
+
+
+def request(stub, method, path, body=None, conn=None):
+    """标准库客户端发请求（可复用连接），返回 (状态码, 响应体)"""
+    conn = conn or http.client.HTTPConnection(stub.host, stub.port, timeout=5)
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    conn.request(method, path, body=None if body is None else json.dumps(body), headers=headers)
+    resp = conn.getresponse()
+    return resp.status, resp.read()
+
+
+class TestEchoStubServer:
+    @pytest.fixture
+    def stub(self):
+        with EchoStubServer(workers=2, seed=7) as stub:
+            yield stub
+
+    def test_echo_routes_over_keep_alive(self, stub):
+        conn = http.client.HTTPConnection(stub.host, stub.port, timeout=5)
+        status, body = request(stub, "GET", "/get?id=product_001&tag=a&tag=b", conn=conn)
+        assert status == 200 and json.loads(body)["args"] == {"id": "product_001", "tag": ["a", "b"]}
+        status, body = request(stub, "POST", "/post", body={"login": "success"}, conn=conn)
+        assert status == 200 and json.loads(body)["json"] == {"login": "success"}, f"回显请求体错误：{body}"
+        assert request(stub, "GET", "/status/418", conn=conn)[0] == 418
+        assert request(stub, "GET", "/nothing", conn=conn)[0] == 404
+        conn.close()
+        assert stub.request_count == 4
+        logger.info("✅ 回显路由测试通过")
+
+    def test_concurrent_clients(self, stub):
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            statuses = list(pool.map(lambda i: request(stub, "GET", f"/get?i={i}")[0], range(200)))
+        assert statuses == [200] * 200 and stub.request_count == 200
+
+    def test_error_rate_is_reproducible_with_seed(self):
+        def run():
+            with EchoStubServer(workers=1, fault=StubFault(error_rate=0.3, error_status=503), seed=42) as stub:
+                conn = http.client.HTTPConnection(stub.host, stub.port, timeout=5)
+                return [request(stub, "GET", "/get", conn=conn)[0] for _ in range(100)]
+
+        first = run()
+        assert first == run(), "固定种子时错误序列不一致"
+        assert 15 <= first.count(503) <= 45 and set(first) == {200, 503}, f"错误率偏差过大：{first.count(503)}"
+
+    def test_path_fault_overrides_global(self, stub):
+        stub.set_fault(error_rate=1.0, error_status=500)
+        stub.set_fault(latency_ms=50, path="/post")
+        assert request(stub, "GET", "/get")[0] == 500, "全局故障未生效"
+        start = time.perf_counter()
+        assert request(stub, "POST", "/post", body={})[0] == 200, "路径规则未覆盖全局规则"
+        assert time.perf_counter() - start >= 0.05, "延迟注入未生效"
+
+        stub.clear_faults()
+        assert request(stub, "GET", "/get")[0] == 200
+
+    def test_connection_reset_fault(self, stub):
+        stub.set_fault(error_rate=1.0, error_status=0, path="/post")
+        with pytest.raises((http.client.RemoteDisconnected, ConnectionError)):
+            request(stub, "POST", "/post", body={})
+        assert request(stub, "GET", "/get")[0] == 200, "其他路径受影响"
+
+    def test_stop_closes_idle_keep_alive_connections(self, caplog):
+        stub = EchoStubServer(workers=2).start()
+        conns = [http.client.HTTPConnection(stub.host, stub.port, timeout=5) for _ in range(4)]
+        for conn in conns:
+            assert request(stub, "GET", "/get", conn=conn)[0] == 200  # 连接保持空闲，处理协程阻塞在读请求头
+        threads = list(stub._threads)
+        stub.stop()
+        assert not any(thread.is_alive() for thread in threads), "worker 线程未退出"
+        for conn in conns:
+            assert conn.sock.recv(1) == b"", "空闲连接未被关闭"
+            conn.close()
+        assert not [r for r in caplog.records if r.name == "asyncio"], "停止时输出了事件循环异常"
+
+    def test_invalid_error_rate(self):
+        with pytest.raises(ValueError):
+            StubFault(error_rate=1.5)
+        logger.info("✅ 故障注入测试通过")
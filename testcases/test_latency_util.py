@@ -0,0 +1,51 @@
+import json
+import random
+from utils.latency_util import LatencyHistogram, LatencyRecorder
+from utils.log_util import logger
+
+
+class TestLatencyHistogram:
+    def test_percentiles_within_relative_error(self):
+        rnd = random.Random(7)
+        values = sorted(rnd.expovariate(1 / 20) for _ in range(20000))  # 均值20ms的指数分布
+        hist = LatencyHistogram()
+        for v in values:
+            hist.record_ms(v)
+
+        for p in (50, 95, 99):
+            exact = values[int(len(values) * p / 100) - 1]
+            assert abs(hist.percentile(p) - exact) <= exact * 0.02 + 0.001, f"p{p} 误差过大"
+        assert hist.total == 20000 and hist.percentile(100) == round(values[-1], 3)
+        assert len(hist.counts) < 2000, "直方图内存应固定"
+
+    def test_merge_and_serialize(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        for v in (1, 2, 3):
+            a.record_ms(v)
+        b.record_ms(1000)
+        restored = LatencyHistogram.from_dict(json.loads(json.dumps(b.to_dict())))
+        a.merge(restored)
+        assert a.total == 4 and a.max_us == 1_000_000 and a.min_us == 1000
+        assert a.percentile(50) <= 2.02 and a.percentile(100) == 1000
+
+
+class TestLatencyRecorder:
+    def test_groups_by_method_path_status(self, tmp_path):
+        recorder = LatencyRecorder(max_keys=2)
+        recorder.record("get", "http://h/get?id=1", 200, 10, ttfb=8)
+        recorder.record("GET", "http://h/get?id=2", 200, 20, ttfb=None)
+        recorder.record("POST", "http://h/post", "ERR", 5)
+        recorder.record("GET", "http://h/product/123", 200, 1)  # 超过分组上限，归入 <other>
+
+        rows = {(r["method"], r["path"], r["status"]): r for r in recorder.summary()}
+        assert rows[("GET", "/get", "200")]["count"] == 2 and "ttfb_p50_ms" in rows[("GET", "/get", "200")]
+        assert ("GET", LatencyRecorder.OVERFLOW_PATH, "200") in rows, "分组数未设上限"
+        assert "TTFB_P95" in recorder.format_table() and len(recorder) == 4
+
+        merged = LatencyRecorder()
+        merged.merge_dict(recorder.to_dict())
+        merged.merge_dict(recorder.to_dict())
+        assert len(merged) == 8, "跨进程合并计数错误"
+        report = json.loads(recorder.write_json(tmp_path / "latency_report.json").read_text(encoding="utf-8"))
+        assert report["unit"] == "ms" and len(report["groups"]) == 3
+        logger.info("✅ 耗时统计分组/合并测试通过")
@@ -0,0 +1,66 @@
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from utils.lazy_util import LazyProxy, is_initialized, resolve
+from utils.log_util import logger
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+class Counter:
+    created = 0
+
+    def __init__(self):
+        Counter.created += 1
+        self.value = 1
+
+
+class TestLazyProxy:
+    def test_created_on_first_access_and_forwards(self):
+        Counter.created = 0
+        proxy = LazyProxy(Counter)
+        assert not is_initialized(proxy) and Counter.created == 0, "创建代理时不应初始化"
+        assert proxy.value == 1 and is_initialized(proxy)
+        proxy.value = 5
+        assert resolve(proxy).value == 5 and Counter.created == 1, "属性写入未转发给真实对象"
+
+    def test_single_instance_under_concurrency(self):
+        Counter.created = 0
+        proxy = LazyProxy(Counter)
+        barrier = threading.Barrier(8)
+
+        def touch(_):
+            barrier.wait()
+            return proxy.value
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(touch, range(8)))
+        assert Counter.created == 1, f"并发首次访问创建了多个实例：{Counter.created}"
+
+    def test_monkeypatch_through_proxy(self, monkeypatch):
+        proxy = LazyProxy(Counter)
+        monkeypatch.setattr(proxy, "value", 42)
+        assert resolve(proxy).value == 42
+        monkeypatch.undo()
+        assert proxy.value == 1, "monkeypatch 未恢复原值"
+
+    def test_import_has_no_side_effects(self, tmp_path):
+        """导入框架模块不初始化单例、不读取配置、不创建日志目录"""
+        log_dir = tmp_path / "log"
+        code = (
+            "from config.env_config import config\n"
+            "from utils.log_util import logger\n"
+            "from utils.data_util import data_util\n"
+            "from utils.redis_util import redis_util\n"
+            "from utils.db_util import db_util\n"
+            "from utils.lazy_util import is_initialized\n"
+            "print([is_initialized(x) for x in (config, data_util, redis_util, db_util)], logger._pending)\n"
+        )
+        proc = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True,
+                              env={"PATH": "", "PYTHONPATH": str(PROJECT_ROOT), "AUTO_LOG_DIR": str(log_dir)})
+        assert proc.returncode == 0, proc.stderr
+        assert proc.stdout.strip() == "[False, False, False, False] True", f"导入阶段已初始化单例：{proc.stdout}"
+        assert not log_dir.exists(), "导入阶段创建了日志目录"
+        logger.info("✅ 惰性单例测试通过")
@@ -0,0 +1,79 @@
+import pytest
+from api.product_api import ProductApi
+from config.env_config import config
+from utils.load_runner import LoadRunner, format_summary
+from utils.log_util import logger
+
+
+class FakeApi:
+    """不发网络请求的商品API：product_id 为 bad 时抛异常，其余返回200"""
+
+    def get_product_detail(self, product_id, token):
+        if product_id == "bad":
+            raise RuntimeError("boom")
+        return {"code": 200}
+
+    def get_product_list(self, token):
+        return {"code": 200}
+
+
+PRODUCT_CASES = [
+    {"case_name": "详情", "product_id": "p1", "expected_code": 200},
+    {"case_name": "列表-预期不符", "product_id": "", "expected_code": 404},
+    {"case_name": "异常", "product_id": "bad", "expected_code": 200},
+]
+
+
+class TestLoadRunner:
+    def test_stats_classify_mismatch_and_errors(self):
+        runner = LoadRunner(PRODUCT_CASES, "product", concurrency=3, duration=0.2, api_factory=FakeApi)
+        summary = runner.run()
+
+        rows = {r["case_name"]: r for r in summary["cases"]}
+        assert summary["requests"] > 30 and summary["throughput_rps"] > 0
+        assert rows["详情"]["mismatch"] == rows["详情"]["error"] == 0
+        assert rows["列表-预期不符"]["mismatch"] == rows["列表-预期不符"]["count"], "expected_code 不符未统计"
+        assert rows["异常"]["error"] == rows["异常"]["count"], "异常未统计"
+        assert "P95" in format_summary(summary)
+
+    def test_rps_mode_paces_requests(self):
+        runner = LoadRunner(PRODUCT_CASES[:1], "product", concurrency=4, rps=100, duration=0.5, ramp_up=0.2,
+                            api_factory=FakeApi)
+        summary = runner.run()
+        # 爬坡0.2s（平均50rps）+ 稳定0.5s（100rps）≈ 60 个请求
+        assert 40 <= summary["requests"] <= 80, f"限速偏差过大：{summary['requests']}"
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            LoadRunner(PRODUCT_CASES, "order")
+        with pytest.raises(ValueError):
+            LoadRunner([], "login")
+
+
+class TestLoadRunnerWithStub:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, echo_stub, monkeypatch):
+        """前置：外部接口指向本地回显服务，登录回放固定走Mock数据（不受 AUTO_IS_MOCK 影响）"""
+        monkeypatch.setattr(config, "BASE_URL", echo_stub.base_url)
+        monkeypatch.setattr(config, "IS_MOCK", True)
+        yield
+
+    @pytest.mark.parametrize("mode", ["thread", "async"])
+    def test_replay_login_cases_against_mock(self, mode):
+        """登录用例回放：每次请求独立Mock上下文，有状态用例（失败锁定）结果稳定"""
+        runner = LoadRunner.from_file("test_login", concurrency=4, duration=0.3, mode=mode)
+        summary = runner.run()
+        assert summary["requests"] >= len(runner.cases), "压测请求数过少"
+        assert summary["error_rate"] == 0, f"回放结果与 expected_code 不符：{summary['cases']}"
+        logger.info(f"✅ 登录用例压测（{mode}）：{summary['throughput_rps']} rps")
+
+    def test_replay_product_cases_over_http(self):
+        def real_http_api():
+            api = ProductApi()
+            api.is_mock = False  # 发出真实HTTP请求到本地回显服务
+            return api
+
+        cases = [{"case_name": "商品详情", "product_id": "product_001", "expected_code": 200},
+                 {"case_name": "商品列表", "product_id": "", "expected_code": 200}]
+        summary = LoadRunner(cases, "product", concurrency=4, rps=200, duration=0.3, api_factory=real_http_api).run()
+        assert summary["requests"] > 20 and summary["error_rate"] == 0, f"HTTP回放失败：{summary['cases']}"
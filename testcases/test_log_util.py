@@ -0,0 +1,85 @@
+import gzip
+import json
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from config.env_config import config
+from utils.log_util import _BoundedQueueHandler, logger
+
+
+class TestAsyncLog:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, tmp_path, monkeypatch):
+        """前置：日志目录指向临时目录；后置：恢复默认日志配置"""
+        monkeypatch.setattr(config, "LOG_DIR", str(tmp_path))
+        self.log_dir = tmp_path
+        yield
+        monkeypatch.undo()
+        logger.configure(async_mode=False)
+
+    def test_async_mode_drains_on_shutdown(self):
+        logger.configure(async_mode=True, queue_size=16, policy="block", batch_size=8)
+        for i in range(200):
+            logger.info(f"异步日志_{i}")
+        logger.shutdown()
+
+        lines = next(self.log_dir.glob("run_*.log")).read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 200, f"异步日志丢失：期望200条，实际{len(lines)}条"
+        assert lines[-1].endswith("异步日志_199"), "异步日志顺序错误"
+
+    def test_drop_policy_counts_dropped(self):
+        handler = _BoundedQueueHandler(queue.Queue(maxsize=1), policy="drop")
+        for i in range(3):
+            handler.emit(logging.makeLogRecord({"msg": f"日志_{i}"}))
+        assert handler.dropped == 2, f"丢弃计数错误：{handler.dropped}"
+
+    def test_drop_count_is_thread_safe(self):
+        handler = _BoundedQueueHandler(queue.Queue(maxsize=1), policy="drop")
+        handler.emit(logging.makeLogRecord({"msg": "占满队列"}))
+        records = [logging.makeLogRecord({"msg": f"日志_{i}"}) for i in range(8)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda record: [handler.emit(record) for _ in range(2000)], records))
+        assert handler.dropped == 16000, f"并发丢弃计数丢失：{handler.dropped}"
+
+    def test_sync_mode_has_no_listener(self):
+        logger.configure(async_mode=True)
+        assert logger._listener is not None, "异步模式未启动后台线程"
+        logger.configure(async_mode=False)
+        assert logger._listener is None, "同步模式不应启动后台线程"
+        logger.shutdown()  # 同步模式下无操作
+
+
+class TestJsonLog:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, tmp_path, monkeypatch):
+        """前置：日志目录指向临时目录；后置：恢复默认日志配置"""
+        monkeypatch.setattr(config, "LOG_DIR", str(tmp_path))
+        self.log_dir = tmp_path
+        yield
+        monkeypatch.undo()
+        logger.configure(async_mode=False)
+
+    def test_json_fields(self, request):
+        logger.configure(json_sink=True)
+        logger.info("【响应】Status: %s", 200,
+                    extra={"method": "GET", "url": "http://stub/get", "status": 200, "elapsed_ms": 1.5})
+
+        line = next(self.log_dir.glob("run_*.jsonl")).read_text(encoding="utf-8").splitlines()[-1]
+        entry = json.loads(line)
+        assert entry["nodeid"] == request.node.nodeid, f"nodeid错误：{entry}"
+        assert entry["msg"] == "【响应】Status: 200", f"消息错误：{entry}"
+        assert (entry["method"], entry["status"], entry["elapsed_ms"]) == ("GET", 200, 1.5), f"结构化字段错误：{entry}"
+
+    def test_size_rotation_compresses_backups(self, monkeypatch):
+        monkeypatch.setattr(config, "LOG_JSON_MAX_BYTES", 2048)
+        monkeypatch.setattr(config, "LOG_JSON_BACKUPS", 2)
+        logger.configure(async_mode=True, json_sink=True)
+        for i in range(200):
+            logger.info("轮转测试_%s", i)
+        logger.shutdown()
+
+        backups = sorted(self.log_dir.glob("run_*.jsonl.*.gz"))
+        assert len(backups) == 2, f"轮转文件数量错误：{backups}"
+        with gzip.open(backups[0], "rt", encoding="utf-8") as f:
+            assert json.loads(f.readline())["msg"].startswith("轮转测试_"), "压缩文件内容错误"
@@ -1,6 +1,6 @@
+import time
 import pytest
 from api.login_api import LoginApi
-from utils.data_util import data_util  # 复用统一的数据工具
 from mock.login_mock import login_mock  # 导入Mock工具
 from config.env_config import config  # 导入环境配置
 from utils.log_util import logger
@@ -12,22 +12,12 @@ except ImportError:
     # 兼容：如果没有真实db_util，直接用login_mock兜底
     db_util = login_mock
 
-# 核心优化1：复用data_util加载/处理数据（保留原有逻辑，仅简化筛选）
-def load_filtered_login_cases():
-    """加载登录用例：关闭环境筛选，返回所有用例（适配低版本pytest）"""
-    all_cases = data_util.load_login_cases()
-    # 核心修改：强制返回所有用例，不做任何筛选
-    filtered_cases = all_cases
-    # 日志更新：明确说明关闭筛选
-    logger.info(f"✅ 加载登录用例：共{len(all_cases)}条，关闭环境筛选后可执行{len(filtered_cases)}条")
-    return filtered_cases
-test_data = load_filtered_login_cases()
 
 class TestLogin:
     @pytest.fixture(autouse=True)
-    def setup_teardown(self):
-        """前置：初始化接口 + 重置Mock数据；后置：无（按需添加）"""
-        self.api = LoginApi()
+    def setup_teardown(self, login_api):
+        """前置：复用会话级接口客户端 + 重置Mock数据；后置：无（按需添加）"""
+        self.api = login_api
         # 仅Mock模式下重置数据，避免真实环境误操作
         if config.IS_MOCK:
             login_mock.reset_mock_data()
@@ -37,7 +27,8 @@ class TestLogin:
         # if config.IS_MOCK:
         #     login_mock.del_temp_user("temp_user")
 
-    @pytest.mark.parametrize("case", test_data, ids=lambda x: x['case_name'])
+    # 用例在收集阶段由 pytest_generate_tests 加载（导入模块时不读取/预处理YAML）
+    @pytest.mark.case_stream("test_login", kind="login")
     # 【修改点3】修复：移除P0标记筛选（避免命令行-m P0导致用例跳过）
     def test_login_scenarios(self, case):
         # 核心优化2：简化变量读取（保持原有逻辑）
@@ -58,11 +49,8 @@ class TestLogin:
         if check_db:
             # 预置失败次数（从YAML读取fail_count_before）
             if config.IS_MOCK and case.get("fail_count_before") is not None:
-                user = db_tool.query_user(username)
-                if user:
-                    # 【关键修改】直接访问全局变量，而非login_mock实例
-                    from mock.login_mock import MOCK_USER_DB
-                    MOCK_USER_DB[username]["fail_count"] = case["fail_count_before"]
+                # 只修改当前用例 Mock 上下文中的数据（并行执行时互不影响）
+                if login_mock.set_fail_count(username, case["fail_count_before"]):
                     logger.info(f"📝 预置Mock失败次数：{username} → {case['fail_count_before']}")
             # 记录前置失败次数（Mock/真实环境通用）
             user = db_tool.query_user(username)
@@ -102,6 +90,47 @@ class TestLogin:
 
         logger.info(f"✅ 用例通过：{case['case_name']}\n")
 
+
+class TestLoginMany:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, echo_stub, monkeypatch):
+        """前置：外部接口指向本地回显服务，使用Mock数据；后置：等待后台外部调用完成，避免影响后续用例计数"""
+        monkeypatch.setattr(config, "BASE_URL", echo_stub.base_url)
+        login_mock.reset_mock_data()
+        self.api = LoginApi()
+        self.api.db = self.api.redis = login_mock
+        yield
+        self.api.dispatcher.flush(timeout=5)
+
+    def test_login_many_batches_tokens(self):
+        login_mock.set_token("admin_user", "token_cached")
+        credentials = [("test_user", "test_pass_123"), ("admin_user", "admin_pass_789"),
+                       ("test_user", "wrong"), ("locked_user", "test_pass_456"), ("nobody", "x")]
+
+        results = self.api.login_many(credentials)
+        assert [r["code"] for r in results] == [200, 200, 401, 403, 404], f"批量登录结果错误：{results}"
+        assert results[0]["data"]["token"] == "token_test_user_8888", "未生成新Token"
+        assert results[1]["data"]["token"] == "token_cached", "未复用已有Token"
+        assert login_mock.get_token("test_user") == "token_test_user_8888", "新Token未批量写入"
+        logger.info("✅ 批量登录测试通过")
+
+    def test_side_call_dispatched_in_background(self, echo_stub):
+        echo_stub.set_fault(latency_ms=300, path="/post")  # 外部接口变慢
+        self.api.background = True
+        try:
+            assert self.api.dispatcher.flush(timeout=5), "此前的后台外部调用未完成"
+            before = echo_stub.request_count
+            start = time.perf_counter()
+            resp = self.api.login("test_user", "test_pass_123")
+            elapsed = time.perf_counter() - start
+            assert resp["code"] == 200 and elapsed < 0.3, f"登录等待了外部接口：{elapsed:.3f}s"
+
+            assert self.api.dispatcher.flush(timeout=5), "后台外部调用未完成"
+            assert echo_stub.request_count == before + 1, "外部接口未被调用"
+        finally:
+            echo_stub.clear_faults()
+        logger.info("✅ 外部调用后台派发测试通过")
+
 # 【修改点4】修复：调整pytest执行配置，关闭标记筛选
 if __name__ == "__main__":
     # 运行所有用例，不按标记筛选（解决deselected问题）
@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+from mock.login_mock import login_mock, mock_user_db
+from mock.product_mock import ProductMockData
+from utils.db_util import MockDBUtil
+from utils.mock_context import MockContext, current_context, use_context
+from utils.redis_util import MockRedisUtil
+from utils.log_util import logger
+
+
+class TestMockContext:
+    def test_contexts_are_isolated(self):
+        with use_context() as ctx_a:
+            login_mock.set_fail_count("test_user", 4)
+            login_mock.set_token("test_user", "token_a")
+            MockRedisUtil().set_token("admin", "token_a")
+            MockDBUtil().update_fail_count("admin")
+            ProductMockData.load_products([{"product_id": "p1", "status": "on_sale", "category": "food"}])
+
+        with use_context():
+            assert login_mock.query_user("test_user")["fail_count"] == 0, "用户表在上下文间共享"
+            assert login_mock.get_token("test_user") is None and MockRedisUtil().get_token("admin") is None
+            assert MockDBUtil().query_user("admin")["fail_count"] == 0
+            assert len(ProductMockData.store()) == len(ProductMockData.PRODUCT_LIST), "商品目录在上下文间共享"
+
+        assert ctx_a.run(login_mock.query_user, "test_user")["fail_count"] == 4, "上下文数据丢失"
+        assert current_context() is not ctx_a, "退出后未恢复之前的上下文"
+
+    def test_parallel_threads_do_not_interfere(self):
+        def scenario(i):
+            # 每个线程独立上下文：连续失败5次锁定，互不影响计数
+            for _ in range(5):
+                login_mock.update_fail_count("test_user")
+            user = login_mock.query_user("test_user")
+            login_mock.reset_mock_data()
+            return user["fail_count"], user["status"]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: MockContext().run(scenario, i), range(32)))
+        assert results == [(5, "locked")] * 32, f"并行线程数据串扰：{set(results)}"
+        assert mock_user_db().peek("test_user")["fail_count"] == 0, "线程上下文修改泄漏到当前上下文"
+        logger.info("✅ Mock 上下文并行隔离测试通过")
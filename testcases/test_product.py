@@ -1,5 +1,4 @@
 import pytest
-from api.product_api import ProductApi
 from mock.product_mock import ProductMockData
 from config.env_config import config
 from utils.log_util import logger
@@ -17,11 +16,11 @@ test_product_data = [
 
 class TestProduct:
     @pytest.fixture(autouse=True)
-    def setup_teardown(self):
-        """前置：初始化API + 重置Mock数据"""
-        self.api = ProductApi()
+    def setup_teardown(self, product_api, login_token):
+        """前置：复用会话级接口客户端 + 会话级Token + 重置Mock数据"""
+        self.api = product_api
         ProductMockData.reset_mock_data()  # 重置Mock
-        self.mock_token = "mock_token_123"  # 模拟登录Token
+        self.mock_token = login_token
         logger.info(f"🔧 商品测试前置完成：Mock模式={config.IS_MOCK}")
         yield
 
@@ -57,6 +56,23 @@ class TestProduct:
         assert len(resp["data"]) == len(ProductMockData.PRODUCT_LIST), "商品列表长度不匹配"
         logger.info(f"✅ 用例通过：{case_name}\n")
 
+    # 2.1 测试商品列表分页/过滤（走Mock层索引）
+    @pytest.mark.parametrize("case_name, query, exp_total, exp_ids", [
+        ("按分类过滤", {"category": "electronics"}, 1, ["product_001"]),
+        ("按状态过滤", {"status": "on_sale"}, 2, ["product_001", "product_003"]),
+        ("分类+状态过滤-无命中", {"category": "clothes", "status": "on_sale"}, 0, []),
+        ("分页-第2页", {"page": 2, "size": 2}, 3, ["product_003"]),
+    ])
+    def test_get_product_list_filtered(self, case_name, query, exp_total, exp_ids):
+        logger.info(f"🧪 执行用例：{case_name}")
+
+        resp = self.api.get_product_list(self.mock_token, **query)
+
+        assert resp["code"] == 200, f"{case_name} - Code错误"
+        assert resp["total"] == exp_total, f"{case_name} - 总数错误：期望{exp_total}, 实际{resp['total']}"
+        assert [p["product_id"] for p in resp["data"]] == exp_ids, f"{case_name} - 商品列表错误"
+        logger.info(f"✅ 用例通过：{case_name}\n")
+
     # 3. 测试创建商品接口
     def test_create_product(self):
         case_name = "创建商品-正常创建"
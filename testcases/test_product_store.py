@@ -0,0 +1,123 @@
+import pytest
+from mock.columnar import ColumnarTable, write_table
+from mock.product_mock import ProductMockData
+from mock.product_store import ColumnarProductStore, ProductStore
+from utils.mock_context import use_context
+from utils.log_util import logger
+
+CATEGORIES = ["electronics", "clothes", "home", "food"]
+STATUSES = ["on_sale", "out_of_stock", "off_sale"]
+
+
+def write_catalog(path, products):
+    """把商品目录写成列式文件"""
+    columns = {name: [product[name] for product in products] for name in products[0]}
+    return write_table(path, columns, {"category": "category", "status": "category"}, key="product_id")
+
+
+def make_catalog(count):
+    """生成规则商品目录：分类/状态按序号轮转"""
+    return [
+        {"product_id": f"sku_{i:06d}", "name": f"商品{i}", "price": 9.9, "stock": i % 7,
+         "status": STATUSES[i % 3], "category": CATEGORIES[i % 4]}
+        for i in range(count)
+    ]
+
+
+class TestProductStore:
+    def test_secondary_index_follows_updates(self):
+        store = ProductStore(make_catalog(12))
+        store.upsert({"product_id": "sku_000000", "status": "off_sale", "category": "food"})
+        store.delete("sku_000004")
+
+        total, items = store.query(category="electronics")
+        assert total == 1 and items[0]["product_id"] == "sku_000008", f"分类索引未同步更新：{items}"
+        total, _ = store.query(category="food", status="off_sale")
+        assert total == 2, "分类+状态联合过滤错误"
+        assert store.get("sku_000004") is None and len(store) == 11, "删除商品后主键索引未更新"
+
+    def test_query_returns_copies(self):
+        store = ProductStore(make_catalog(3))
+        _, items = store.query()
+        items[0]["stock"] = -1
+        assert store.get("sku_000000")["stock"] == 0, "查询结果修改污染了存储"
+
+    def test_reset_mock_data_restores_default_catalog(self):
+        ProductMockData.store().get("product_001")["stock"] = 0
+        ProductMockData.store().upsert({"product_id": "product_new", "status": "on_sale", "category": "home"})
+        ProductMockData.reset_mock_data()
+        assert ProductMockData.check_product_logic("product_001")[2]["stock"] == 100, "重置后商品修改仍然残留"
+        assert ProductMockData.check_product_logic("product_new")[0] == 404 and len(ProductMockData.store()) == 3
+        assert ProductMockData.PRODUCT_LIST[0]["stock"] == 100, "存储修改污染了 PRODUCT_LIST"
+
+
+class TestLargeCatalog:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self):
+        """前置：加载10万商品目录；后置：恢复默认目录"""
+        ProductMockData.load_products(make_catalog(100000))
+        yield
+        ProductMockData.reset_catalog()
+
+    def test_detail_and_paged_list(self):
+        code, _, product = ProductMockData.check_product_logic("sku_099999")
+        assert code == 200 and product["category"] == CATEGORIES[99999 % 4], "大目录详情查询错误"
+
+        total, items = ProductMockData.query_products(page=3, size=10, category="home", status="off_sale")
+        assert total == len(range(2, 100000, 12)), f"大目录过滤总数错误：{total}"
+        assert [p["product_id"] for p in items][0] == f"sku_{12 * 20 + 2:06d}", "大目录分页偏移错误"
+        logger.info("✅ 10万商品目录索引查询测试通过")
+
+
+class TestColumnarProductStore:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, tmp_path):
+        """前置：1200个商品写成列式文件并映射；后置：释放映射"""
+        self.catalog = make_catalog(1200)
+        self.path = write_catalog(tmp_path / "products.col", self.catalog)
+        self.table = ColumnarTable.open(self.path)
+        yield
+        self.table.close()
+
+    def test_matches_dict_store(self):
+        """同样的写入序列下，列式存储与字典存储的查询结果一致"""
+        stores = [ProductStore([dict(p) for p in self.catalog]), ColumnarProductStore(self.table)]
+        for store in stores:
+            store.upsert({"product_id": "sku_000000", "name": "改", "price": 1.0, "stock": 0,
+                          "status": "off_sale", "category": "food"})
+            store.upsert({"product_id": "sku_new", "name": "新", "price": 2.0, "stock": 5,
+                          "status": "on_sale", "category": "home"})
+            store.delete("sku_000004")
+        expected, actual = stores
+        assert len(actual) == len(expected) == 1200 and "sku_000004" not in actual and "sku_new" in actual
+        for filters in ({}, {"category": "electronics"}, {"category": "food", "status": "off_sale"},
+                        {"status": "on_sale"}, {"category": "missing"}):
+            total, items = expected.query(**filters)
+            assert actual.query(**filters)[0] == total, f"过滤总数不一致：{filters}"
+            assert sorted(p["product_id"] for p in actual.query(**filters)[1]) == \
+                sorted(p["product_id"] for p in items), f"过滤结果不一致：{filters}"
+        for product_id in ("sku_000000", "sku_000001", "sku_000004", "sku_new", "missing"):
+            assert actual.snapshot(product_id) == expected.snapshot(product_id), f"详情不一致：{product_id}"
+
+    def test_paging_and_reset(self):
+        store = ColumnarProductStore(self.table)
+        total, items = store.query(category="home", status="off_sale", page=3, size=10)
+        assert total == len(range(2, 1200, 12)) and items[0]["product_id"] == f"sku_{12 * 20 + 2:06d}"
+        store.upsert(dict(self.catalog[2], stock=99))
+        total_after, items = store.query(category="home", status="off_sale", page=10, size=10)
+        assert total_after == total and items[-1] == dict(self.catalog[2], stock=99), "修改后的商品应排在末页"
+        store.reset()
+        assert store.get("sku_000002")["stock"] == self.catalog[2]["stock"] and len(store) == 1200
+
+    def test_check_product_logic_from_catalog_file(self):
+        with use_context():
+            assert ProductMockData.load_catalog(self.path) == 1200
+            code, msg, product = ProductMockData.check_product_logic("sku_000005")
+            assert code == 200 and product == self.catalog[5] and "售罄" not in msg
+            product["stock"] = -1
+            assert ProductMockData.check_product_logic("sku_000005")[2]["stock"] == self.catalog[5]["stock"]
+            assert ProductMockData.check_product_logic("sku_999999")[0] == 404
+            ProductMockData.store().upsert(dict(self.catalog[5], stock=-1))
+            ProductMockData.reset_mock_data()
+            assert ProductMockData.check_product_logic("sku_000005")[2] == self.catalog[5], "重置后应保留已加载的目录"
+        logger.info("✅ 列式商品目录测试通过")
@@ -0,0 +1,78 @@
+import copy
+import pickle
+import pytest
+from mock.login_mock import LoginMock, MOCK_USER_DB_TEMPLATE, login_mock
+from mock.product_mock import ProductMockData
+from utils.data_util import DataUtil
+from utils.mock_context import use_context
+from utils.records import LoginCase, Record, UserRecord
+from utils.log_util import logger
+
+
+class TestRecord:
+    def test_mapping_compatibility(self):
+        case = LoginCase.from_row({"username": "test_user", "desc": "备注"})
+        assert not hasattr(case, "__dict__"), "记录不应有实例 __dict__"
+        assert case["username"] == "test_user" and case["expected_code"] == 200, "缺省值未补充"
+        assert case.get("desc") == "备注" and case.extra == {"desc": "备注"}, "未声明字段未进入 extra"
+        assert "case_name" not in case and case.get("case_name", "无") == "无", "未赋值字段应视为不存在"
+        assert case == dict(case) == {"username": "test_user", "password": "", "expected_code": 200,
+                                      "expected_msg": "success", "skip_cache": False, "check_db": False,
+                                      "desc": "备注"}, "与字典比较不一致"
+
+        case["case_name"] = "用例1"
+        case["token"] = "t"
+        del case["desc"]
+        assert list(case)[0] == "case_name" and case["token"] == "t" and "desc" not in case and len(case) == 8
+        with pytest.raises(KeyError):
+            del case["fail_count_before"]
+
+    def test_copy_and_pickle(self):
+        user = MOCK_USER_DB_TEMPLATE["test_user"]
+        clone = user.copy()
+        clone["fail_count"] = 3
+        assert type(clone) is UserRecord and user["fail_count"] == 0, "副本修改影响了原记录"
+        for restored in (pickle.loads(pickle.dumps(user)), copy.deepcopy(user)):
+            assert type(restored) is UserRecord and restored == user, "序列化往返后内容不一致"
+
+    def test_field_name_clash_rejected(self):
+        with pytest.raises(TypeError):
+            type("BadRecord", (Record,), {"__slots__": ("items",)})
+
+    def test_compiled_constructors(self):
+        row = {"username": "u", "password": "p", "nickname": "n"}
+        user = UserRecord.from_row(row)
+        assert user == UserRecord(row) == dict(UserRecord.DEFAULTS, **row), "from_row 与 __init__ 结果不一致"
+        clone = user.copy()
+        clone["nickname"] = "m"
+        assert type(clone) is UserRecord and user["nickname"] == "n", "副本的 extra 应独立"
+        assert UserRecord.from_row({"username": "u"}).extra == {}, "只含已声明字段时不应创建 extra"
+
+
+class TestRecordIntegration:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, tmp_path, monkeypatch):
+        """前置：数据目录指向临时目录，每条用例使用独立的 Mock 上下文"""
+        monkeypatch.setattr(DataUtil, "DATA_DIR", tmp_path)
+        self.data_dir = tmp_path
+        with use_context():
+            yield
+
+    def test_cases_are_records(self):
+        (self.data_dir / "big_login.jsonl").write_text(
+            '{"username": "test_user", "password_type": "long_1000"}\n', encoding="utf-8")
+        case = next(DataUtil.iter_login_cases("big_login.jsonl"))
+        assert isinstance(case, LoginCase) and case.case_name == "登录用例_1" and len(case.password) == 1000
+        assert "password_type" not in case, "边界值标记未移除"
+
+    def test_mock_data_are_records(self):
+        code, _, product = ProductMockData.check_product_logic("product_001")
+        assert code == 200 and product == ProductMockData.PRODUCT_LIST[0]
+        product["stock"] = -1
+        assert ProductMockData.check_product_logic("product_001")[2]["stock"] == 100, "返回值修改污染了商品目录"
+
+        LoginMock.add_temp_user("temp_user", {"username": "temp_user", "password": "p"})
+        login_mock.update_fail_count("temp_user")
+        user = login_mock.query_user("temp_user")
+        assert isinstance(user, UserRecord) and user["fail_count"] == 1 and user["role"] == "user"
+        logger.info("✅ 紧凑记录测试通过")
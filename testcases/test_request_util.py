@@ -0,0 +1,126 @@
+import json
+import pytest
+import requests
+from api.product_api import ProductApi
+from config.env_config import config
+from utils import request_util
+from utils.latency_util import latency_recorder
+from utils.log_util import logger
+from utils.request_util import RequestUtil, reset_shared_session
+from utils.token_broker import TokenBroker
+
+
+class TestSendMany:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, echo_stub, monkeypatch):
+        """前置：请求指向本地回显服务"""
+        monkeypatch.setattr(config, "BASE_URL", echo_stub.base_url)
+        self.stub = echo_stub
+        self.req = RequestUtil()
+        yield
+
+    def test_results_in_input_order_with_item_errors(self):
+        specs = [{"method": "GET", "url": "/get", "params": {"i": i}, "token": "mock_token_123"} for i in range(20)]
+        specs.insert(5, {"method": "GET", "url": "/not_found"})
+
+        results = self.req.send_many(specs, max_workers=8)
+        assert len(results) == 21, "结果数量与请求数量不一致"
+        assert not results[5]["ok"] and isinstance(results[5]["error"], requests.exceptions.HTTPError), "单项错误未返回"
+        ok_args = [r["data"]["args"]["i"] for r in results if r["ok"]]
+        assert ok_args == [str(i) for i in range(20)], f"结果顺序错误：{ok_args}"
+        assert results[0]["data"]["headers"]["Authorization"] == "Bearer mock_token_123", "Token请求头错误"
+        logger.info("✅ 批量请求顺序/单项错误测试通过")
+
+    def test_latency_recorded_per_request(self):
+        before = {(r["method"], r["path"], r["status"]): r["count"] for r in latency_recorder.summary()}
+        self.req.send("GET", "/get", params={"i": 1})
+        with pytest.raises(requests.exceptions.HTTPError):
+            self.req.send("GET", "/not_found")
+
+        rows = {(r["method"], r["path"], r["status"]): r for r in latency_recorder.summary()}
+        assert rows[("GET", "/get", "200")]["count"] == before.get(("GET", "/get", "200"), 0) + 1, "成功请求未记录耗时"
+        assert "ttfb_p50_ms" in rows[("GET", "/get", "200")], "未记录首字节耗时"
+        assert ("GET", "/not_found", "404") in rows, "HTTP错误请求未按状态码记录耗时"
+
+    def test_unauthorized_discards_cached_token(self, monkeypatch, tmp_path):
+        """接口返回 401 时丢弃 token_broker 中的 Token，下次获取时重新登录"""
+        logins = iter(["token_1", "token_2"])
+        broker = TokenBroker(login_func=lambda username, password: next(logins), cache_dir=tmp_path)
+        monkeypatch.setattr(request_util, "token_broker", broker)
+        token = broker.get_token("admin_user", "secret")
+        self.stub.set_fault(error_rate=1.0, error_status=401, path="/get")
+        try:
+            with pytest.raises(requests.exceptions.HTTPError):
+                RequestUtil().send("GET", "/get", token=token)
+        finally:
+            self.stub.clear_faults()
+        assert broker.get_token("admin_user", "secret") == "token_2", "401后仍返回失效的Token"
+
+    def test_idempotent_requests_retried(self, monkeypatch):
+        """幂等请求遇 502/503/504 重试（GET 共请求 1+2 次），POST 不重试"""
+        monkeypatch.setattr(config, "HTTP_MAX_RETRIES", 2)
+        monkeypatch.setattr(config, "HTTP_RETRY_BACKOFF", 0)
+        reset_shared_session()  # 按当前配置重建共享Session
+        self.stub.set_fault(error_rate=1.0, error_status=503, path="/get")
+        self.stub.set_fault(error_rate=1.0, error_status=503, path="/post")
+        try:
+            before = self.stub.request_count
+            with pytest.raises(requests.exceptions.HTTPError):
+                RequestUtil().send("GET", "/get")
+            assert self.stub.request_count == before + 3, "GET 未按配置次数重试"
+            before = self.stub.request_count
+            with pytest.raises(requests.exceptions.HTTPError):
+                RequestUtil().send("POST", "/post", data={})
+            assert self.stub.request_count == before + 1, "POST 不应重试"
+        finally:
+            self.stub.clear_faults()
+            reset_shared_session()
+
+    def test_empty_specs(self):
+        assert self.req.send_many([]) == [], "空请求列表应返回空结果"
+
+    def test_get_product_details(self, monkeypatch):
+        api = ProductApi()
+        monkeypatch.setattr(api, "is_mock", False)
+        resp = api.get_product_details(["product_001", "product_999", "product_002"], "mock_token_123")
+
+        assert resp["code"] == 200, "批量详情接口Code错误"
+        assert [d["code"] for d in resp["data"]] == [200, 404, 200], f"批量详情结果错误：{resp['data']}"
+        assert resp["data"][2]["data"]["product_id"] == "product_002", "批量详情顺序错误"
+        logger.info("✅ 批量商品详情测试通过")
+
+
+class TestResponseDecoding:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, echo_stub, monkeypatch):
+        """前置：请求指向本地回显服务"""
+        monkeypatch.setattr(config, "BASE_URL", echo_stub.base_url)
+        self.stub = echo_stub
+        self.req = RequestUtil()
+        yield
+
+    def test_send_decodes_large_payload(self):
+        items = [{"product_id": f"product_{i:06d}", "name": "测试商品", "price": 99.9} for i in range(5000)]
+        self.stub.add_static("/large_products", json.dumps(items, ensure_ascii=False).encode("utf-8"))
+        assert self.req.send("GET", "/large_products") == items, "大报文解码错误"
+
+    def test_send_stream_chunks(self):
+        body = b"x" * 300000
+        self.stub.add_static("/large_bytes", body, "application/octet-stream")
+        chunks = list(self.req.send_stream("GET", "/large_bytes", chunk_size=65536))
+        assert b"".join(chunks) == body and len(chunks) > 1, "流式分块读取错误"
+
+    def test_send_lines(self):
+        rows = list(self.req.send_lines("GET", "/stream/50"))
+        assert [r["id"] for r in rows] == list(range(50)), "NDJSON逐行解码错误"
+
+    def test_stream_http_error(self):
+        with pytest.raises(requests.exceptions.HTTPError):
+            list(self.req.send_stream("GET", "/not_found"))
+        logger.info("✅ 响应解码/流式读取测试通过")
+
+    def test_stream_connection_error_recorded(self):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            list(RequestUtil().send_stream("GET", "http://127.0.0.1:1/stream_refused"))  # 端口无服务，连接被拒绝
+        rows = {(r["method"], r["path"], r["status"]) for r in latency_recorder.summary()}
+        assert ("GET", "/stream_refused", "ERR") in rows, "流式请求连接失败未按 ERR 记录耗时"
@@ -0,0 +1,103 @@
+import hashlib
+from collections import Counter
+import pytest
+from config.env_config import config
+from mock.columnar import ColumnarTable, TableMapping, write_table
+from mock.login_mock import login_mock, mock_user_db
+from mock.product_mock import ProductMockData
+from mock.synthetic_data import (USER_ROLES, USER_STATUSES, boot_mocks, build_dataset, close_tables,
+                                 generate_users)
+from utils.db_util import MockDBUtil
+from utils.mock_context import use_context
+from utils.log_util import logger
+
+
+class TestColumnarTable:
+    def test_round_trip_mmap_and_in_memory(self, tmp_path):
+        columns = {
+            "sku": ["b", "a", "c"],
+            "name": ["商品B", "", "商品C"],
+            "price": [1.5, 2, 3.25],
+            "stock": [0, -1, 2 ** 40],
+            "tag": [None, "hot", None],
+        }
+        path = write_table(tmp_path / "t.col", columns, key="sku")
+        for use_mmap in (True, False):
+            with ColumnarTable.open(path, use_mmap=use_mmap) as table:
+                assert list(table.columns["sku"]) == ["a", "b", "c"], "未按主键排序"
+                assert table.row(table.find("b")) == {"sku": "b", "name": "商品B", "price": 1.5, "stock": 0,
+                                                      "tag": None}
+                assert table.find("z") == -1 and table.find(1) == -1
+                assert [row["stock"] for row in table.iter_rows()] == [-1, 0, 2 ** 40]
+
+    def test_duplicate_key_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            write_table(tmp_path / "t.col", {"id": ["a", "b", "a"]}, key="id")
+        with pytest.raises(ValueError):
+            write_table(tmp_path / "t.col", {"id": ["a"], "v": [1, 2]})
+
+    def test_mapping_view(self, tmp_path):
+        path = write_table(tmp_path / "t.col", {"username": ["u2", "u1"], "fail_count": [2, 1]}, key="username")
+        with ColumnarTable.open(path) as table:
+            users = TableMapping(table)
+            assert len(users) == 2 and list(users) == ["u1", "u2"] and "u3" not in users
+            users["u1"]["fail_count"] = 9
+            assert users["u1"]["fail_count"] == 1, "行字典修改影响了数据文件"
+
+
+class TestSyntheticData:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, tmp_path):
+        """前置：生成小规模数据集，每条用例使用独立的 Mock 上下文；后置：关闭映射"""
+        self.dataset = tmp_path / "dataset"
+        build_dataset(self.dataset, users=2000, products=3000, seed=7)
+        with use_context():
+            yield
+        close_tables()
+
+    def test_deterministic_by_seed(self, tmp_path):
+        other = build_dataset(tmp_path / "other", users=2000, products=3000, seed=7)
+        for name, path in other.items():
+            assert hashlib.sha256(path.read_bytes()).digest() == \
+                hashlib.sha256((self.dataset / path.name).read_bytes()).digest(), f"{name} 相同种子生成结果不一致"
+        assert generate_users(100, seed=8)["password"] != generate_users(100, seed=7)["password"]
+
+    def test_distributions(self):
+        combos = Counter(zip(generate_users(9, include_template=False)["status"],
+                             generate_users(9, include_template=False)["role"]))
+        assert set(combos) == {(s, r) for s in USER_STATUSES for r in USER_ROLES}, "未覆盖所有 状态×角色 组合"
+        with ColumnarTable.open(self.dataset / "products.col") as products:
+            rows = list(products.iter_rows())
+        assert len(rows) == 3003 and len({row["category"] for row in rows}) >= 8
+        assert all((row["status"] == "out_of_stock") == (row["stock"] == 0) for row in rows), "库存与状态不一致"
+
+    @pytest.mark.parametrize("products", [1, 100, 500, 999])
+    def test_ids_never_collide_with_template(self, tmp_path, products):
+        paths = build_dataset(tmp_path / "small", users=products, products=products)
+        with ColumnarTable.open(paths["products"]) as table:
+            assert table.rows == products + 3
+            assert table.row(table.find("product_001")) == ProductMockData.PRODUCT_LIST[0], "模板商品被生成数据覆盖"
+
+    def test_boot_mocks(self):
+        counts = boot_mocks(self.dataset)
+        assert counts == {"users": 2004, "products": 3003}
+        locked = next(name for name, user in mock_user_db().items() if user["status"] == "locked")
+        assert login_mock.query_user(locked)["fail_count"] == 5
+
+        login_mock.update_fail_count("user_0001")
+        assert login_mock.query_user("user_0001")["fail_count"] >= 1
+        login_mock.reset_mock_data()
+        assert login_mock.query_user("test_user")["password"] == "test_pass_123", "模板用户未包含在数据集中"
+
+        code, _, product = ProductMockData.check_product_logic("product_0042")
+        assert code == 200 and product["product_id"] == "product_0042"
+        assert MockDBUtil().query_user("user_1999") is not None
+
+    def test_default_boot_from_config(self, monkeypatch):
+        monkeypatch.setattr(config, "MOCK_DATASET", str(self.dataset))
+        assert len(mock_user_db()) == 2004 and login_mock.query_user("user_0100") is not None
+        assert ProductMockData.query_products(size=1)[0] == 3003
+        db = MockDBUtil()
+        db.update_fail_count("user_0100")
+        assert db.query_user("user_0100")["fail_count"] >= 1, "数据集用户写入未生效"
+        logger.info("✅ 合成数据集测试通过")
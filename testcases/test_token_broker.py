@@ -0,0 +1,93 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from utils.background_util import background_dispatcher
+from utils.token_broker import TokenBroker
+from utils.log_util import logger
+
+
+class FakeClock:
+    """可手动推进的墙上时钟"""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingLogin:
+    """记录登录次数的登录函数，每次登录返回新 Token"""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, username, password):
+        if password != "secret":
+            raise RuntimeError("登录失败")
+        with self._lock:
+            self.calls += 1
+            return f"token_{username}_{self.calls}"
+
+
+class TestTokenBroker:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, tmp_path):
+        self.clock = FakeClock()
+        self.login = CountingLogin()
+        self.cache_dir = tmp_path / "tokens"
+        yield
+
+    def broker(self):
+        """每个实例相当于一个独立的 worker 进程（进程内缓存互不共享，只共享缓存目录）"""
+        return TokenBroker(login_func=self.login, cache_dir=self.cache_dir, ttl=100, refresh_ahead=10,
+                           clock=self.clock)
+
+    def test_login_once_across_workers(self):
+        brokers = [self.broker() for _ in range(8)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            tokens = list(pool.map(lambda b: b.get_token("admin_user", "secret"), brokers * 4))
+        assert set(tokens) == {"token_admin_user_1"} and self.login.calls == 1, f"重复登录：{self.login.calls}次"
+
+    def test_expired_token_refreshed_synchronously(self):
+        broker = self.broker()
+        assert broker.get_token("admin_user", "secret") == "token_admin_user_1"
+        self.clock.now += 100
+        assert broker.get_token("admin_user", "secret") == "token_admin_user_2", "过期Token未刷新"
+        assert self.broker().get_token("admin_user", "secret") == "token_admin_user_2", "刷新结果未写入共享缓存"
+
+    def test_refresh_ahead_in_background(self):
+        broker = self.broker()
+        broker.get_token("admin_user", "secret")
+        self.clock.now += 95  # 进入刷新窗口但未过期
+        assert broker.get_token("admin_user", "secret") == "token_admin_user_1", "刷新窗口内应先返回现有Token"
+        assert background_dispatcher.flush(timeout=5)
+        assert broker.get_token("admin_user", "secret") == "token_admin_user_2", "未提前刷新"
+        assert self.login.calls == 2
+
+    def test_discard_rejected_token(self):
+        broker = self.broker()
+        token = broker.get_token("admin_user", "secret")
+        broker.discard_token("token_unknown")
+        assert broker.get_token("admin_user", "secret") == token, "未持有的Token不应影响缓存"
+        broker.discard_token(token)
+        assert self.broker().get_token("admin_user", "secret") == "token_admin_user_2", "401后未丢弃磁盘缓存"
+
+    def test_cache_scoped_per_run(self, monkeypatch):
+        monkeypatch.setenv("PYTEST_XDIST_TESTRUNUID", "run_a")
+        assert self.broker().get_token("admin_user", "secret") == "token_admin_user_1"
+        assert self.broker().get_token("admin_user", "secret") == "token_admin_user_1", "同一运行的worker应共享Token"
+        monkeypatch.setenv("PYTEST_XDIST_TESTRUNUID", "run_b")
+        assert self.broker().get_token("admin_user", "secret") == "token_admin_user_2", "不应复用上一次运行的Token"
+        self.clock.now += 100
+        assert self.broker().prune() == 2 and not list(self.cache_dir.glob("*.json")), "过期缓存未清理"
+
+    def test_invalidate_and_login_failure(self):
+        broker = self.broker()
+        broker.get_token("admin_user", "secret")
+        broker.invalidate("admin_user")
+        assert self.broker().get_token("admin_user", "secret") == "token_admin_user_2", "失效后未重新登录"
+        with pytest.raises(RuntimeError):
+            broker.get_token("other_user", "wrong")
+        logger.info("✅ Token代理测试通过")
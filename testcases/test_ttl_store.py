@@ -0,0 +1,82 @@
+import pytest
+from mock.login_mock import login_mock, mock_redis_token
+from utils.redis_util import MockRedisUtil
+from utils.ttl_store import TTLStore
+from utils.log_util import logger
+
+
+class FakeClock:
+    """可手动推进的时钟（替代 sleep）"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLStore:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def test_expiry_follows_clock(self, clock):
+        store = TTLStore(clock=clock)
+        store.set("a", 1, ttl=10)
+        store.set("b", 2)
+        store.set("c", 3, ttl=0)
+        assert store.get("a") == 1 and store.ttl("a") == 10 and store.ttl("b") is None and "c" not in store
+
+        clock.now += 10
+        assert store.get("a") is None and store.ttl("a") == -1, "到期键未失效"
+        assert store.get("b") == 2 and len(store) == 1
+
+    def test_overwrite_resets_expiry_and_purges_actively(self, clock):
+        store = TTLStore(clock=clock)
+        store.set("k", "old", ttl=5)
+        store.set("k", "new", ttl=50)
+        clock.now += 10
+        assert store.get("k") == "new", "覆盖写后旧过期条目误删了新值"
+
+        for i in range(1000):
+            store.set(f"tmp_{i}", i, ttl=1)
+        clock.now += 1
+        store.set("trigger", 0)
+        assert len(store._data) == 2, "到期键未被主动清理"
+        assert len(store._heap) <= TTLStore.COMPACT_RATIO * len(store._data) + 64
+        logger.info("✅ TTL 存储主动过期测试通过")
+
+
+class TestTokenBackends:
+    def test_mock_redis_util_honours_expire(self):
+        clock = FakeClock()
+        redis = MockRedisUtil(TTLStore(clock=clock))
+        redis.set_token("u1", "token_u1_8888", expire=60)
+        assert redis.get_token("u1") == "token_u1_8888"
+        clock.now += 60
+        assert redis.get_token("u1") is None, "expire 参数未生效"
+        redis.set_token("u1", "token_u1_8888")
+        assert redis.del_token("u1") and not redis.del_token("u1")
+
+    def test_login_mock_expire_at_compat(self):
+        login_mock.reset_mock_data()
+        login_mock.set_token("test_user", "t1", expire_at="2000-01-01 00:00:00")
+        login_mock.set_token("admin_user", "t2", expire_at="2999-01-01 00:00:00")
+        assert login_mock.get_token("test_user") is None, "过去的 expire_at 应立即过期"
+        assert login_mock.get_token("admin_user") == "t2"
+        login_mock.reset_mock_data()
+        assert len(mock_redis_token()) == 0
+
+    def test_batch_token_operations(self):
+        redis = MockRedisUtil(TTLStore(clock=FakeClock()))
+        redis.set_tokens({"u1": "t1", "u2": "t2"}, expire=60)
+        assert redis.get_tokens(["u1", "u3", "u2"]) == {"u1": "t1", "u3": None, "u2": "t2"}, "MGET结果错误"
+        assert redis.get_or_set_token("u1", "new") == "t1", "已存在的Token被覆盖"
+        assert redis.get_or_set_token("u3", "t3") == "t3" and redis.get_token("u3") == "t3"
+
+        login_mock.reset_mock_data()
+        login_mock.set_tokens({"test_user": "t1"})
+        assert login_mock.get_tokens(["test_user", "admin_user"]) == {"test_user": "t1", "admin_user": None}
+        assert login_mock.get_or_set_token("admin_user", "t2") == "t2"
+        assert login_mock.get_or_set_token("admin_user", "t3") == "t2"
+        login_mock.reset_mock_data()
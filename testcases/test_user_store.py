@@ -0,0 +1,54 @@
+import pytest
+from mock.login_mock import LoginMock, MOCK_USER_DB_TEMPLATE, login_mock, mock_user_db
+from mock.user_store import CowUserStore
+from utils.mock_context import use_context
+from utils.log_util import logger
+
+
+class TestCowUserStore:
+    def test_writes_never_touch_base(self):
+        base = {"u1": {"username": "u1", "fail_count": 0}}
+        store = CowUserStore(base)
+        store["u1"]["fail_count"] = 5
+        store["u2"] = {"username": "u2", "fail_count": 0}
+        del store["u1"]
+
+        assert base["u1"]["fail_count"] == 0, "修改污染了只读基线"
+        assert "u1" not in store and list(store) == ["u2"] and len(store) == 1, "删除/新增后视图错误"
+        store.reset()
+        assert list(store) == ["u1"] and store.peek("u1")["fail_count"] == 0, "重置后未恢复基线"
+        logger.info("✅ 写时复制用户表测试通过")
+
+    def test_snapshot_is_detached(self):
+        store = CowUserStore({"u1": {"username": "u1", "fail_count": 0}})
+        snap = store.snapshot("u1")
+        snap["fail_count"] = 9
+        assert store.peek("u1")["fail_count"] == 0, "修改快照影响了存储"
+        assert store.snapshot("missing") is None
+
+
+class TestLoginMockCow:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self):
+        """前置：每条用例使用独立的 Mock 上下文，seed_users 不影响其他用例"""
+        with use_context():
+            yield
+
+    def test_reset_restores_template(self):
+        for _ in range(5):
+            login_mock.update_fail_count("test_user")
+        assert login_mock.query_user("test_user")["status"] == "locked", "连续失败5次未锁定"
+        login_mock.reset_mock_data()
+        user = login_mock.query_user("test_user")
+        assert user["status"] == "active" and user["fail_count"] == 0, "重置后未恢复初始状态"
+        assert MOCK_USER_DB_TEMPLATE["test_user"]["fail_count"] == 0, "模板数据被修改"
+
+    def test_seed_users_large_base(self):
+        users = {f"user_{i}": dict(MOCK_USER_DB_TEMPLATE["test_user"], username=f"user_{i}") for i in range(100000)}
+        LoginMock.seed_users(users)
+        login_mock.update_fail_count("user_99999")
+        assert mock_user_db()["user_99999"]["fail_count"] == 1, "基线用户写入失败"
+        login_mock.reset_mock_data()
+        assert login_mock.query_user("user_99999")["fail_count"] == 0, "重置后覆盖层未丢弃"
+        assert users["user_99999"]["fail_count"] == 0 and len(mock_user_db()) == 100000
+        logger.info("✅ 10万用户基线重置测试通过")
@@ -0,0 +1,163 @@
+import asyncio
+import time
+import aiohttp
+from config.env_config import config
+from utils.latency_util import latency_recorder
+from utils.log_util import logger
+from utils.request_util import RequestUtil, json_loads, preview_body
+
+
+class AsyncRequestUtil:
+    """
+    异步请求工具（aiohttp），与 RequestUtil.send 保持相同的 URL拼接/请求头/Token/日志 语义
+    单个事件循环内可同时保持数百个在途请求，由信号量限制最大在途数（AUTO_ASYNC_MAX_CONCURRENCY）
+    用法：
+        async with AsyncRequestUtil() as req:
+            results = await asyncio.gather(*(req.send("GET", "/get", params={"id": i}) for i in range(500)))
+    """
+
+    def __init__(self, max_concurrency=None):
+        # 移除末尾斜杠，避免URL拼接成 //get（与 RequestUtil 一致）
+        self.base_url = config.BASE_URL.rstrip("/")
+        self.max_concurrency = max_concurrency or config.ASYNC_MAX_CONCURRENCY
+        # Session/信号量绑定事件循环，首次在循环内使用时创建（循环变化时自动重建）
+        self._session = None
+        self._semaphore = None
+        self._loop = None
+
+    async def send(self, method, url, data=None, params=None, token=None):
+        full_url = RequestUtil.build_url(self.base_url, url)
+        headers = RequestUtil.build_headers(token)
+        RequestUtil.log_request(method, full_url, params, data)
+
+        await self._bind_loop()
+        async with self._semaphore:
+            return await self._request(method, full_url, data, params, headers)
+
+    async def send_many(self, specs):
+        """
+        批量并发请求（事件循环内并发，受信号量限制），单个请求失败不影响其他请求
+        :param specs: 请求描述列表，每项为 send 的参数字典
+        :return: 与 specs 顺序一致的结果列表，每项 {"ok": bool, "data": 响应JSON或None, "error": 异常或None}
+        """
+        outcomes = await asyncio.gather(*(self.send(**spec) for spec in specs), return_exceptions=True)
+        # CancelledError 继承自 BaseException（非 Exception），同样视为失败
+        return [
+            {"ok": False, "data": None, "error": o} if isinstance(o, BaseException) else {"ok": True, "data": o, "error": None}
+            for o in outcomes
+        ]
+
+    async def _request(self, method, full_url, data, params, headers):
+        start = time.perf_counter()
+        marks = {}  # 请求各阶段时间点（由 trace 钩子写入）
+        recorded = False
+        try:
+            async with self._session.request(
+                method=method.upper(),  # 兼容小写method（如 get → GET）
+                url=full_url,
+                json=data,
+                params=params,
+                headers=headers,
+                trace_request_ctx=marks
+            ) as resp:
+                body = await resp.read()
+                elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+                latency_recorder.record(method, full_url, resp.status, elapsed_ms,
+                                        ttfb=self._span_ms(marks, start, "headers"),
+                                        dns=self._span_ms(marks, marks.get("dns_start"), "dns_end"),
+                                        connect=self._span_ms(marks, marks.get("connect_start"), "connect_end"))
+                recorded = True
+                # 结构化字段（JSON Lines 日志可直接按字段检索/统计耗时）
+                log_extra = {"method": method.upper(), "url": full_url, "status": resp.status, "elapsed_ms": elapsed_ms}
+                if resp.status >= 400:
+                    logger.error(lambda: f"【HTTP异常】{resp.status} {resp.reason} | 响应内容: {preview_body(body)}",
+                                 extra=log_extra)
+                    if resp.status == 401:
+                        RequestUtil.discard_token(headers)
+                    resp.raise_for_status()  # 抛出HTTP错误（4xx/5xx）
+                logger.info(lambda: f"【响应】Status: {resp.status} | 耗时: {elapsed_ms}ms | Response: {preview_body(body)}",
+                            extra=log_extra)
+                return json_loads(body)
+        except aiohttp.ClientResponseError:
+            raise
+        except asyncio.TimeoutError:
+            logger.error("【超时异常】请求 %s 超时（%ss）", full_url, config.TIMEOUT,
+                         extra=RequestUtil._error_extra(method, full_url, start, record=not recorded))
+            raise
+        except Exception as e:
+            logger.error("【通用异常】%s", e, extra=RequestUtil._error_extra(method, full_url, start, record=not recorded))
+            raise
+
+    @staticmethod
+    def _span_ms(marks, start, end_key):
+        """阶段耗时（毫秒），连接复用等未触发该阶段时返回 None"""
+        end = marks.get(end_key)
+        if start is None or end is None:
+            return None
+        return (end - start) * 1000
+
+    @staticmethod
+    def _build_trace_config():
+        """
+        aiohttp 请求阶段钩子：DNS解析、建连（含DNS/TLS）、响应头到达的时间点写入 trace_request_ctx
+        复用连接时不会触发 DNS/建连 钩子，对应阶段不计入统计
+        """
+        def mark(name):
+            async def hook(session, trace_ctx, params):
+                if trace_ctx.trace_request_ctx is not None:
+                    trace_ctx.trace_request_ctx[name] = time.perf_counter()
+            return hook
+
+        trace = aiohttp.TraceConfig()
+        trace.on_dns_resolvehost_start.append(mark("dns_start"))
+        trace.on_dns_resolvehost_end.append(mark("dns_end"))
+        trace.on_connection_create_start.append(mark("connect_start"))
+        trace.on_connection_create_end.append(mark("connect_end"))
+        trace.on_request_end.append(mark("headers"))
+        return trace
+
+    async def _bind_loop(self):
+        """
+        在当前事件循环内创建Session/信号量（连接上限与信号量一致，避免排队连接超时）
+        事件循环变化时（如每次 asyncio.run）关闭旧Session；先切换再关闭，同一循环内的并发请求只会创建一个新Session
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._session is not None and not self._session.closed:
+            return
+        stale_session, stale_loop = self._session, self._loop
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, force_close=not config.HTTP_KEEP_ALIVE)
+        self._session = aiohttp.ClientSession(
+            connector=connector, timeout=aiohttp.ClientTimeout(total=config.TIMEOUT),
+            trace_configs=[self._build_trace_config()]
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._loop = loop
+        if stale_session is not None and not stale_session.closed:
+            await self._close_stale(stale_session, stale_loop)
+
+    @staticmethod
+    async def _close_stale(session, loop):
+        """
+        关闭绑定在旧事件循环上的Session（连接的传输层只能在所属循环内关闭）：
+        - 旧循环已关闭：连接已无法收发，直接在当前循环标记关闭（避免 Unclosed client session 告警）
+        - 旧循环在其他线程运行中：提交到该循环关闭并等待完成
+        - 旧循环空闲（未关闭也未运行）：在线程池中临时驱动旧循环完成关闭（当前线程已有运行中的循环，不能直接驱动）
+        """
+        if loop is None or loop.is_closed():
+            await session.close()
+        elif loop.is_running():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+        else:
+            await asyncio.to_thread(loop.run_until_complete, session.close())
+
+    async def close(self):
+        """关闭Session（释放连接）"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = self._semaphore = self._loop = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
@@ -0,0 +1,123 @@
+import atexit
+import contextvars
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from config.env_config import config
+from utils.lazy_util import LazyProxy
+from utils.log_util import logger
+
+
+class BackgroundDispatcher:
+    """
+    非关键旁路调用的后台派发器（如登录成功后的外部通知接口）
+    - 有界队列 + 固定数量的后台线程，调用方只负责入队，不等待往返/超时
+    - 队列满时的背压策略：block（最多等待 block_timeout 秒，仍满则丢弃）/ drop（立即丢弃）
+    - 指标：当前/峰值队列深度、已提交/完成/失败/丢弃数
+    - flush 等待已入队任务全部执行完（会话结束/压测结束时调用），进程退出前自动 flush
+    任务在提交时的 contextvars 上下文中执行（日志 nodeid、Mock 上下文与调用方一致）
+    """
+
+    _STOP = object()
+
+    def __init__(self, workers: int = None, queue_size: int = None, policy: str = None, block_timeout: float = None):
+        self.workers = max(1, workers or config.BACKGROUND_WORKERS)
+        self.policy = policy or config.BACKGROUND_QUEUE_POLICY
+        if self.policy not in ("block", "drop"):
+            raise ValueError(f"不支持的队列策略：{self.policy}（可选：block / drop）")
+        self.block_timeout = config.BACKGROUND_BLOCK_TIMEOUT if block_timeout is None else block_timeout
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size or config.BACKGROUND_QUEUE_SIZE)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "dropped": 0, "max_depth": 0}
+        atexit.register(self.shutdown)
+
+    @property
+    def depth(self) -> int:
+        """当前队列深度（未开始执行的任务数）"""
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters, depth=self.depth)
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> bool:
+        """
+        提交任务（不等待执行结果）
+        :return: True=已入队；False=队列已满被丢弃
+        """
+        self._ensure_started()
+        job = (contextvars.copy_context(), func, args, kwargs)
+        try:
+            if self.policy == "drop":
+                self._queue.put_nowait(job)
+            else:
+                self._queue.put(job, timeout=self.block_timeout)
+        except queue.Full:
+            with self._lock:
+                self._counters["dropped"] += 1
+            logger.warning("后台队列已满（%s），丢弃任务：%s", self._queue.maxsize, getattr(func, "__name__", func))
+            return False
+        with self._lock:
+            self._counters["submitted"] += 1
+            self._counters["max_depth"] = max(self._counters["max_depth"], self._queue.qsize())
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待已入队任务全部执行完；超时返回 False"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """排空队列并停止后台线程（之后再提交任务会重新启动线程）"""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        if not threads:
+            return
+        self.flush(timeout)
+        for _ in threads:
+            self._queue.put(self._STOP)
+        for thread in threads:
+            thread.join(timeout)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._counters = dict.fromkeys(self._counters, 0)
+
+    def _ensure_started(self) -> None:
+        if self._threads:
+            return
+        with self._lock:
+            if not self._threads:
+                self._threads = [threading.Thread(target=self._run, name=f"BackgroundDispatcher-{i}", daemon=True)
+                                 for i in range(self.workers)]
+                for thread in self._threads:
+                    thread.start()
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is self._STOP:
+                self._queue.task_done()
+                return
+            ctx, func, args, kwargs = job
+            try:
+                ctx.run(func, *args, **kwargs)
+                outcome = "completed"
+            except Exception as e:
+                outcome = "failed"
+                logger.warning("后台任务执行失败（不影响主流程）：%s", str(e)[:100])
+            with self._lock:
+                self._counters[outcome] += 1
+            self._queue.task_done()
+
+
+# 进程级派发器（LoginApi 等旁路调用共用，首次使用时才按配置创建）
+background_dispatcher = LazyProxy(BackgroundDispatcher)
@@ -1,8 +1,18 @@
 # utils/data_util.py
+import copy
+import csv
+import hashlib
+import io
+import json
+import os
+import pickle
 import yaml
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import IO, Dict, List, Any, Callable, Tuple, Iterator, Optional
+from config.env_config import config, EnvConfig
+from utils.lazy_util import LazyProxy
 from utils.log_util import logger
+from utils.records import LoginCase, ProductCase, Record
 
 
 class DataUtil:
@@ -14,21 +24,44 @@ class DataUtil:
     1. 加载data目录下YAML文件（支持相对/绝对路径）
     2. 通用化数据校验（非空/格式/必填字段）
     3. 按模块分类加载数据 + 数据预处理
+    4. 用例编译缓存（磁盘pickle缓存 + 进程内缓存，避免重复解析YAML）
+    5. 流式加载（YAML多文档/JSON Lines/CSV 逐条产出预处理后的用例，适配超大数据集）
     """
     # 项目根目录（自动识别，无需硬编码）
     PROJECT_ROOT = Path(__file__).parent.parent
     # 数据目录（固定指向data文件夹）
     DATA_DIR = PROJECT_ROOT / "data"
+    # 编译缓存目录（缓存文件名包含：源文件名 + 缓存类型 + 内容哈希 + 预处理版本）
+    # 为 None 时首次使用按 AUTO_DATA_CACHE_DIR 解析（导入模块不读取配置）
+    CACHE_DIR: Optional[Path] = None
+    # 预处理逻辑版本号：修改 _process_* 的处理规则后必须 +1，使旧缓存自动失效
+    PREPROCESSOR_VERSION = 2
+    # 支持的数据文件格式（无后缀时默认补.yaml）
+    SUPPORTED_SUFFIXES = (".yaml", ".yml", ".jsonl", ".csv")
+    # CSV 单元格均为字符串，以下字段按类型转换（其余字段保持字符串，避免密码/商品ID被误转数字）
+    CSV_FIELD_TYPES: Dict[str, Callable[[str], Any]] = {
+        "expected_code": int,
+        "expected_stock": int,
+        "fail_count_before": int,
+        "price": float,
+        "check_db": EnvConfig._parse_boolean,
+        "check_stock": EnvConfig._parse_boolean,
+        "skip_cache": EnvConfig._parse_boolean,
+        "sensitive_check": EnvConfig._parse_boolean,
+        "run_env": lambda v: [item.strip() for item in v.split("|") if item.strip()],
+    }
+    # 进程内缓存：{(缓存类型, 文件绝对路径): ((mtime_ns, size), 数据)}
+    _memo: Dict[Tuple[str, str], Tuple[Tuple[int, int], Any]] = {}
 
     @classmethod
     def get_data_file_path(cls, filename: str) -> Path:
         """
-        获取data目录下YAML文件的绝对路径（容错：自动补.yaml后缀）
-        :param filename: 文件名（如test_login / test_product）
+        获取data目录下数据文件的绝对路径（容错：无支持的后缀时自动补.yaml）
+        :param filename: 文件名（如test_login / test_product / big_login.jsonl）
         :return: 完整文件路径
         """
         # 自动补充.yaml后缀
-        if not filename.endswith(".yaml"):
+        if Path(filename).suffix.lower() not in cls.SUPPORTED_SUFFIXES:
             filename = f"{filename}.yaml"
         file_path = cls.DATA_DIR / filename
 
@@ -40,38 +73,232 @@ class DataUtil:
     @classmethod
     def load_yaml(cls, filename: str) -> Dict[str, Any]:
         """
-        通用加载YAML文件（含日志/异常处理）
+        通用加载YAML文件（含日志/异常处理，结果经编译缓存）
         :param filename: data目录下的文件名（如test_login）
-        :return: 解析后的字典数据
+        :return: 解析后的字典数据（副本，调用方可随意修改）
         """
         file_path = cls.get_data_file_path(filename)
+        data = cls._load_with_cache(file_path, "raw", cls._parse_yaml)
+        return copy.deepcopy(data)
+
+    @classmethod
+    def load_login_cases(cls) -> List[LoginCase]:
+        """加载登录测试用例（已实现，预处理结果经编译缓存）"""
+        return cls.load_cases("test_login", "login")
+
+    @classmethod
+    def load_product_cases(cls) -> List[ProductCase]:
+        """加载商品测试用例（已实现，预处理结果经编译缓存）"""
+        return cls.load_cases("test_product", "product")
+
+    @classmethod
+    def load_cases(cls, filename: str, kind: str) -> List[Record]:
+        """
+        通用用例加载：支持格式与 iter_cases 相同，预处理结果经编译缓存（pytest 收集阶段参数化使用）
+        :param filename: data目录下的文件名
+        :param kind: 用例类型（login / product）
+        :return: 预处理后的用例列表（副本，调用方可随意修改）
+        """
+        cls._case_processor(kind)  # 校验用例类型
+        process_data = {"login": cls._process_login_data, "product": cls._process_product_data}[kind]
+        file_path = cls.get_data_file_path(filename)
+        # 缓存未命中时解析已读取的文件内容（与计算哈希的是同一份字节）
+        cases = cls._load_with_cache(
+            file_path, kind,
+            lambda raw: process_data(list(cls._parse_raw_cases(io.StringIO(raw.decode("utf-8"), newline=""),
+                                                               file_path, f"{kind}_cases")))
+        )
+        # 返回浅拷贝列表，避免用例修改污染缓存
+        return [case.copy() for case in cases]
+
+    # -------------------------- 流式加载（大数据集） --------------------------
+    @classmethod
+    def iter_login_cases(cls, filename: str = "test_login") -> Iterator[LoginCase]:
+        """流式加载登录用例（逐条产出，不整体加载文件）"""
+        return cls.iter_cases(filename, "login")
+
+    @classmethod
+    def iter_product_cases(cls, filename: str = "test_product") -> Iterator[ProductCase]:
+        """流式加载商品用例（逐条产出，不整体加载文件）"""
+        return cls.iter_cases(filename, "product")
+
+    @classmethod
+    def iter_cases(cls, filename: str, kind: str) -> Iterator[Record]:
+        """
+        通用流式加载：逐条读取 + 预处理，内存占用与数据集大小无关
+        支持格式：
+        - YAML 多文档（--- 分隔，每个文档一条用例；也兼容 {kind}_cases 列表文档）
+        - JSON Lines（每行一条用例）
+        - CSV（首行表头，类型字段见 CSV_FIELD_TYPES）
+        :param filename: data目录下的文件名
+        :param kind: 用例类型（login / product）
+        :return: 预处理后的用例生成器
+        """
+        process_case = cls._case_processor(kind)
+        file_path = cls.get_data_file_path(filename)
+
+        count = 0
+        for idx, case in enumerate(cls._iter_raw_cases(file_path, f"{kind}_cases")):
+            new_case = process_case(idx, case)
+            if new_case is not None:
+                count += 1
+                yield new_case
+        logger.info(f"✅ 流式加载{kind}用例：{file_path.name} 共{count}条有效用例")
+
+    @classmethod
+    def _case_processor(cls, kind: str) -> Callable[[int, Any], Optional[Record]]:
+        """按用例类型返回单条用例预处理函数"""
+        processors = {"login": cls._process_login_case, "product": cls._process_product_case}
+        if kind not in processors:
+            raise ValueError(f"不支持的用例类型：{kind}（可选：{list(processors)}）")
+        return processors[kind]
+
+    @classmethod
+    def _iter_raw_cases(cls, file_path: Path, list_key: str) -> Iterator[Any]:
+        """按文件格式逐条读取原始用例"""
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            yield from cls._parse_raw_cases(f, file_path, list_key)
+
+    @classmethod
+    def _parse_raw_cases(cls, f: IO[str], file_path: Path, list_key: str) -> Iterator[Any]:
+        """从文本流逐条解析原始用例（格式按 file_path 后缀判断）"""
+        suffix = file_path.suffix.lower()
+        if suffix == ".jsonl":
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.error(f"❌ JSON Lines解析失败 {file_path}:{line_no}：{str(e)}")
+                    raise
+        elif suffix == ".csv":
+            for row in csv.DictReader(f):
+                yield cls._convert_csv_row(row)
+        else:
+            try:
+                for doc in yaml.safe_load_all(f):
+                    if doc is None:
+                        continue
+                    # 兼容普通用例文件：单个文档内的 {kind}_cases 列表
+                    if isinstance(doc, dict) and list_key in doc:
+                        yield from doc[list_key] or []
+                    else:
+                        yield doc
+            except yaml.YAMLError as e:
+                logger.error(f"❌ YAML解析失败 {file_path}：{str(e)}")
+                raise
+
+    @classmethod
+    def _convert_csv_row(cls, row: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        """CSV行转用例字典：空单元格视为未填写（交由预处理补默认值），类型字段按规则转换"""
+        case = {}
+        for key, value in row.items():
+            if key is None or value is None or value == "":
+                continue
+            converter = cls.CSV_FIELD_TYPES.get(key)
+            case[key] = converter(value) if converter else value
+        return case
+
+    # -------------------------- 编译缓存 --------------------------
+    @classmethod
+    def _parse_yaml(cls, raw: bytes, file_path: Path = None) -> Dict[str, Any]:
+        """解析YAML原始内容（含日志/异常处理）"""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}  # 空文件返回空字典
-            logger.info(f"✅ 成功加载数据文件：{file_path.absolute()}")
+            data = yaml.safe_load(raw) or {}  # 空文件返回空字典
+            logger.info(f"✅ 成功加载数据文件：{file_path}")
             return data
         except yaml.YAMLError as e:
             logger.error(f"❌ YAML解析失败 {file_path}：{str(e)}")
             raise
+
+    @classmethod
+    def _load_with_cache(cls, file_path: Path, kind: str, builder: Callable[[bytes], Any]) -> Any:
+        """
+        带两级缓存的数据加载
+        1. 进程内缓存：文件 mtime/size 未变化时直接返回，不读取文件内容
+        2. 磁盘缓存：按 文件内容哈希 + 预处理版本 命中 pickle 文件，跳过YAML解析和预处理
+        :param file_path: 数据文件路径
+        :param kind: 缓存类型（raw/login/product），同一文件不同处理结果分别缓存
+        :param builder: 缓存未命中时的构建函数，入参为文件原始字节
+        :return: 构建结果（缓存共享对象，调用方不可修改）
+        """
+        try:
+            stat = file_path.stat()
+            if not config.DATA_CACHE:
+                return builder(file_path.read_bytes())
+
+            signature = (stat.st_mtime_ns, stat.st_size)
+            memo_key = (kind, str(file_path.absolute()))
+            memo = cls._memo.get(memo_key)
+            if memo and memo[0] == signature:
+                return memo[1]
+
+            raw = file_path.read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()[:32]
+            cache_prefix = f"{file_path.stem}.{kind}"
+            cache_file = cls._cache_dir() / f"{cache_prefix}.{digest}.v{cls.PREPROCESSOR_VERSION}.pkl"
+            data = cls._read_cache_file(cache_file)
+            if data is None:
+                data = builder(raw)
+                cls._write_cache_file(cache_file, data, stale_glob=f"{cache_prefix}.*.pkl")
+            else:
+                logger.info(f"✅ 命中用例缓存：{file_path} → {cache_file.name}")
+            cls._memo[memo_key] = (signature, data)
+            return data
+        except yaml.YAMLError:
+            raise
         except Exception as e:
             logger.error(f"❌ 加载数据文件失败 {file_path}：{str(e)}")
             raise
 
     @classmethod
-    def load_login_cases(cls) -> List[Dict[str, Any]]:
-        """加载登录测试用例（已实现）"""
-        raw_data = cls.load_yaml("test_login")
-        login_cases = raw_data.get("login_cases", [])
-        # 预处理登录数据
-        return cls._process_login_data(login_cases)
+    def _cache_dir(cls) -> Path:
+        if cls.CACHE_DIR is None:
+            cls.CACHE_DIR = Path(config.DATA_CACHE_DIR) if config.DATA_CACHE_DIR else cls.PROJECT_ROOT / ".cache" / "data"
+        return cls.CACHE_DIR
+
+    @classmethod
+    def _read_cache_file(cls, cache_file: Path) -> Any:
+        """读取磁盘缓存（不存在/损坏时返回None，由调用方重建）"""
+        if not cache_file.exists():
+            return None
+        try:
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ 用例缓存损坏，重新构建 {cache_file.name}：{str(e)}")
+            return None
+
+    @classmethod
+    def _write_cache_file(cls, cache_file: Path, data: Any, stale_glob: str = "") -> None:
+        """原子写入磁盘缓存（先写临时文件再替换，兼容多进程并发写），并清理同源旧缓存"""
+        try:
+            cls._cache_dir().mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            with open(tmp_file, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+            # 清理同一源文件、同一类型的过期缓存（内容或版本已变化）
+            for old_file in cls._cache_dir().glob(stale_glob) if stale_glob else []:
+                if old_file != cache_file:
+                    old_file.unlink(missing_ok=True)
+        except OSError as e:
+            # 缓存写入失败不影响用例加载
+            logger.warning(f"⚠️ 用例缓存写入失败 {cache_file}：{str(e)}")
 
     @classmethod
-    def load_product_cases(cls) -> List[Dict[str, Any]]:
-        """加载商品测试用例（已实现）"""
-        raw_data = cls.load_yaml("test_product")
-        product_cases = raw_data.get("product_cases", [])
-        # 预处理商品数据
-        return cls._process_product_data(product_cases)
+    def clear_cache(cls, disk: bool = False) -> None:
+        """
+        清空用例缓存
+        :param disk: 是否同时删除磁盘缓存文件
+        """
+        cls._memo.clear()
+        if disk and cls._cache_dir().exists():
+            for cache_file in cls._cache_dir().glob("*.pkl"):
+                cache_file.unlink(missing_ok=True)
+        logger.info(f"[Data] 用例缓存已清空（磁盘缓存：{'已删除' if disk else '保留'}）")
 
     @classmethod
     def load_order_cases(cls) -> List[Dict[str, Any]]:
@@ -86,69 +313,71 @@ class DataUtil:
         return []  # 待开发：后续替换为实际加载逻辑
 
     @classmethod
-    def _process_login_data(cls, cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _process_login_data(cls, cases: List[Dict[str, Any]]) -> List[LoginCase]:
         """登录数据预处理（已实现）"""
         processed = []
         for idx, case in enumerate(cases):
-            # 基础校验：跳过非字典数据
-            if not isinstance(case, dict):
-                logger.warning(f"跳过无效登录用例（{idx + 1}）：非字典格式")
-                continue
-
-            new_case = case.copy()
-            # 1. 补充默认值（避免KeyError）
-            new_case.setdefault("case_name", f"登录用例_{idx + 1}")
-            new_case.setdefault("username", "")
-            new_case.setdefault("password", "")
-            new_case.setdefault("expected_code", 200)
-            new_case.setdefault("expected_msg", "success")
-            new_case.setdefault("skip_cache", False)  # 是否跳过Redis缓存
-            new_case.setdefault("check_db", False)  # 是否校验DB
-
-            # 2. 生成边界值（如超长密码）
-            if new_case.get("password_type") == "long_1000":
-                new_case["password"] = "a" * 1000
-                new_case.pop("password_type")
-            elif new_case.get("password_type") == "empty":
-                new_case["password"] = ""
-                new_case.pop("password_type")
-
-            processed.append(new_case)
+            new_case = cls._process_login_case(idx, case)
+            if new_case is not None:
+                processed.append(new_case)
         logger.info(f"✅ 预处理登录用例：共{len(processed)}条有效用例")
         return processed
 
     @classmethod
-    def _process_product_data(cls, cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _process_login_case(cls, idx: int, case: Any) -> Optional[LoginCase]:
+        """单条登录用例预处理（批量/流式加载共用），无效用例返回None"""
+        # 基础校验：跳过非字典数据
+        if not isinstance(case, dict):
+            logger.warning(f"跳过无效登录用例（{idx + 1}）：非字典格式")
+            return None
+
+        # 1. 构造紧凑记录（缺省字段按 LoginCase.DEFAULTS 补充，避免KeyError）
+        new_case = LoginCase.from_row(case)
+        if "case_name" not in case:
+            new_case.case_name = f"登录用例_{idx + 1}"
+
+        # 2. 生成边界值（如超长密码）
+        if new_case.get("password_type") == "long_1000":
+            new_case.password = "a" * 1000
+            del new_case["password_type"]
+        elif new_case.get("password_type") == "empty":
+            new_case.password = ""
+            del new_case["password_type"]
+        return new_case
+
+    @classmethod
+    def _process_product_data(cls, cases: List[Dict[str, Any]]) -> List[ProductCase]:
         """商品数据预处理（已实现）"""
         processed = []
         for idx, case in enumerate(cases):
-            # 基础校验：跳过非字典数据
-            if not isinstance(case, dict):
-                logger.warning(f"跳过无效商品用例（{idx + 1}）：非字典格式")
-                continue
-
-            new_case = case.copy()
-            # 1. 补充默认值（避免KeyError）
-            new_case.setdefault("case_name", f"商品用例_{idx + 1}")
-            new_case.setdefault("product_id", "")
-            new_case.setdefault("product_name", "")
-            new_case.setdefault("price", 0.0)
-            new_case.setdefault("expected_code", 200)
-            new_case.setdefault("expected_stock", 0)  # 预期库存
-            new_case.setdefault("check_stock", False)  # 是否校验库存
-
-            # 2. 生成边界值（如超长商品名、负数价格）
-            if new_case.get("name_type") == "long_200":
-                new_case["product_name"] = "商品名称超长测试" + "a" * 190
-                new_case.pop("name_type")
-            elif new_case.get("price_type") == "negative":
-                new_case["price"] = -99.99
-                new_case.pop("price_type")
-
-            processed.append(new_case)
+            new_case = cls._process_product_case(idx, case)
+            if new_case is not None:
+                processed.append(new_case)
         logger.info(f"✅ 预处理商品用例：共{len(processed)}条有效用例")
         return processed
 
+    @classmethod
+    def _process_product_case(cls, idx: int, case: Any) -> Optional[ProductCase]:
+        """单条商品用例预处理（批量/流式加载共用），无效用例返回None"""
+        # 基础校验：跳过非字典数据
+        if not isinstance(case, dict):
+            logger.warning(f"跳过无效商品用例（{idx + 1}）：非字典格式")
+            return None
+
+        # 1. 构造紧凑记录（缺省字段按 ProductCase.DEFAULTS 补充，避免KeyError）
+        new_case = ProductCase.from_row(case)
+        if "case_name" not in case:
+            new_case.case_name = f"商品用例_{idx + 1}"
+
+        # 2. 生成边界值（如超长商品名、负数价格）
+        if new_case.get("name_type") == "long_200":
+            new_case.product_name = "商品名称超长测试" + "a" * 190
+            del new_case["name_type"]
+        elif new_case.get("price_type") == "negative":
+            new_case.price = -99.99
+            del new_case["price_type"]
+        return new_case
+
     @classmethod
     def _process_order_data(cls, cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """订单数据预处理（待开发）"""
@@ -176,5 +405,5 @@ class DataUtil:
         return True
 
 
-# 单例导出（全局复用，避免重复初始化）
-data_util = DataUtil()
\ No newline at end of file
+# 单例导出（全局复用，首次使用时才初始化）
+data_util = LazyProxy(DataUtil)
\ No newline at end of file
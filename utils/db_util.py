@@ -1,31 +1,312 @@
+import csv
+import json
+import os
+import queue
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, MutableMapping, Optional, Union
+from config.env_config import config
+from utils.lazy_util import LazyProxy
 from utils.log_util import logger
+from utils.mock_context import current_context
+
+# 用字典模拟 users 表（主键：username，查询/更新 O(1)）
+# 结构：{username: {'username': str, 'password': str, 'fail_count': int}}
+MOCK_USERS_TEMPLATE = {
+    "admin": {"username": "admin", "password": "123456", "fail_count": 0},
+    "user1": {"username": "user1", "password": "123456", "fail_count": 0}
+}
+
+
+def _build_users_db() -> MutableMapping[str, Dict]:
+    # 配置了 AUTO_MOCK_DATASET 时以数据集用户为只读基线（写时复制，不复制百万级用户）
+    if config.MOCK_DATASET:
+        from mock.synthetic_data import dataset_users
+        from mock.user_store import CowUserStore
+        return CowUserStore(dataset_users(config.MOCK_DATASET))
+    return {name: dict(user) for name, user in MOCK_USERS_TEMPLATE.items()}
+
+
+def mock_users_db() -> MutableMapping[str, Dict]:
+    """当前 Mock 上下文的 users 表（首次访问时从模板复制 / 从数据集构建）"""
+    return current_context().state("db_util.users", _build_users_db)
 
-# 用列表模拟 users 表
-# 结构：{'username': str, 'password': str, 'fail_count': int}
-mock_users_db = [
-    {"username": "admin", "password": "123456", "fail_count": 0},
-    {"username": "user1", "password": "123456", "fail_count": 0}
-]
 
 class MockDBUtil:
+    # CSV 中需要转换类型的字段（其余按字符串保留）
+    CSV_FIELD_TYPES = {"fail_count": int}
+
+    def __init__(self, users: Optional[Dict[str, Dict]] = None):
+        self._users = users
+
+    @property
+    def users(self) -> Dict[str, Dict]:
+        """未显式传入用户表时使用当前 Mock 上下文的用户表（并行用例互不干扰）"""
+        return mock_users_db() if self._users is None else self._users
+
     def query_user(self, username):
-        for user in mock_users_db:
-            if user['username'] == username:
-                logger.info(f"[Mock DB] Query User: {username}, FailCount: {user['fail_count']}")
-                return user
-        logger.warning(f"[Mock DB] User Not Found: {username}")
+        user = self.users.get(username)
+        if user is not None:
+            logger.info("[Mock DB] Query User: %s, FailCount: %s", username, user['fail_count'])
+            return user
+        logger.warning("[Mock DB] User Not Found: %s", username)
         return None
 
     def update_fail_count(self, username, increment=True):
-        for user in mock_users_db:
-            if user['username'] == username:
-                if increment:
-                    user['fail_count'] += 1
-                    logger.info(f"[Mock DB] Update FailCount +1: {username} -> {user['fail_count']}")
-                else:
-                    user['fail_count'] = 0
-                    logger.info(f"[Mock DB] Reset FailCount: {username} -> 0")
-                return True
-        return False
-
-db_util = MockDBUtil()
\ No newline at end of file
+        user = self.users.get(username)
+        if user is None:
+            return False
+        if increment:
+            user['fail_count'] += 1
+            logger.info("[Mock DB] Update FailCount +1: %s -> %s", username, user['fail_count'])
+        else:
+            user['fail_count'] = 0
+            logger.info("[Mock DB] Reset FailCount: %s -> 0", username)
+        return True
+
+    def update_fail_counts(self, usernames: Iterable[str], increment=True) -> int:
+        """批量更新失败次数（单次日志汇总），返回实际更新的用户数"""
+        users = self.users
+        updated = 0
+        for username in usernames:
+            user = users.get(username)
+            if user is None:
+                continue
+            user['fail_count'] = user['fail_count'] + 1 if increment else 0
+            updated += 1
+        logger.info("[Mock DB] Batch Update FailCount (%s): %s users", "+1" if increment else "reset", updated)
+        return updated
+
+    def load_users(self, file_path: Union[str, Path], replace: bool = True) -> int:
+        """
+        从 CSV / JSON Lines 文件批量导入用户（逐行流式读取，同名用户覆盖；整个文件解析成功后才写入用户表）
+        :param file_path: 用户文件路径（.csv 首行表头 / .jsonl 每行一个用户）
+        :param replace: True=清空现有用户后导入，False=合并到现有用户
+        :return: 导入后的用户总数
+        """
+        file_path = Path(file_path)
+        if file_path.suffix.lower() not in (".csv", ".jsonl"):
+            raise ValueError(f"Unsupported user file format: {file_path.suffix} (expected .csv / .jsonl)")
+        # 先完整解析到临时字典，文件缺失/格式错误时不影响现有用户表
+        loaded = {}
+        for index, user in enumerate(self._iter_user_rows(file_path), start=1):
+            if not user.get('username'):
+                raise ValueError(f"User row {index} in {file_path.name} has no username: {user}")
+            loaded[user['username']] = user
+        if replace:
+            self.users.clear()
+        self.users.update(loaded)
+        logger.info("[Mock DB] Loaded Users: %s -> %s total", file_path.name, len(self.users))
+        return len(self.users)
+
+    def _iter_user_rows(self, file_path: Path):
+        """按文件格式逐行读取用户记录，补齐 fail_count 默认值"""
+        suffix = file_path.suffix.lower()
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            if suffix == ".jsonl":
+                rows = (json.loads(line) for line in f if line.strip())
+            else:
+                rows = (self._convert_csv_row(row) for row in csv.DictReader(f))
+            for row in rows:
+                row.setdefault('fail_count', 0)
+                yield row
+
+    def _convert_csv_row(self, row: Dict[str, Optional[str]]) -> Dict:
+        """CSV行转用户字典：空单元格忽略，类型字段按 CSV_FIELD_TYPES 转换"""
+        user = {}
+        for key, value in row.items():
+            if key is None or value is None or value == "":
+                continue
+            converter = self.CSV_FIELD_TYPES.get(key)
+            user[key] = converter(value) if converter else value
+        return user
+
+
+class ConnectionPool:
+    """
+    有界数据库连接池（线程安全）
+    - 连接按需创建，总数不超过 max_size；池满时等待归还，超时抛 TimeoutError
+    - connection() 上下文：正常退出提交，异常回滚，连接始终归还
+    """
+
+    def __init__(self, factory: Callable[[], object], max_size: int = 8, timeout: float = 10):
+        self._factory = factory
+        self._idle = queue.LifoQueue(maxsize=max_size)  # 后进先出：优先复用刚归还的热连接
+        self._lock = threading.Lock()
+        self._created = 0
+        self.max_size = max_size
+        self.timeout = timeout
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.max_size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return self._factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"获取数据库连接超时（{self.timeout}s，连接池上限 {self.max_size}）")
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """关闭所有空闲连接"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+class SQLDBUtil:
+    """
+    关系型数据库后端基类（接口与 MockDBUtil 一致：query_user / update_fail_count / update_fail_counts）
+    所有语句均为参数化查询，占位符由子类 PARAM 指定；批量更新使用 executemany 单事务提交
+    """
+
+    PARAM = "%s"
+    COLUMNS = ("username", "password", "fail_count", "status")
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+        p = self.PARAM
+        self.sql_query_user = f"SELECT {', '.join(self.COLUMNS)} FROM users WHERE username = {p}"
+        self.sql_increment = f"UPDATE users SET fail_count = fail_count + 1 WHERE username = {p}"
+        self.sql_reset = f"UPDATE users SET fail_count = 0 WHERE username = {p}"
+        self.sql_insert = f"REPLACE INTO users ({', '.join(self.COLUMNS)}) VALUES ({', '.join([p] * len(self.COLUMNS))})"
+
+    def query_user(self, username):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self.sql_query_user, (username,))
+            row = cursor.fetchone()
+        if row is None:
+            logger.warning("[DB] User Not Found: %s", username)
+            return None
+        user = dict(zip(self.COLUMNS, row))
+        logger.info("[DB] Query User: %s, FailCount: %s", username, user['fail_count'])
+        return user
+
+    def update_fail_count(self, username, increment=True):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self.sql_increment if increment else self.sql_reset, (username,))
+            updated = cursor.rowcount > 0
+        if updated:
+            logger.info("[DB] %s FailCount: %s", "Update +1" if increment else "Reset", username)
+        return updated
+
+    def update_fail_counts(self, usernames: Iterable[str], increment=True) -> int:
+        """批量更新失败次数（executemany，单事务），返回实际更新的用户数"""
+        params = [(username,) for username in usernames]
+        if not params:
+            return 0
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(self.sql_increment if increment else self.sql_reset, params)
+            updated = cursor.rowcount
+        logger.info("[DB] Batch Update FailCount (%s): %s users", "+1" if increment else "reset", updated)
+        return updated
+
+    def insert_users(self, users: Iterable[Dict]) -> int:
+        """批量写入用户（同名覆盖），用于准备测试数据"""
+        rows = [(u['username'], u.get('password', ''), u.get('fail_count', 0), u.get('status', 'active'))
+                for u in users]
+        with self.pool.connection() as conn:
+            conn.cursor().executemany(self.sql_insert, rows)
+        logger.info("[DB] Inserted Users: %s", len(rows))
+        return len(rows)
+
+
+class MySQLDBUtil(SQLDBUtil):
+    """MySQL 后端（pymysql），连接参数读取 EnvConfig 的 AUTO_DB_* 配置"""
+
+    PARAM = "%s"
+
+    def __init__(self, pool_size: int = None):
+        import pymysql  # 仅 AUTO_DB_BACKEND=mysql 时才需要安装
+        from pymysql.constants import CLIENT
+
+        def connect():
+            # FOUND_ROWS：rowcount 返回匹配行数（默认只计实际变更的行，fail_count 已为0时重置会被判为用户不存在）
+            return pymysql.connect(host=config.DB_HOST, port=config.DB_PORT, user=config.DB_USER,
+                                   password=config.DB_PASSWORD, database=config.DB_NAME,
+                                   charset="utf8mb4", autocommit=False, client_flag=CLIENT.FOUND_ROWS)
+        super().__init__(ConnectionPool(connect, pool_size or config.DB_POOL_SIZE, config.DB_POOL_TIMEOUT))
+
+
+class SQLiteDBUtil(SQLDBUtil):
+    """
+    SQLite 替身（标准库 sqlite3），无需 MySQL 即可验证真实 SQL 路径和测吞吐
+    path 为 ":memory:" 时使用临时目录下的库文件（对象回收时删除）：
+    共享缓存内存库在多连接并发写时直接报 table locked，文件库 + WAL 才能靠 busy timeout 排队
+    """
+
+    PARAM = "?"
+    SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username   TEXT PRIMARY KEY,
+    password   TEXT NOT NULL DEFAULT '',
+    fail_count INTEGER NOT NULL DEFAULT 0,
+    status     TEXT NOT NULL DEFAULT 'active'
+)
+"""
+
+    def __init__(self, path: str = None, pool_size: int = None):
+        path = path or config.DB_SQLITE_PATH
+        if path == ":memory:":
+            self._tmp_dir = tempfile.TemporaryDirectory(prefix="ecom_sqlite_")
+            path = os.path.join(self._tmp_dir.name, "users.db")
+
+        def connect():
+            # cached_statements：同一连接内复用已编译的语句（预编译语句缓存）
+            conn = sqlite3.connect(path, timeout=config.DB_POOL_TIMEOUT, check_same_thread=False,
+                                   cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            return conn
+        super().__init__(ConnectionPool(connect, pool_size or config.DB_POOL_SIZE, config.DB_POOL_TIMEOUT))
+        with self.pool.connection() as conn:
+            conn.execute(self.SCHEMA)
+
+
+def create_db_util():
+    """按 AUTO_DB_BACKEND 创建数据库后端：mock（默认）/ sqlite / mysql"""
+    backends = {"mock": MockDBUtil, "sqlite": SQLiteDBUtil, "mysql": MySQLDBUtil}
+    backend = config.DB_BACKEND
+    if backend not in backends:
+        raise ValueError(f"不支持的数据库后端：{backend}（可选：{list(backends)}）")
+    return backends[backend]()
+
+
+# 首次使用时才按配置创建（导入模块不读取配置、不建连接池）
+db_util = LazyProxy(create_db_util)
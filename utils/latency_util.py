@@ -0,0 +1,189 @@
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class LatencyHistogram:
+    """
+    固定内存的延迟直方图（HDR 风格：按2的幂分段，每段内线性细分）
+    - 记录单位为微秒，范围 1µs ~ MAX_US，超出上限按上限记录
+    - 每段 SUB_BUCKETS/2 个细分桶，分位数相对误差 < 2/SUB_BUCKETS（约1.6%）
+    - 内存固定（约1700个计数），与记录次数无关，可跨线程/进程合并
+    """
+
+    SUB_BITS = 7
+    SUB_BUCKETS = 1 << SUB_BITS  # 128
+    HALF = SUB_BUCKETS // 2
+    MAX_US = 3600 * 1_000_000  # 1小时
+
+    def __init__(self):
+        max_bucket = max(0, self.MAX_US.bit_length() - self.SUB_BITS)
+        self.counts: List[int] = [0] * (self.SUB_BUCKETS + max_bucket * self.HALF)
+        self.total = 0
+        self.sum_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    def _index(self, value_us: int) -> int:
+        bucket = max(0, value_us.bit_length() - self.SUB_BITS)
+        sub = value_us >> bucket
+        return sub if bucket == 0 else self.SUB_BUCKETS + (bucket - 1) * self.HALF + (sub - self.HALF)
+
+    def _upper_value(self, index: int) -> int:
+        """桶内最大值（分位数按桶上界报告，偏保守）"""
+        if index < self.SUB_BUCKETS:
+            return index
+        bucket, offset = divmod(index - self.SUB_BUCKETS, self.HALF)
+        bucket += 1
+        return ((self.HALF + offset + 1) << bucket) - 1
+
+    def record_ms(self, value_ms: float) -> None:
+        value_us = min(max(int(value_ms * 1000), 0), self.MAX_US)
+        self.counts[self._index(value_us)] += 1
+        self.total += 1
+        self.sum_us += value_us
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def percentile(self, p: float) -> float:
+        """第 p 百分位（毫秒），无数据时返回 0"""
+        if not self.total:
+            return 0.0
+        target = max(1, -(-self.total * p // 100))  # 向上取整
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._upper_value(index), self.max_us) / 1000
+        return self.max_us / 1000
+
+    @property
+    def mean_ms(self) -> float:
+        return self.sum_us / self.total / 1000 if self.total else 0.0
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.sum_us += other.sum_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    def to_dict(self) -> Dict:
+        """序列化（稀疏存储非零桶，用于跨进程合并）"""
+        return {"counts": {i: c for i, c in enumerate(self.counts) if c}, "total": self.total,
+                "sum_us": self.sum_us, "min_us": self.min_us, "max_us": self.max_us}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        hist = cls()
+        for index, count in data["counts"].items():
+            hist.counts[int(index)] = count
+        hist.total, hist.sum_us = data["total"], data["sum_us"]
+        hist.min_us, hist.max_us = data["min_us"], data["max_us"]
+        return hist
+
+
+class LatencyRecorder:
+    """
+    请求耗时记录器（线程安全），按 (method, path, status) 分组，每组按阶段各一个直方图
+    阶段：total（总耗时）/ ttfb（首字节）/ dns / connect（传输层提供时才有）
+    """
+
+    PHASES = ("total", "ttfb", "dns", "connect")
+    REPORT_PERCENTILES = (50, 95, 99)
+    OVERFLOW_PATH = "<other>"  # 分组数达上限后，新路径归入此分组（避免路径带ID时无限增长）
+
+    def __init__(self, max_keys: int = 500):
+        self.max_keys = max_keys
+        self._groups: Dict[Tuple[str, str, str], Dict[str, LatencyHistogram]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, url: str, status, total_ms: float, **phases_ms: Optional[float]) -> None:
+        """
+        记录一次请求耗时
+        :param status: 响应状态码（无响应的异常请求传 "ERR"）
+        :param phases_ms: ttfb / dns / connect 等阶段耗时（毫秒），None 表示传输层未提供
+        """
+        key = (method.upper(), urlsplit(url).path or "/", str(status))
+        with self._lock:
+            group = self._groups.get(key)
+            if group is None:
+                if len(self._groups) >= self.max_keys:
+                    key = (key[0], self.OVERFLOW_PATH, key[2])
+                group = self._groups.setdefault(key, {})
+            group.setdefault("total", LatencyHistogram()).record_ms(total_ms)
+            for phase, value in phases_ms.items():
+                if value is not None:
+                    group.setdefault(phase, LatencyHistogram()).record_ms(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._groups = {}
+
+    def __len__(self) -> int:
+        return sum(group["total"].total for group in self._groups.values())
+
+    # -------------------------- 合并/导出 --------------------------
+    def to_dict(self) -> Dict:
+        """序列化全部分组（可经 xdist workeroutput 传给主进程合并）"""
+        with self._lock:
+            return {"|".join(key): {phase: hist.to_dict() for phase, hist in group.items()}
+                    for key, group in self._groups.items()}
+
+    def merge_dict(self, data: Dict) -> None:
+        with self._lock:
+            for joined_key, phases in data.items():
+                group = self._groups.setdefault(tuple(joined_key.split("|", 2)), {})
+                for phase, hist_data in phases.items():
+                    hist = LatencyHistogram.from_dict(hist_data)
+                    if phase in group:
+                        group[phase].merge(hist)
+                    else:
+                        group[phase] = hist
+
+    def summary(self) -> List[Dict]:
+        """各分组的分位数汇总（毫秒），按请求数降序"""
+        rows = []
+        with self._lock:
+            items = list(self._groups.items())
+        for (method, path, status), group in items:
+            total = group["total"]
+            row = {"method": method, "path": path, "status": status, "count": total.total,
+                   "mean_ms": round(total.mean_ms, 3), "max_ms": total.max_us / 1000}
+            for phase in self.PHASES:
+                hist = group.get(phase)
+                if hist is None:
+                    continue
+                prefix = "" if phase == "total" else f"{phase}_"
+                for p in self.REPORT_PERCENTILES:
+                    row[f"{prefix}p{p}_ms"] = hist.percentile(p)
+            rows.append(row)
+        rows.sort(key=lambda r: -r["count"])
+        return rows
+
+    def format_table(self) -> str:
+        """终端表格：总耗时 p50/p95/p99/max，传输层提供时附首字节 p95"""
+        rows = self.summary()
+        if not rows:
+            return ""
+        header = f"{'METHOD':<7}{'PATH':<32}{'STATUS':>7}{'COUNT':>8}{'P50':>10}{'P95':>10}{'P99':>10}{'MAX':>10}{'TTFB_P95':>10}"
+        lines = [header, "-" * len(header)]
+        for r in rows:
+            ttfb = f"{r['ttfb_p95_ms']:>10.2f}" if "ttfb_p95_ms" in r else f"{'-':>10}"
+            lines.append(f"{r['method']:<7}{r['path'][:31]:<32}{r['status']:>7}{r['count']:>8}"
+                         f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['max_ms']:>10.2f}{ttfb}")
+        return "\n".join(lines)
+
+    def write_json(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"unit": "ms", "groups": self.summary()}, ensure_ascii=False, indent=2),
+                        encoding="utf-8")
+        return path
+
+
+# 进程级记录器（RequestUtil / AsyncRequestUtil 共用）
+latency_recorder = LatencyRecorder()
@@ -0,0 +1,50 @@
+import threading
+from typing import Any, Callable
+
+
+class LazyProxy:
+    """
+    惰性单例代理：首次访问属性时才调用 factory 创建真实对象，之后所有属性读写转发给它
+    用于模块级单例（config / data_util / redis_util / db_util 等）：导入模块不读取 .env、
+    不建连接池，pytest --collect-only 或单用例重跑只为实际用到的单例付出初始化成本
+    注意：代理本身不是真实对象的实例（isinstance 判断需先 resolve）
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_instance", None)
+        object.__setattr__(self, "_lazy_lock", threading.Lock())
+
+    def _lazy_resolve(self) -> Any:
+        instance = self._lazy_instance
+        if instance is None:
+            with self._lazy_lock:
+                instance = self._lazy_instance
+                if instance is None:
+                    instance = self._lazy_factory()
+                    object.__setattr__(self, "_lazy_instance", instance)
+        return instance
+
+    def __getattr__(self, name):
+        return getattr(self._lazy_resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._lazy_resolve(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._lazy_resolve(), name)
+
+    def __repr__(self):
+        if self._lazy_instance is None:
+            return f"<LazyProxy {getattr(self._lazy_factory, '__name__', self._lazy_factory)} (未初始化)>"
+        return repr(self._lazy_instance)
+
+
+def resolve(obj: Any) -> Any:
+    """返回代理背后的真实对象（非代理对象原样返回）"""
+    return obj._lazy_resolve() if isinstance(obj, LazyProxy) else obj
+
+
+def is_initialized(obj: Any) -> bool:
+    """代理是否已创建真实对象（非代理对象视为已初始化）"""
+    return not isinstance(obj, LazyProxy) or obj._lazy_instance is not None
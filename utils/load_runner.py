@@ -0,0 +1,266 @@
+import asyncio
+import itertools
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from utils.background_util import background_dispatcher
+from utils.data_util import data_util
+from utils.latency_util import LatencyHistogram
+from utils.log_util import logger
+from utils.mock_context import use_context
+
+
+class LoadStats:
+    """压测统计（线程安全）：按用例名统计请求数、异常数、expected_code 不符数及耗时直方图"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cases: Dict[str, Dict[str, Any]] = {}
+        self.started_at = self.finished_at = None
+
+    def record(self, case_name: str, elapsed_ms: float, mismatch: bool, error: bool) -> None:
+        with self._lock:
+            stats = self._cases.get(case_name)
+            if stats is None:
+                stats = self._cases[case_name] = {"count": 0, "mismatch": 0, "error": 0, "hist": LatencyHistogram()}
+            stats["count"] += 1
+            stats["mismatch"] += mismatch
+            stats["error"] += error
+            stats["hist"].record_ms(elapsed_ms)
+
+    @property
+    def duration(self) -> float:
+        return (self.finished_at or time.perf_counter()) - (self.started_at or time.perf_counter())
+
+    def summary(self) -> Dict[str, Any]:
+        """汇总：总吞吐、失败率（异常 + expected_code 不符）、各用例分位数（毫秒）"""
+        overall = LatencyHistogram()
+        rows = []
+        with self._lock:
+            items = list(self._cases.items())
+        for case_name, stats in items:
+            hist = stats["hist"]
+            overall.merge(hist)
+            rows.append({"case_name": case_name, "count": stats["count"], "mismatch": stats["mismatch"],
+                         "error": stats["error"], "p50_ms": hist.percentile(50), "p95_ms": hist.percentile(95),
+                         "p99_ms": hist.percentile(99), "max_ms": hist.max_us / 1000})
+        total = overall.total
+        failed = sum(r["mismatch"] + r["error"] for r in rows)
+        duration = self.duration
+        return {
+            "duration_s": round(duration, 3),
+            "requests": total,
+            "throughput_rps": round(total / duration, 2) if duration > 0 else 0.0,
+            "error_rate": round(failed / total, 4) if total else 0.0,
+            "p50_ms": overall.percentile(50), "p95_ms": overall.percentile(95), "p99_ms": overall.percentile(99),
+            "cases": rows,
+        }
+
+
+class _Pacer:
+    """
+    目标 RPS 发放器（所有 worker 共享）：排定第 k 个请求的发出时间
+    爬坡期 R 内速率从 0 线性增长到目标 RPS，累计请求数 N(t) = rps·t²/2R，反解得第 k 个请求的时间点
+    """
+
+    def __init__(self, rps: float, ramp_up: float, start: float):
+        self.rps, self.ramp_up, self.start = rps, max(ramp_up, 0.0), start
+        self._ramp_requests = rps * self.ramp_up / 2  # 爬坡期内发出的请求数
+        self._issued = 0
+        self._lock = threading.Lock()
+
+    def next_slot(self) -> float:
+        with self._lock:
+            k = self._issued
+            self._issued += 1
+        if k < self._ramp_requests:
+            return self.start + math.sqrt(2 * self.ramp_up * k / self.rps)
+        return self.start + self.ramp_up + (k - self._ramp_requests) / self.rps
+
+
+class LoadRunner:
+    """
+    压测执行器：把功能用例（YAML/JSONL/CSV）作为负载循环回放
+    - 并发模式：concurrency 个 worker 闭环执行（完成一个再发下一个），爬坡期内 worker 依次启动
+    - 限速模式：指定 rps 时按目标速率排定发出时间（爬坡期内线性升速），concurrency 为最大在途数
+    - worker：线程池（thread）或 asyncio 协程（async，调用 API 的 async_* 接口）
+    - Mock 隔离：isolate=True 时每次请求在全新的 Mock 上下文中执行，并按用例预置失败次数，
+      保证有状态用例（如失败锁定）每次回放结果一致
+    """
+
+    def __init__(self, cases: List[Dict[str, Any]], kind: str, concurrency: int = 8, rps: Optional[float] = None,
+                 duration: float = 10, ramp_up: float = 0, mode: str = "thread", token: str = "mock_token_123",
+                 isolate: bool = True, api_factory: Optional[Callable[[], Any]] = None):
+        if kind not in ("login", "product"):
+            raise ValueError(f"不支持的用例类型：{kind}（可选：login / product）")
+        if mode not in ("thread", "async"):
+            raise ValueError(f"不支持的执行模式：{mode}（可选：thread / async）")
+        if not cases:
+            raise ValueError("用例为空，无法压测")
+        self.cases, self.kind, self.mode = cases, kind, mode
+        self.concurrency, self.rps = max(1, concurrency), rps
+        self.duration, self.ramp_up = duration, ramp_up
+        self.token, self.isolate = token, isolate
+        self.api_factory = api_factory or self._default_api_factory
+        self.stats = LoadStats()
+        self._case_iter = itertools.cycle(cases)
+        self._case_lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, filename: str, kind: Optional[str] = None, **kwargs) -> "LoadRunner":
+        """从 data 目录下的用例文件创建（kind 缺省时按文件名推断）"""
+        kind = kind or ("login" if "login" in filename else "product")
+        return cls(list(data_util.iter_cases(filename, kind)), kind, **kwargs)
+
+    def _default_api_factory(self):
+        if self.kind == "login":
+            from api.login_api import LoginApi
+            return LoginApi()
+        from api.product_api import ProductApi
+        return ProductApi()
+
+    def _next_case(self) -> Dict[str, Any]:
+        with self._case_lock:
+            return next(self._case_iter)
+
+    # -------------------------- 单个请求 --------------------------
+    def _prepare(self, case: Dict[str, Any]) -> None:
+        """隔离上下文内的用例前置（与功能用例一致：预置失败次数）"""
+        if self.kind == "login" and case.get("fail_count_before") is not None:
+            from mock.login_mock import login_mock
+            login_mock.set_fail_count(case["username"], case["fail_count_before"])
+
+    def _call(self, api, case: Dict[str, Any]) -> Dict[str, Any]:
+        if self.kind == "login":
+            return api.login(case["username"], case["password"])
+        if case.get("product_name"):
+            return api.create_product(case["product_name"], case["price"], self.token)
+        if not case["product_id"]:
+            return api.get_product_list(self.token)
+        return api.get_product_detail(case["product_id"], self.token)
+
+    async def _async_call(self, api, case: Dict[str, Any]) -> Dict[str, Any]:
+        if self.kind == "login":
+            return await api.async_login(case["username"], case["password"])
+        if case.get("product_name"):
+            return await api.async_create_product(case["product_name"], case["price"], self.token)
+        if not case["product_id"]:
+            return await api.async_get_product_list(self.token)
+        return await api.async_get_product_detail(case["product_id"], self.token)
+
+    def _execute(self, api, case: Dict[str, Any]) -> None:
+        start = time.perf_counter()
+        try:
+            if self.isolate:
+                with use_context():
+                    self._prepare(case)
+                    resp = self._call(api, case)
+            else:
+                resp = self._call(api, case)
+            self.stats.record(case["case_name"], (time.perf_counter() - start) * 1000,
+                              mismatch=resp.get("code") != case["expected_code"], error=False)
+        except Exception as e:
+            self.stats.record(case["case_name"], (time.perf_counter() - start) * 1000, mismatch=False, error=True)
+            logger.debug("压测请求异常：%s", e)
+
+    async def _async_execute(self, api, case: Dict[str, Any]) -> None:
+        start = time.perf_counter()
+        try:
+            if self.isolate:
+                # 每个 worker 协程运行在独立的 Task 上下文中，此处激活的 Mock 上下文只影响本次请求
+                with use_context():
+                    self._prepare(case)
+                    resp = await self._async_call(api, case)
+            else:
+                resp = await self._async_call(api, case)
+            self.stats.record(case["case_name"], (time.perf_counter() - start) * 1000,
+                              mismatch=resp.get("code") != case["expected_code"], error=False)
+        except Exception as e:
+            self.stats.record(case["case_name"], (time.perf_counter() - start) * 1000, mismatch=False, error=True)
+            logger.debug("压测请求异常：%s", e)
+
+    # -------------------------- 调度 --------------------------
+    def run(self) -> Dict[str, Any]:
+        """执行压测，返回汇总结果"""
+        logger.info("🚀 压测开始：%s 用例 %s 条，模式=%s，并发=%s，目标RPS=%s，爬坡=%ss，持续=%ss",
+                    self.kind, len(self.cases), self.mode, self.concurrency, self.rps or "不限",
+                    self.ramp_up, self.duration)
+        self.stats.started_at = time.perf_counter()
+        deadline = self.stats.started_at + self.ramp_up + self.duration
+        pacer = _Pacer(self.rps, self.ramp_up, self.stats.started_at) if self.rps else None
+        if self.mode == "thread":
+            self._run_threads(deadline, pacer)
+        else:
+            asyncio.run(self._run_async(deadline, pacer))
+        self.stats.finished_at = time.perf_counter()
+        summary = self.stats.summary()
+        # 旁路调用在后台派发，不计入请求耗时；结束时等待其执行完并附上派发指标
+        background_dispatcher.flush()
+        summary["background"] = background_dispatcher.stats()
+        logger.info("🏁 压测结束：%s 个请求，吞吐 %s rps，失败率 %.2f%%，p95 %.2fms",
+                    summary["requests"], summary["throughput_rps"], summary["error_rate"] * 100, summary["p95_ms"])
+        return summary
+
+    def _start_delay(self, worker_id: int) -> float:
+        """并发模式下的爬坡：worker 在爬坡期内均匀错开启动"""
+        if self.rps or self.ramp_up <= 0:
+            return 0.0
+        return self.ramp_up * worker_id / self.concurrency
+
+    def _run_threads(self, deadline: float, pacer: Optional[_Pacer]) -> None:
+        def worker(worker_id):
+            api = self.api_factory()
+            time.sleep(self._start_delay(worker_id))
+            while True:
+                if pacer is not None:
+                    slot = pacer.next_slot()
+                    if slot >= deadline:
+                        return
+                    time.sleep(max(0.0, slot - time.perf_counter()))
+                elif time.perf_counter() >= deadline:
+                    return
+                self._execute(api, self._next_case())
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="load") as pool:
+            list(pool.map(worker, range(self.concurrency)))
+
+    async def _run_async(self, deadline: float, pacer: Optional[_Pacer]) -> None:
+        api = self.api_factory()  # 异步接口共享同一个 aiohttp Session（连接池）
+
+        async def worker(worker_id):
+            await asyncio.sleep(self._start_delay(worker_id))
+            while True:
+                if pacer is not None:
+                    slot = pacer.next_slot()
+                    if slot >= deadline:
+                        return
+                    await asyncio.sleep(max(0.0, slot - time.perf_counter()))
+                elif time.perf_counter() >= deadline:
+                    return
+                await self._async_execute(api, self._next_case())
+
+        try:
+            await asyncio.gather(*(worker(i) for i in range(self.concurrency)))
+        finally:
+            if getattr(api, "_async_req", None) is not None:
+                await api.async_req.close()
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """压测结果终端表格"""
+    lines = [
+        f"持续 {summary['duration_s']}s | 请求 {summary['requests']} | 吞吐 {summary['throughput_rps']} rps | "
+        f"失败率 {summary['error_rate'] * 100:.2f}% | p50 {summary['p50_ms']:.2f}ms | "
+        f"p95 {summary['p95_ms']:.2f}ms | p99 {summary['p99_ms']:.2f}ms",
+        f"{'用例':<28}{'请求数':>8}{'不符':>8}{'异常':>8}{'P50':>10}{'P95':>10}{'P99':>10}{'MAX':>10}",
+    ]
+    for r in summary["cases"]:
+        lines.append(f"{r['case_name'][:26]:<28}{r['count']:>8}{r['mismatch']:>8}{r['error']:>8}"
+                     f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['max_ms']:>10.2f}")
+    bg = summary.get("background")
+    if bg and (bg["submitted"] or bg["dropped"]):
+        lines.append(f"后台旁路调用：提交 {bg['submitted']} | 完成 {bg['completed']} | 失败 {bg['failed']} | "
+                     f"丢弃 {bg['dropped']} | 峰值队列深度 {bg['max_depth']}")
+    return "\n".join(lines)
@@ -1,38 +1,307 @@
+import atexit
+import gzip
+import json
 import logging
 import os
+import queue
+import shutil
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, RotatingFileHandler, TimedRotatingFileHandler
+from pathlib import Path
+from config.env_config import config
+
+# 项目根目录（日志目录默认固定在项目根目录下，不随pytest启动目录变化）
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+class _BatchFlushMixin:
+    """批量刷盘：emit 内的逐条 flush 改为空操作，由后台线程每批写完后统一 flush_batch"""
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+
+def _batch_handler_class(handler_cls, batch_flush: bool):
+    """异步模式下为Handler混入批量刷盘能力，同步模式原样返回"""
+    if not batch_flush:
+        return handler_cls
+    return type(f"_Batch{handler_cls.__name__}", (_BatchFlushMixin, handler_cls), {})
+
+
+# -------------------------- 结构化日志（JSON Lines） --------------------------
+def _nodeid_filter(record) -> bool:
+    """在调用方线程记录当前用例 nodeid（异步模式下后台线程格式化时已无法获取）"""
+    current_test = os.environ.get("PYTEST_CURRENT_TEST", "")
+    record.nodeid = current_test.rsplit(" ", 1)[0] if current_test else ""
+    return True
+
+
+class JsonLineFormatter(logging.Formatter):
+    """JSON Lines 格式：一行一条记录，请求日志通过 extra 携带结构化字段"""
+    STRUCTURED_FIELDS = ("method", "url", "status", "elapsed_ms")
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "nodeid": getattr(record, "nodeid", ""),
+            "msg": record.getMessage(),
+        }
+        for field in self.STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _gzip_namer(name: str) -> str:
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """轮转时gzip压缩旧文件"""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+class _BoundedQueueHandler(QueueHandler):
+    """有界队列Handler：队列满时按策略阻塞等待（block）或丢弃并计数（drop）"""
+
+    def __init__(self, log_queue: queue.Queue, policy: str = "block"):
+        super().__init__(log_queue)
+        self.policy = policy
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()  # 多个生产者线程并发丢弃时计数不丢失
+
+    def prepare(self, record):
+        """
+        仅合并参数为最终消息，不复制记录（标准实现每条日志 copy 一次 LogRecord）
+        异常栈交由后台线程格式化，调用方不承担格式化开销
+        """
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record):
+        if self.policy == "drop":
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                with self._dropped_lock:
+                    self.dropped += 1
+        else:
+            self.queue.put(record)
+
+
+class _BatchQueueListener:
+    """后台日志线程：阻塞取第一条，再非阻塞取出剩余记录（最多batch_size条），整批写完后统一flush"""
+    _SENTINEL = None
+
+    def __init__(self, log_queue: queue.Queue, handlers, batch_size: int = 256):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = max(1, batch_size)
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="EcomTestLogListener", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """投递结束标记并等待队列排空（保证退出前日志全部落盘）"""
+        if self._thread is None:
+            return
+        self.queue.put(self._SENTINEL)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = False
+            for record in batch:
+                if record is self._SENTINEL:
+                    stopping = True
+                    continue
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+            for handler in self.handlers:
+                handler.flush_batch()
+            if stopping:
+                return
 
 
 class LogUtil:
-    def __init__(self):
+    def __init__(self, async_mode=None):
         self.logger = logging.getLogger("EcomTest")
-        self.logger.setLevel(logging.INFO)
+        self._async_mode = async_mode
+        self._queue_handler = None
+        self._listener = None
+        # 首次输出日志时才读取配置、创建日志目录和文件（导入模块无副作用）
+        self._pending = True
+        self._setup_lock = threading.Lock()
+        # 进程退出前排空异步队列，避免丢失尾部日志
+        atexit.register(self.shutdown)
 
-        log_dir = "log"
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
+    def _setup(self):
+        """按 EnvConfig 完成默认配置（已显式 configure 时只设置级别）"""
+        with self._setup_lock:
+            if not self._pending:
+                return
+            if self.logger.handlers:
+                self.logger.setLevel(config.LOG_LEVEL)
+                self._pending = False
+            else:
+                self.configure(async_mode=config.LOG_ASYNC if self._async_mode is None else self._async_mode)
 
-        log_file = os.path.join(log_dir, f"run_{datetime.now().strftime('%Y%m%d')}.log")
+    def configure(self, async_mode=False, queue_size=None, policy=None, batch_size=None, json_sink=None):
+        """
+        (重新)配置日志输出
+        :param async_mode: False=同步写文件/控制台；True=经有界队列由后台线程批量写出
+        :param queue_size: 异步队列容量（默认读取 AUTO_LOG_QUEUE_SIZE）
+        :param policy: 队列满时策略 block/drop（默认读取 AUTO_LOG_QUEUE_POLICY）
+        :param batch_size: 后台线程单批最多写出条数（默认读取 AUTO_LOG_BATCH_SIZE）
+        :param json_sink: 是否输出 JSON Lines 结构化日志（默认读取 AUTO_LOG_JSON）
+        """
+        self.shutdown()
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+            handler.close()
+        if self._pending:
+            self.logger.setLevel(config.LOG_LEVEL)
 
-        fh = logging.FileHandler(log_file, encoding='utf-8')
-        ch = logging.StreamHandler()
+        handlers = self._build_handlers(batch_flush=async_mode, json_sink=json_sink)
+        if not async_mode:
+            for handler in handlers:
+                self.logger.addHandler(handler)
+        else:
+            log_queue = queue.Queue(maxsize=queue_size or config.LOG_QUEUE_SIZE)
+            self._queue_handler = _BoundedQueueHandler(log_queue, policy or config.LOG_QUEUE_POLICY)
+            self._listener = _BatchQueueListener(log_queue, handlers, batch_size or config.LOG_BATCH_SIZE)
+            self._listener.start()
+            self.logger.addHandler(self._queue_handler)
+        self._pending = False
 
+    def _build_handlers(self, batch_flush=False, json_sink=None):
+        """构建输出Handler：文本日志文件 + 控制台 +（可选）JSON Lines 结构化日志"""
+        log_dir = Path(config.LOG_DIR) if config.LOG_DIR else PROJECT_ROOT / "log"
+        log_dir.mkdir(parents=True, exist_ok=True)
+        date_str = datetime.now().strftime('%Y%m%d')
+        # 并行执行（pytest-xdist）时每个worker写独立文件，避免多进程写同一文件/轮转冲突
+        worker = os.getenv("PYTEST_XDIST_WORKER")
+        if worker:
+            date_str = f"{date_str}_{worker}"
         formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+        fh = _batch_handler_class(logging.FileHandler, batch_flush)(log_dir / f"run_{date_str}.log", encoding='utf-8')
+        ch = _batch_handler_class(logging.StreamHandler, batch_flush)()
         fh.setFormatter(formatter)
         ch.setFormatter(formatter)
+        handlers = [fh, ch]
+
+        self.logger.removeFilter(_nodeid_filter)
+        if config.LOG_JSON if json_sink is None else json_sink:
+            handlers.append(self._build_json_handler(log_dir / f"run_{date_str}.jsonl", batch_flush))
+            self.logger.addFilter(_nodeid_filter)
+        return handlers
+
+    @staticmethod
+    def _build_json_handler(json_file: Path, batch_flush=False):
+        """JSON Lines 日志：按时间（AUTO_LOG_JSON_WHEN）或大小（AUTO_LOG_JSON_MAX_BYTES）轮转，旧文件可gzip压缩"""
+        if config.LOG_JSON_WHEN:
+            jh = _batch_handler_class(TimedRotatingFileHandler, batch_flush)(
+                json_file, when=config.LOG_JSON_WHEN, backupCount=config.LOG_JSON_BACKUPS, encoding='utf-8'
+            )
+        else:
+            jh = _batch_handler_class(RotatingFileHandler, batch_flush)(
+                json_file, maxBytes=config.LOG_JSON_MAX_BYTES, backupCount=config.LOG_JSON_BACKUPS, encoding='utf-8'
+            )
+        if config.LOG_JSON_COMPRESS:
+            jh.namer = _gzip_namer
+            jh.rotator = _gzip_rotator
+        jh.setFormatter(JsonLineFormatter())
+        return jh
+
+    def shutdown(self):
+        """停止异步日志线程（排空队列 + 关闭文件），同步模式下无操作"""
+        if self._listener is None:
+            return
+        listener, queue_handler = self._listener, self._queue_handler
+        self._listener = self._queue_handler = None
+        self.logger.removeHandler(queue_handler)
+        listener.stop()
+
+        if queue_handler.dropped:
+            record = self.logger.makeRecord(
+                self.logger.name, logging.WARNING, __file__, 0,
+                f"⚠️ 日志队列已满，累计丢弃 {queue_handler.dropped} 条日志", None, None
+            )
+            for handler in listener.handlers:
+                handler.handle(record)
+        for handler in listener.handlers:
+            handler.flush_batch()
+            handler.close()
+
+    def set_level(self, level):
+        """调整日志级别（如 "WARNING" / logging.WARNING）"""
+        if self._pending:
+            self._setup()
+        self.logger.setLevel(level)
+
+    def is_enabled_for(self, level) -> bool:
+        """判断级别是否启用（调用方拼装大段日志前先判断，避免无效格式化）"""
+        if self._pending:
+            self._setup()
+        return self.logger.isEnabledFor(level)
+
+    # -------------------------- 日志方法（惰性格式化） --------------------------
+    # msg 支持三种写法，级别未启用时均不做任何格式化：
+    #   logger.info("固定文本")
+    #   logger.info("用户 %s 失败次数 %s", username, count)   # %-style，启用时才拼接
+    #   logger.info(lambda: f"响应: {resp.text[:200]}")        # 可调用对象，启用时才求值
+    def debug(self, msg, *args, **kwargs):
+        if self._pending:
+            self._setup()
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._log(logging.DEBUG, msg, args, kwargs)
 
-        if not self.logger.handlers:
-            self.logger.addHandler(fh)
-            self.logger.addHandler(ch)
+    def info(self, msg, *args, **kwargs):
+        if self._pending:
+            self._setup()
+        if self.logger.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, msg, args, kwargs)
 
-    def info(self, msg):
-        self.logger.info(msg)
+    def warning(self, msg, *args, **kwargs):
+        if self._pending:
+            self._setup()
+        if self.logger.isEnabledFor(logging.WARNING):
+            self._log(logging.WARNING, msg, args, kwargs)
 
-    def error(self, msg):
-        self.logger.error(msg)
+    def error(self, msg, *args, **kwargs):
+        if self._pending:
+            self._setup()
+        if self.logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, msg, args, kwargs)
 
-    def warning(self, msg):
-        self.logger.warning(msg)
+    def _log(self, level, msg, args, kwargs):
+        if callable(msg):
+            msg = msg()
+        self.logger.log(level, msg, *args, **kwargs)
 
 
-logger = LogUtil()
\ No newline at end of file
+logger = LogUtil()
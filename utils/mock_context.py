@@ -0,0 +1,63 @@
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+
+class MockContext:
+    """
+    一组相互隔离的 Mock 状态（用户表、Token 缓存、商品目录等）
+    - 各 Mock 模块按名称登记自己的状态，首次访问时由 factory 创建
+    - 每条用例/每个线程激活各自的上下文，互不干扰，可在同一进程内并行执行
+    - 多进程并行（pytest-xdist）时每个进程天然独立，无需额外处理
+    """
+
+    def __init__(self):
+        self._state: Dict[str, Any] = {}
+
+    def state(self, name: str, factory: Callable[[], Any]) -> Any:
+        """获取名为 name 的状态，不存在时用 factory 创建"""
+        try:
+            return self._state[name]
+        except KeyError:
+            return self._state.setdefault(name, factory())
+
+    def peek_state(self, name: str, default: Any = None) -> Any:
+        """获取名为 name 的状态，不存在时返回 default（不创建）"""
+        return self._state.get(name, default)
+
+    def set_state(self, name: str, value: Any) -> None:
+        """替换名为 name 的状态（如加载大规模商品目录）"""
+        self._state[name] = value
+
+    def drop_state(self, name: str) -> None:
+        """丢弃名为 name 的状态，下次访问时重新创建"""
+        self._state.pop(name, None)
+
+    def run(self, func: Callable, *args, **kwargs):
+        """在本上下文中执行 func（用于线程池任务：新线程不会继承调用方的上下文）"""
+        with use_context(self):
+            return func(*args, **kwargs)
+
+
+# 进程默认上下文：未显式激活上下文时（脚本/基准测试/未启用夹具的线程）使用
+_default_context = MockContext()
+_current_context: contextvars.ContextVar[Optional[MockContext]] = contextvars.ContextVar("mock_context", default=None)
+
+
+def current_context() -> MockContext:
+    """当前线程/协程生效的 Mock 上下文"""
+    return _current_context.get() or _default_context
+
+
+@contextmanager
+def use_context(context: Optional[MockContext] = None):
+    """
+    激活 Mock 上下文（不传时新建一个全新的上下文），退出后恢复之前的上下文
+    用法：with use_context() as ctx: ...
+    """
+    context = MockContext() if context is None else context
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
@@ -0,0 +1,192 @@
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Callable, Dict, FrozenSet, Iterator, Tuple
+
+_UNSET = object()  # 仅用于判断槽位是否赋值，不会写入记录
+
+
+class Record(MutableMapping):
+    """
+    紧凑记录基类：常用字段存于 __slots__（无实例 __dict__），未声明的字段放入 extra 字典（没有时不创建）
+    - 兼容字典用法：record["username"] / get / in / items / copy / 与字典比较相等，现有用例无需修改
+    - 未赋值的槽位视为"键不存在"（del record[key] 后同理），与字典语义一致
+    - from_row：从原始行（YAML/CSV/JSON 解析出的字典）构造，先补 DEFAULTS 再覆盖
+    子类只需声明 __slots__（字段名）和 DEFAULTS（缺省值，须为不可变值）
+    """
+
+    __slots__ = ("_extra",)
+    DEFAULTS: Dict[str, Any] = {}
+    _fields: Tuple[str, ...] = ()
+    _field_set: FrozenSet[str] = frozenset()
+    _defaults: Tuple[Tuple[str, Any], ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        fields = tuple(cls.__dict__.get("__slots__", ()))
+        clashes = [name for name in fields if hasattr(Record, name)]
+        if clashes:
+            raise TypeError(f"{cls.__name__} 的字段与字典接口方法重名：{clashes}")
+        cls._fields = fields
+        cls._field_set = frozenset(fields)
+        cls._defaults = tuple((name, value) for name, value in cls.DEFAULTS.items() if name in cls._field_set)
+        cls._fill, from_row, cls.copy = _compile_methods(cls)
+        cls.from_row = staticmethod(from_row)
+
+    def __init__(self, *args, **kwargs):
+        self._fill(dict(*args, **kwargs) if args else kwargs)
+
+    @classmethod
+    def from_row(cls, row: Mapping) -> "Record":
+        """从原始行构造（缺失字段取 DEFAULTS，未声明的字段进入 extra）"""
+        record = cls.__new__(cls)
+        record._fill(row)
+        return record
+
+    def _fill(self, row: Mapping) -> None:
+        """按原始行赋值（子类由 _compile_methods 生成展开版本）"""
+        self._extra = None
+        for name, value in self._defaults:
+            setattr(self, name, value)
+        for key, value in row.items():
+            self[key] = value
+
+    # -------------------------- 字典接口（兼容旧用法） --------------------------
+    def __getitem__(self, key):
+        if key in self._field_set:
+            value = getattr(self, key, _UNSET)
+            if value is not _UNSET:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self._field_set:
+            return getattr(self, key, default)
+        return default if self._extra is None else self._extra.get(key, default)
+
+    def __setitem__(self, key, value) -> None:
+        if key in self._field_set:
+            setattr(self, key, value)
+        elif self._extra is None:
+            self._extra = {key: value}
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key) -> None:
+        if key in self._field_set:
+            if getattr(self, key, _UNSET) is _UNSET:
+                raise KeyError(key)
+            delattr(self, key)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        if key in self._field_set:
+            return getattr(self, key, _UNSET) is not _UNSET
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self._fields:
+            if getattr(self, name, _UNSET) is not _UNSET:
+                yield name
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        count = sum(1 for name in self._fields if getattr(self, name, _UNSET) is not _UNSET)
+        return count + (len(self._extra) if self._extra is not None else 0)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.to_dict() == (other.to_dict() if isinstance(other, Record) else dict(other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    # -------------------------- 工具方法 --------------------------
+    @property
+    def extra(self) -> Dict[str, Any]:
+        """未声明字段（只读副本）"""
+        return dict(self._extra) if self._extra is not None else {}
+
+    def copy(self) -> "Record":
+        """浅拷贝（同类型，字段值共享）"""
+        record = type(self).__new__(type(self))
+        for name in self._fields:
+            value = getattr(self, name, _UNSET)
+            if value is not _UNSET:
+                setattr(record, name, value)
+        record._extra = dict(self._extra) if self._extra is not None else None
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {}
+        for name in self._fields:
+            value = getattr(self, name, _UNSET)
+            if value is not _UNSET:
+                data[name] = value
+        if self._extra is not None:
+            data.update(self._extra)
+        return data
+
+
+def _compile_methods(cls) -> Tuple[Callable, Callable, Callable]:
+    """
+    为记录类型生成展开的 _fill / from_row / copy（与 dataclasses 生成 __init__ 的方式相同）：
+    每个字段一条 get + 赋值语句，没有逐字段的循环/setattr 开销；原始行只含已声明字段时不创建 extra
+    from_row 直接创建实例并赋值（不经 cls.__new__ + 方法调用），构造耗时约为通用版本的一半
+    """
+    defaults = dict(cls._defaults)
+    namespace = {"_UNSET": _UNSET, "_field_set": cls._field_set, "_covers": cls._field_set.issuperset,
+                 "_new": object.__new__, "_cls": cls}
+    fill = ["    get = row.get"]
+    copy = []
+    for name in cls._fields:
+        if name in defaults:
+            namespace[f"_default_{name}"] = defaults[name]
+            fill.append(f"    self.{name} = get({name!r}, _default_{name})")
+        else:
+            fill.append(f"    value = get({name!r}, _UNSET)")
+            fill.append(f"    if value is not _UNSET: self.{name} = value")
+        copy.append(f"    value = getattr(self, {name!r}, _UNSET)")
+        copy.append(f"    if value is not _UNSET: record.{name} = value")
+    fill.append("    self._extra = None if _covers(row) else "
+                "{key: value for key, value in row.items() if key not in _field_set}")
+    source = "\n".join([
+        "def _fill(self, row):", *fill,
+        "def from_row(row):", "    self = _new(_cls)", *fill, "    return self",
+        "def copy(self):", "    record = _new(_cls)", *copy,
+        "    record._extra = None if self._extra is None else dict(self._extra)", "    return record",
+    ])
+    exec(source, namespace)
+    return namespace["_fill"], namespace["from_row"], namespace["copy"]
+
+
+# -------------------------- 用例 --------------------------
+class LoginCase(Record):
+    """登录用例（DataUtil._process_login_case 的输出），case_name 缺省值按序号生成"""
+    __slots__ = ("case_name", "username", "password", "expected_code", "expected_msg", "skip_cache", "check_db",
+                 "fail_count_before", "expected_status", "sensitive_check", "run_env", "priority")
+    DEFAULTS = {"username": "", "password": "", "expected_code": 200, "expected_msg": "success",
+                "skip_cache": False, "check_db": False}
+
+
+class ProductCase(Record):
+    """商品用例（DataUtil._process_product_case 的输出），case_name 缺省值按序号生成"""
+    __slots__ = ("case_name", "product_id", "product_name", "price", "expected_code", "expected_msg",
+                 "expected_stock", "check_stock", "run_env", "priority")
+    DEFAULTS = {"product_id": "", "product_name": "", "price": 0.0, "expected_code": 200,
+                "expected_stock": 0, "check_stock": False}
+
+
+# -------------------------- Mock 数据 --------------------------
+class UserRecord(Record):
+    """用户（LoginMock 用户表），缺省值与 add_temp_user 一致"""
+    __slots__ = ("username", "password", "fail_count", "status", "role", "phone", "email", "last_login_time")
+    DEFAULTS = {"password": "", "fail_count": 0, "status": "active", "role": "user", "phone": "", "email": "",
+                "last_login_time": None}
@@ -1,21 +1,125 @@
+from typing import Dict, Iterable, Mapping, Optional
+from config.env_config import config
+from utils.lazy_util import LazyProxy
 from utils.log_util import logger
+from utils.mock_context import current_context
+from utils.ttl_store import TTLStore
+
+TOKEN_KEY = "user_token:{}"
+
+
+def mock_redis_db() -> TTLStore:
+    """当前 Mock 上下文的 Redis 替身（带过期时间的内存存储）"""
+    return current_context().state("redis_util.db", TTLStore)
 
-# 用字典模拟 Redis 数据库
-mock_redis_db = {}
 
 class MockRedisUtil:
+    def __init__(self, store: TTLStore = None):
+        self._store = store
+
+    @property
+    def store(self) -> TTLStore:
+        """未显式传入存储时使用当前 Mock 上下文的存储（并行用例互不干扰）"""
+        return mock_redis_db() if self._store is None else self._store
+
     def set_token(self, username, token, expire=3600):
-        key = f"user_token:{username}"
-        mock_redis_db[key] = token
-        logger.info(f"[Mock Redis] SET {key} = {token[:10]}...")
+        key = TOKEN_KEY.format(username)
+        self.store.set(key, token, ttl=expire)
+        logger.info("[Mock Redis] SET %s = %s... EX %s", key, token[:10], expire)
 
     def get_token(self, username):
-        key = f"user_token:{username}"
-        token = mock_redis_db.get(key)
+        key = TOKEN_KEY.format(username)
+        token = self.store.get(key)
         if token:
-            logger.info(f"[Mock Redis] HIT {key}")
+            logger.info("[Mock Redis] HIT %s", key)
             return token
-        logger.warning(f"[Mock Redis] MISS {key}")
+        logger.warning("[Mock Redis] MISS %s", key)
         return None
 
-redis_util = MockRedisUtil()
\ No newline at end of file
+    def del_token(self, username):
+        key = TOKEN_KEY.format(username)
+        if self.store.delete(key):
+            logger.info("[Mock Redis] DEL %s", key)
+            return True
+        logger.warning("[Mock Redis] DEL MISS %s", key)
+        return False
+
+    # -------------------------- 批量操作（登录风暴场景） --------------------------
+    def get_tokens(self, usernames: Iterable[str]) -> Dict[str, Optional[str]]:
+        """批量获取 Token（MGET），未命中为 None"""
+        usernames = list(usernames)
+        tokens = self.store.get_many([TOKEN_KEY.format(u) for u in usernames])
+        result = dict(zip(usernames, tokens))
+        logger.info("[Mock Redis] MGET %s keys, HIT %s", len(result), sum(1 for t in tokens if t))
+        return result
+
+    def set_tokens(self, mapping: Mapping[str, str], expire=3600):
+        """批量设置 Token（同一过期时间）"""
+        self.store.set_many({TOKEN_KEY.format(u): token for u, token in mapping.items()}, ttl=expire)
+        logger.info("[Mock Redis] MSET %s keys EX %s", len(mapping), expire)
+
+    def get_or_set_token(self, username, token, expire=3600):
+        """原子地获取 Token，不存在时写入 token，返回最终生效的 Token"""
+        key = TOKEN_KEY.format(username)
+        value, created = self.store.get_or_set(key, token, ttl=expire)
+        logger.info("[Mock Redis] %s %s", "SET" if created else "HIT", key)
+        return value
+
+
+class RedisUtil:
+    """
+    真实 Redis 后端（redis-py），接口与 MockRedisUtil 一致
+    - 批量读：MGET，一次往返
+    - 批量写：非事务 pipeline 内逐个 SET EX（MSET 不支持过期时间），一次往返
+    - 获取或写入：Lua 脚本保证原子性，一次往返
+    """
+
+    # 存在则返回现值，否则写入并返回新值
+    GET_OR_SET_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if value then
+    return value
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return ARGV[1]
+"""
+
+    def __init__(self, url: str = None):
+        import redis  # 仅配置了 AUTO_REDIS_URL 时才需要安装
+        self.client = redis.Redis.from_url(url or config.REDIS_URL, decode_responses=True)
+        self._get_or_set = self.client.register_script(self.GET_OR_SET_SCRIPT)
+
+    def set_token(self, username, token, expire=3600):
+        self.client.set(TOKEN_KEY.format(username), token, ex=expire)
+
+    def get_token(self, username):
+        return self.client.get(TOKEN_KEY.format(username))
+
+    def del_token(self, username):
+        return self.client.delete(TOKEN_KEY.format(username)) > 0
+
+    def get_tokens(self, usernames: Iterable[str]) -> Dict[str, Optional[str]]:
+        usernames = list(usernames)
+        if not usernames:
+            return {}
+        return dict(zip(usernames, self.client.mget([TOKEN_KEY.format(u) for u in usernames])))
+
+    def set_tokens(self, mapping: Mapping[str, str], expire=3600):
+        if not mapping:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for username, token in mapping.items():
+            pipe.set(TOKEN_KEY.format(username), token, ex=expire)
+        pipe.execute()
+
+    def get_or_set_token(self, username, token, expire=3600):
+        return self._get_or_set(keys=[TOKEN_KEY.format(username)], args=[token, expire])
+
+
+def create_redis_util():
+    """配置了 AUTO_REDIS_URL 时使用真实 Redis，否则使用内存替身"""
+    return RedisUtil() if config.REDIS_URL else MockRedisUtil()
+
+
+# 首次使用时才按配置创建（导入模块不读取配置、不建连接）
+redis_util = LazyProxy(create_redis_util)
@@ -1,30 +1,196 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config.env_config import config
+from utils.latency_util import latency_recorder
 from utils.log_util import logger
+from utils.token_broker import token_broker
+
+# JSON解码：安装了 orjson 时使用（解析速度数倍于标准库），否则回退标准库
+try:
+    import orjson
+    json_loads = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:
+    json_loads = json.loads
+    JSON_BACKEND = "json"
+
+
+def preview_body(body: bytes) -> str:
+    """响应体日志预览：只解码前 AUTO_LOG_BODY_BYTES 个字节（不为整个响应体生成str）"""
+    return body[:config.LOG_BODY_BYTES].decode("utf-8", "replace")
+
+
+# 进程级共享Session（所有API客户端共用同一个连接池）
+_shared_session = None
+_shared_session_pid = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_session() -> requests.Session:
+    """
+    获取进程级共享Session（懒加载、线程安全）
+    fork出的子进程（如xdist worker）检测到pid变化后自动重建，避免复用父进程的socket
+    """
+    global _shared_session, _shared_session_pid
+    if _shared_session is None or _shared_session_pid != os.getpid():
+        with _shared_session_lock:
+            if _shared_session is None or _shared_session_pid != os.getpid():
+                _shared_session = _build_session()
+                _shared_session_pid = os.getpid()
+    return _shared_session
+
+
+def reset_shared_session() -> None:
+    """关闭并丢弃共享Session（修改连接池配置后调用，下次使用时按新配置重建）"""
+    global _shared_session, _shared_session_pid
+    with _shared_session_lock:
+        if _shared_session is not None and _shared_session_pid == os.getpid():
+            _shared_session.close()
+        _shared_session = _shared_session_pid = None
+
+
+def _build_session() -> requests.Session:
+    """按 EnvConfig 连接池配置构建Session：连接池大小、Keep-Alive、幂等请求重试、按主机连接上限"""
+    retry = Retry(
+        total=config.HTTP_MAX_RETRIES,
+        backoff_factor=config.HTTP_RETRY_BACKOFF,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,  # 仅幂等方法重试（不含POST/PATCH）
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False  # 重试耗尽后返回最后一次响应，由 raise_for_status 统一处理
+    )
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=config.HTTP_POOL_MAXSIZE,
+        pool_block=config.HTTP_POOL_BLOCK,
+        max_retries=retry
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    # 按主机连接上限：独立Adapter + pool_block，超出上限的请求等待空闲连接
+    for host, limit in config.HTTP_HOST_LIMITS.items():
+        host_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=limit, pool_block=True, max_retries=retry)
+        session.mount(f"http://{host}/", host_adapter)
+        session.mount(f"https://{host}/", host_adapter)
+
+    if not config.HTTP_KEEP_ALIVE:
+        session.headers["Connection"] = "close"
+    return session
 
 
 class RequestUtil:
     def __init__(self):
-        self.session = requests.Session()  # 复用Session，提升性能
+        self.session = get_shared_session()  # 复用进程级共享Session（连接池），提升性能
         # 【优化1】移除末尾斜杠，避免URL拼接成 //get（和登录API的修复逻辑一致）
         self.base_url = config.BASE_URL.rstrip("/")
 
     def send(self, method, url, data=None, params=None, token=None):
-        # 【优化2】URL路径补全：如果url不以/开头，自动添加（避免拼接成 httpbin.orgget）
-        if not url.startswith("/"):
-            url = f"/{url}"
-        full_url = f"{self.base_url}{url}"
+        full_url = self.build_url(self.base_url, url)
+        headers = self.build_headers(token)
+        return self._send(method, full_url, data, params, headers)
 
-        headers = config.HEADERS.copy()
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
+    def send_many(self, specs, max_workers=None):
+        """
+        批量并发请求（线程池），单个请求失败不影响其他请求
+        :param specs: 请求描述列表，每项为 send 的参数字典，如 {"method": "GET", "url": "/get", "params": {...}, "token": ...}
+        :param max_workers: 并发线程数（默认读取 AUTO_HTTP_BATCH_WORKERS）
+        :return: 与 specs 顺序一致的结果列表，每项 {"ok": bool, "data": 响应JSON或None, "error": 异常或None}
+        """
+        if not specs:
+            return []
+        # 同一Token的请求头只构造一次
+        headers_by_token = {}
+        jobs = []
+        for spec in specs:
+            token = spec.get("token")
+            if token not in headers_by_token:
+                headers_by_token[token] = self.build_headers(token)
+            jobs.append((spec["method"], self.build_url(self.base_url, spec["url"]),
+                         spec.get("data"), spec.get("params"), headers_by_token[token]))
+
+        def run(job):
+            try:
+                return {"ok": True, "data": self._send(*job), "error": None}
+            except Exception as e:
+                return {"ok": False, "data": None, "error": e}
+
+        start = time.perf_counter()
+        workers = min(max_workers or config.HTTP_BATCH_WORKERS, len(jobs))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="send_many") as pool:
+            results = list(pool.map(run, jobs))  # map 保持入参顺序
+        failed = sum(1 for r in results if not r["ok"])
+        logger.info("【批量请求】共%s个，成功%s个，失败%s个，耗时%.1fms",
+                    len(results), len(results) - failed, failed, (time.perf_counter() - start) * 1000)
+        return results
+
+    def send_stream(self, method, url, data=None, params=None, token=None, chunk_size=64 * 1024):
+        """
+        流式请求：逐块产出响应体（bytes），适合大文件/大报文，内存占用与响应大小无关
+        :param chunk_size: 单块字节数
+        :return: 响应体分块生成器（消费完或关闭生成器后连接归还连接池）
+        """
+        with self._open_stream(method, url, data, params, token) as resp:
+            yield from resp.iter_content(chunk_size=chunk_size)
+
+    def send_lines(self, method, url, data=None, params=None, token=None):
+        """
+        流式请求（JSON Lines/NDJSON 响应）：逐行解码产出对象，不缓存完整响应体
+        :return: 每行JSON解码结果的生成器（空行跳过）
+        """
+        with self._open_stream(method, url, data, params, token) as resp:
+            for line in resp.iter_lines(chunk_size=64 * 1024):
+                if line:
+                    yield json_loads(line)
 
-        # 日志记录（保留你的清晰日志）
-        log_msg = f"【请求】{method} {full_url}"
-        if params: log_msg += f" | Params: {params}"
-        if data: log_msg += f" | Data: {data}"
-        logger.info(log_msg)
+    def _open_stream(self, method, url, data, params, token):
+        """发起流式请求（只读取响应头），校验状态码后返回响应对象"""
+        full_url = self.build_url(self.base_url, url)
+        self.log_request(method, full_url, params, data)
+        start = time.perf_counter()
+        try:
+            resp = self.session.request(
+                method=method.upper(),
+                url=full_url,
+                json=data,
+                params=params,
+                headers=self.build_headers(token),
+                timeout=config.TIMEOUT,
+                stream=True
+            )
+        except requests.exceptions.Timeout:
+            logger.error("【超时异常】请求 %s 超时（%ss）", full_url, config.TIMEOUT,
+                         extra=self._error_extra(method, full_url, start, record=True))
+            raise
+        except Exception as e:
+            logger.error("【通用异常】%s", e, extra=self._error_extra(method, full_url, start, record=True))
+            raise
+        log_extra = {"method": method.upper(), "url": full_url, "status": resp.status_code,
+                     "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)}
+        # 流式请求只统计到响应头（响应体由调用方按需读取）
+        latency_recorder.record(method, full_url, resp.status_code, log_extra["elapsed_ms"],
+                                ttfb=resp.elapsed.total_seconds() * 1000)
+        if resp.status_code >= 400:
+            logger.error("【HTTP异常】%s %s（流式请求）", resp.status_code, full_url, extra=log_extra)
+            resp.close()
+            resp.raise_for_status()
+        logger.info("【响应】Status: %s | 首包耗时: %sms（流式读取）", resp.status_code, log_extra["elapsed_ms"],
+                    extra=log_extra)
+        return resp
+
+    def _send(self, method, full_url, data, params, headers):
+        """发送单个请求（URL/请求头已构造完成）"""
+        self.log_request(method, full_url, params, data)
 
+        start = time.perf_counter()
+        recorded = False  # 是否已按响应状态记录耗时（未记录的异常按 ERR 记录）
         try:
             resp = self.session.request(
                 method=method.upper(),  # 兼容小写method（如 get → GET）
@@ -34,15 +200,74 @@ class RequestUtil:
                 headers=headers,
                 timeout=config.TIMEOUT
             )
+            body = resp.content  # 响应体只读取一次（bytes），日志预览与JSON解码共用
+            elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+            # resp.elapsed：发出请求到响应头解析完成（首字节）；requests 不提供 DNS/建连耗时
+            latency_recorder.record(method, full_url, resp.status_code, elapsed_ms,
+                                    ttfb=resp.elapsed.total_seconds() * 1000)
+            recorded = True
+            # 结构化字段（JSON Lines 日志可直接按字段检索/统计耗时）
+            log_extra = {"method": method.upper(), "url": full_url, "status": resp.status_code, "elapsed_ms": elapsed_ms}
             resp.raise_for_status()  # 抛出HTTP错误（4xx/5xx）
-            logger.info(f"【响应】Status: {resp.status_code} | Response: {resp.text[:200]}")  # 补充响应内容
-            return resp.json()
+            logger.info(lambda: f"【响应】Status: {resp.status_code} | 耗时: {elapsed_ms}ms | Response: {preview_body(body)}",
+                        extra=log_extra)  # 补充响应内容
+            return json_loads(body)
         except requests.exceptions.HTTPError as e:
-            logger.error(f"【HTTP异常】{str(e)} | 响应内容: {resp.text[:200]}")
+            # 显式绑定 e：except 块结束时异常变量会被删除，闭包不能依赖它
+            logger.error(lambda e=e: f"【HTTP异常】{e} | 响应内容: {preview_body(body)}", extra=log_extra)
+            if resp.status_code == 401:
+                self.discard_token(headers)
             raise e
         except requests.exceptions.Timeout:
-            logger.error(f"【超时异常】请求 {full_url} 超时（{config.TIMEOUT}s）")
+            logger.error("【超时异常】请求 %s 超时（%ss）", full_url, config.TIMEOUT,
+                         extra=self._error_extra(method, full_url, start, record=not recorded))
             raise
         except Exception as e:
-            logger.error(f"【通用异常】{str(e)}")
-            raise e
\ No newline at end of file
+            logger.error("【通用异常】%s", e, extra=self._error_extra(method, full_url, start, record=not recorded))
+            raise e
+
+    @staticmethod
+    def build_url(base_url, url):
+        """拼接完整URL（同步/异步请求共用）"""
+        # 已是完整地址（如 LoginApi 传入的 f"{base_url}/post"）时直接使用
+        if url.startswith(("http://", "https://")):
+            return url
+        # 【优化2】URL路径补全：如果url不以/开头，自动添加（避免拼接成 httpbin.orgget）
+        if not url.startswith("/"):
+            url = f"/{url}"
+        return f"{base_url}{url}"
+
+    @staticmethod
+    def build_headers(token=None):
+        """构造请求头：默认请求头 + Bearer Token（同步/异步请求共用）"""
+        headers = config.HEADERS.copy()
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        return headers
+
+    @staticmethod
+    def discard_token(headers):
+        """401：服务端已判定 Token 失效，丢弃 token_broker 中的缓存（同步/异步请求共用）"""
+        auth = headers.get("Authorization", "")
+        if auth.startswith("Bearer "):
+            token_broker.discard_token(auth[len("Bearer "):])
+
+    @staticmethod
+    def log_request(method, full_url, params=None, data=None):
+        """请求日志（保留你的清晰日志；INFO未启用时不拼装参数/请求体）"""
+        if logger.is_enabled_for(logging.INFO):
+            log_msg = f"【请求】{method} {full_url}"
+            if params: log_msg += f" | Params: {params}"
+            if data: log_msg += f" | Data: {data}"
+            logger.info(log_msg)
+
+    @staticmethod
+    def _error_extra(method, full_url, start, record=False):
+        """
+        异常场景的结构化字段（无响应状态码）
+        :param record: 是否按 ERR 状态记录耗时（未收到响应的请求，如超时/连接失败）
+        """
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+        if record:
+            latency_recorder.record(method, full_url, "ERR", elapsed_ms)
+        return {"method": method.upper(), "url": full_url, "elapsed_ms": elapsed_ms}
\ No newline at end of file
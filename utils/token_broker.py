@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from config.env_config import config
+from utils.background_util import background_dispatcher
+from utils.lazy_util import LazyProxy
+from utils.log_util import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+class _FileLock:
+    """跨进程互斥锁（fcntl.flock / Windows msvcrt.locking），同一进程内的不同线程同样互斥"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+class TokenBroker:
+    """
+    会话级 Token 代理：同一账号在所有 worker 进程间只登录一次
+    - 进程内缓存：未进入刷新窗口时直接返回，不访问磁盘
+    - 跨进程缓存：cache_dir 下每个账号一个 JSON 文件，读写在文件锁内进行，
+      先拿到锁的进程登录并写入，其余进程直接读取（xdist 多 worker 共享）
+    - 过期与刷新：Token 按 ttl 过期；剩余有效期小于 refresh_ahead 时先返回现有 Token，
+      同时交给后台派发器提前刷新；已过期时同步刷新
+    - 缓存按测试运行隔离：xdist 同一次运行的 worker 共享（PYTEST_XDIST_TESTRUNUID），其余情况按进程隔离，
+      上一次会话留下的 Token 不会被复用；接口返回 401 时由 discard_token 丢弃对应缓存
+    过期时间使用墙上时钟（time.time），跨进程可比较
+    """
+
+    def __init__(self, login_func: Callable[[str, str], str] = None, cache_dir: Path = None, ttl: float = None,
+                 refresh_ahead: float = None, clock: Callable[[], float] = time.time):
+        self.login_func = login_func or self._default_login
+        self.cache_dir = Path(cache_dir or config.TOKEN_CACHE_DIR or PROJECT_ROOT / ".cache" / "tokens")
+        self.ttl = config.TOKEN_TTL if ttl is None else ttl
+        self.refresh_ahead = config.TOKEN_REFRESH_AHEAD if refresh_ahead is None else refresh_ahead
+        self._clock = clock
+        self._memo: Dict[str, Tuple[str, float]] = {}  # {username: (token, expires_at)}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._login_api = None
+
+    def get_token(self, username: str, password: str) -> str:
+        """获取账号 Token（必要时登录），登录失败抛出 RuntimeError"""
+        now = self._clock()
+        memo = self._memo.get(username)
+        if memo is None or memo[1] <= now:
+            memo = self._load_or_login(username, password)
+        if memo[1] - self.refresh_ahead <= self._clock():
+            self._schedule_refresh(username, password)
+        return memo[0]
+
+    def invalidate(self, username: str) -> None:
+        """丢弃账号 Token（如服务端已判定失效），下次获取时重新登录"""
+        with self._lock:
+            self._memo.pop(username, None)
+        with _FileLock(self._lock_path(username)):
+            self._cache_path(username).unlink(missing_ok=True)
+
+    def discard_token(self, token: str) -> None:
+        """服务端拒绝了 Token（401）：丢弃持有该 Token 的账号缓存，下次获取时重新登录"""
+        with self._lock:
+            usernames = [username for username, (cached, _) in self._memo.items() if cached == token]
+        for username in usernames:
+            logger.warning("🔑 Token 已失效（401），丢弃缓存：用户=%s", username)
+            self.invalidate(username)
+
+    def prune(self) -> int:
+        """删除已过期的磁盘缓存（含历史运行留下的），返回删除的文件数"""
+        removed = 0
+        now = self._clock()
+        for path in self.cache_dir.glob("*.json") if self.cache_dir.exists() else []:
+            try:
+                expired = float(json.loads(path.read_text(encoding="utf-8"))["expires_at"]) <= now
+            except (OSError, ValueError, KeyError, TypeError):
+                expired = True
+            if expired:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """清空进程内缓存与磁盘缓存"""
+        with self._lock:
+            self._memo.clear()
+        for path in self.cache_dir.glob("*.json") if self.cache_dir.exists() else []:
+            path.unlink(missing_ok=True)
+
+    # -------------------------- 缓存读写 --------------------------
+    def _load_or_login(self, username: str, password: str, force: bool = False) -> Tuple[str, float]:
+        """文件锁内：缓存文件有效（force 时须未进入刷新窗口）则直接采用，否则登录并写入"""
+        with _FileLock(self._lock_path(username)):
+            cached = self._read(username)
+            now = self._clock()
+            threshold = now + self.refresh_ahead if force else now
+            if cached is None or cached[1] <= threshold:
+                token = self.login_func(username, password)
+                cached = (token, self._clock() + self.ttl)
+                self._write(username, cached)
+                logger.info("🔑 Token 已获取：用户=%s，有效期 %ss", username, self.ttl)
+        with self._lock:
+            self._memo[username] = cached
+        return cached
+
+    def _schedule_refresh(self, username: str, password: str) -> None:
+        with self._lock:
+            if username in self._refreshing:
+                return
+            self._refreshing.add(username)
+
+        def refresh():
+            try:
+                self._load_or_login(username, password, force=True)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(username)
+
+        if not background_dispatcher.submit(refresh):
+            with self._lock:
+                self._refreshing.discard(username)
+
+    def _cache_key(self, username: str) -> str:
+        # 按环境/Mock模式区分，避免不同环境的 Token 互相覆盖
+        digest = hashlib.sha256(f"{config.env}|{config.IS_MOCK}|{username}".encode("utf-8")).hexdigest()[:16]
+        return f"token.{digest}"
+
+    def _cache_path(self, username: str) -> Path:
+        # 缓存文件按测试运行隔离（锁文件按账号共享，不随运行累积）
+        scope = os.getenv("PYTEST_XDIST_TESTRUNUID") or f"pid{os.getpid()}"
+        scope_digest = hashlib.sha256(scope.encode("utf-8")).hexdigest()[:8]
+        return self.cache_dir / f"{self._cache_key(username)}.{scope_digest}.json"
+
+    def _lock_path(self, username: str) -> Path:
+        return self.cache_dir / f"{self._cache_key(username)}.lock"
+
+    def _read(self, username: str) -> Optional[Tuple[str, float]]:
+        try:
+            data = json.loads(self._cache_path(username).read_text(encoding="utf-8"))
+            return data["token"], float(data["expires_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write(self, username: str, cached: Tuple[str, float]) -> None:
+        """原子写入（先写临时文件再替换）"""
+        path = self._cache_path(username)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps({"token": cached[0], "expires_at": cached[1]}), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def _default_login(self, username: str, password: str) -> str:
+        if self._login_api is None:
+            from api.login_api import LoginApi
+            self._login_api = LoginApi()
+        resp = self._login_api.login(username, password)
+        if resp["code"] != 200:
+            raise RuntimeError(f"登录失败：用户={username}，响应={resp}")
+        return resp["data"]["token"]
+
+
+# 进程级 Token 代理（conftest 的 login_token 等 Fixture 共用，首次使用时才按配置创建）
+token_broker = LazyProxy(TokenBroker)
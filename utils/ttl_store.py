@@ -0,0 +1,112 @@
+import heapq
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+
+class TTLStore:
+    """
+    进程内带过期时间的键值存储（Redis 替身，Mock Redis 层共用）
+    - 过期时间：基于单调时钟的数值时间戳（秒），不受系统时间调整影响
+    - 主动过期：最小堆按过期时间排序，每次读写顺带清理已到期的键，长时间运行内存不会无限增长
+    - 时钟可注入：测试中传入可手动推进的时钟，无需 sleep
+    """
+
+    # 覆盖写/删除会在堆中留下失效条目，超过有效条目数的该倍数时重建堆
+    COMPACT_RATIO = 2
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}  # key → (value, 过期时间/None=永不过期)
+        self._heap: List[Tuple[float, str]] = []  # (过期时间, key)，可能包含已失效条目
+
+    # -------------------------- 读写接口 --------------------------
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """写入键值，ttl 为存活秒数（None=永不过期，<=0 视为立即过期）"""
+        now = self._clock()
+        self.purge_expired(now)
+        if ttl is not None and ttl <= 0:
+            self._data.pop(key, None)
+            return
+        expire_at = None if ttl is None else now + ttl
+        self._data[key] = (value, expire_at)
+        if expire_at is not None:
+            heapq.heappush(self._heap, (expire_at, key))
+            if len(self._heap) > self.COMPACT_RATIO * len(self._data) + 64:
+                self._compact()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """读取键值（已过期视为不存在）"""
+        self.purge_expired()
+        entry = self._data.get(key)
+        return default if entry is None else entry[0]
+
+    def delete(self, key: str) -> bool:
+        """删除键，返回键删除前是否存在"""
+        self.purge_expired()
+        return self._data.pop(key, None) is not None
+
+    def get_many(self, keys: Iterable[str]) -> List[Any]:
+        """批量读取（MGET），返回与 keys 顺序一致的值列表，不存在/已过期为 None"""
+        self.purge_expired()
+        data = self._data
+        return [entry[0] if entry is not None else None for entry in map(data.get, keys)]
+
+    def set_many(self, mapping: Mapping[str, Any], ttl: Optional[float] = None) -> None:
+        """批量写入（同一 ttl）"""
+        for key, value in mapping.items():
+            self.set(key, value, ttl=ttl)
+
+    def get_or_set(self, key: str, value: Any, ttl: Optional[float] = None) -> Tuple[Any, bool]:
+        """键存在时返回现值，否则写入 value；返回 (最终值, 是否新写入)"""
+        self.purge_expired()
+        entry = self._data.get(key)
+        if entry is not None:
+            return entry[0], False
+        self.set(key, value, ttl=ttl)
+        return value, True
+
+    def ttl(self, key: str) -> Optional[float]:
+        """剩余存活秒数（永不过期返回 None，键不存在返回 -1，与 Redis TTL 语义对齐）"""
+        now = self._clock()
+        self.purge_expired(now)
+        entry = self._data.get(key)
+        if entry is None:
+            return -1
+        return None if entry[1] is None else entry[1] - now
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._heap.clear()
+
+    # -------------------------- 过期清理 --------------------------
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """清理所有已到期的键，返回清理数量"""
+        now = self._clock() if now is None else now
+        heap, data = self._heap, self._data
+        removed = 0
+        while heap and heap[0][0] <= now:
+            expire_at, key = heapq.heappop(heap)
+            entry = data.get(key)
+            # 堆条目可能已被覆盖写/删除，只有过期时间一致时才是当前值
+            if entry is not None and entry[1] == expire_at:
+                del data[key]
+                removed += 1
+        return removed
+
+    def _compact(self) -> None:
+        """按当前有效键重建堆，丢弃失效条目"""
+        self._heap = [(expire_at, key) for key, (_, expire_at) in self._data.items() if expire_at is not None]
+        heapq.heapify(self._heap)
+
+    # -------------------------- 容器接口 --------------------------
+    def __contains__(self, key) -> bool:
+        self.purge_expired()
+        return key in self._data
+
+    def __len__(self) -> int:
+        self.purge_expired()
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[str]:
+        self.purge_expired()
+        return iter(list(self._data))